@@ -0,0 +1,174 @@
+# admission.py
+# Admission control for the CPU-bound inference endpoints.
+#
+# Each model gets an InferenceGate: at most `slots` calls run at once, at
+# most `max_queue` wait, and a request whose estimated wait (queue position x
+# recent service time) is past the model's latency budget is refused up front
+# with 503 + Retry-After instead of timing out behind the queue.
+# Frame analysis is best effort: the DeepFace gate yields to Whisper and
+# refuses frames while any answer transcription is waiting for a slot.
+#
+# Per-user token buckets cap how fast one client can submit work (429 + Retry-After).
+#
+#   ADMISSION=0                      disable everything
+#   ADMIT_<MODEL>_SLOTS / _QUEUE / _BUDGET_SEC
+#   RATE_FRAMES_PER_SEC, RATE_FRAMES_BURST, RATE_AUDIO_PER_MIN, RATE_AUDIO_BURST
+import os
+import math
+import time
+import threading
+from functools import wraps
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from flask import request, jsonify
+
+import metrics
+
+ENABLED = os.getenv("ADMISSION","1") == "1"
+
+
+class Overloaded(Exception):
+    def __init__(self, status, reason, retry_after):
+        super().__init__(reason)
+        self.status      = status
+        self.reason      = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class InferenceGate:
+    def __init__(self, model, slots, max_queue, budget_sec, service_sec=1.0, yield_to=()):
+        self.model       = model
+        self.slots       = max(1, slots)
+        self.max_queue   = max_queue
+        self.budget_sec  = budget_sec
+        self.service_sec = service_sec       # EMA of recent call durations
+        self.yield_to    = list(yield_to)    # gates whose waiters go first (best-effort work)
+        self.active = self.waiting = 0
+        self._cond = threading.Condition()
+
+    def estimated_wait(self):
+        if self.active < self.slots and not self.waiting:
+            return 0.0
+        return math.ceil((self.waiting + 1) / self.slots) * self.service_sec
+
+    def _reject(self, reason, retry_after):
+        metrics.ADMISSION_REJECTED.inc(model=self.model, reason=reason)
+        raise Overloaded(503, f"{self.model} overloaded ({reason})", retry_after)
+
+    def acquire(self):
+        with self._cond:
+            for other in self.yield_to:
+                if other.waiting:
+                    self._reject("yielding", other.estimated_wait())
+            wait = self.estimated_wait()
+            if wait == 0.0:
+                self.active += 1
+                return
+            if self.waiting >= self.max_queue:
+                self._reject("queue_full", wait)
+            if wait > self.budget_sec:
+                self._reject("over_budget", wait)
+
+            deadline = time.monotonic() + self.budget_sec
+            self.waiting += 1
+            try:
+                while self.active >= self.slots:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        self._reject("timeout", self.estimated_wait())
+                    self._cond.wait(left)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+
+    def release(self, elapsed):
+        with self._cond:
+            self.active -= 1
+            self.service_sec = 0.8 * self.service_sec + 0.2 * elapsed
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        if not ENABLED:
+            yield
+            return
+        self.acquire()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - t0)
+
+
+class RateLimiter:
+    """Token bucket per key: `rate` tokens/s, up to `burst`."""
+    def __init__(self, name, rate, burst, max_keys=10000):
+        self.name, self.rate, self.burst = name, rate, burst
+        self._buckets = OrderedDict()     # key -> (tokens, last refill)
+        self._max = max_keys
+        self._lock = threading.Lock()
+
+    def take(self, key):
+        if not ENABLED or self.rate <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            while len(self._buckets) > self._max:
+                self._buckets.popitem(last=False)
+        if not allowed:
+            metrics.ADMISSION_REJECTED.inc(model=self.name, reason="rate_limited")
+            raise Overloaded(429, "Too many requests", (1 - tokens) / self.rate)
+
+
+def _env(name, default, cast=float):
+    return cast(os.getenv(name, default))
+
+whisper_gate = InferenceGate("whisper",
+                             _env("ADMIT_WHISPER_SLOTS", "1", int), _env("ADMIT_WHISPER_QUEUE", "16", int),
+                             _env("ADMIT_WHISPER_BUDGET_SEC", "30"), service_sec=3.0)
+deepface_gate = InferenceGate("deepface",
+                              _env("ADMIT_DEEPFACE_SLOTS", "2", int), _env("ADMIT_DEEPFACE_QUEUE", "4", int),
+                              _env("ADMIT_DEEPFACE_BUDGET_SEC", "1.5"), service_sec=0.3,
+                              yield_to=[whisper_gate])
+
+frame_limiter = RateLimiter("frames", _env("RATE_FRAMES_PER_SEC", "2"), _env("RATE_FRAMES_BURST", "4"))
+audio_limiter = RateLimiter("audio", _env("RATE_AUDIO_PER_MIN", "12") / 60, _env("RATE_AUDIO_BURST", "4"))
+
+
+def client_key():
+    return request.headers.get("Clerk-User-Email") or request.remote_addr or "anonymous"
+
+def frame_client_key():
+    """Frames: user, else interview session, and only then the address, which
+    many candidates behind one proxy/NAT share."""
+    data = request.get_json(silent=True) or {}
+    return (request.headers.get("Clerk-User-Email") or str(data.get("sessionId") or "")
+            or request.remote_addr or "anonymous")
+
+def overloaded_response(e):
+    return (jsonify({"error": e.reason, "retryAfter": e.retry_after}), e.status,
+            {"Retry-After": str(e.retry_after)})
+
+def admitted(gate, limiter, key=client_key):
+    """Flask view decorator: rate-limit the caller, then (if `gate`) hold a slot of it for the view.
+    Views that only need the model for part of their work pass gate=None and take
+    `gate.slot()` themselves around that part, so the slot is not held through
+    LLM calls and DB writes. Overloaded raised inside the view becomes the same 503/429."""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                limiter.take(key())
+                if gate is None:
+                    return fn(*args, **kwargs)
+                with gate.slot():
+                    return fn(*args, **kwargs)
+            except Overloaded as e:
+                return overloaded_response(e)
+        return wrapper
+    return deco
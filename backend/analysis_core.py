@@ -0,0 +1,163 @@
+# analysis_core.py
+# Pure helpers shared by the Flask app (app.py) and the async app
+# (asgi_app.py): LLM output parsing, prompt builders, the report
+# aggregation and the answer-write update. No model, DB or web-framework
+# imports here.
+import re
+import json
+import statistics
+
+SOFT_SKILL_SECTIONS = ["communication","teamwork","problemSolving","adaptability","leadership","timeManagement"]
+
+# ---------------------------------------------------
+# LLM output parsing
+# ---------------------------------------------------
+def remove_code_fences(t): return t.replace("```json","").replace("```","").strip()
+
+def parse_json_obj(raw):
+    """LLM output -> dict ({} when it isn't a JSON object)."""
+    try:
+        parsed = json.loads(raw) if raw.strip().startswith("{") else {}
+    except ValueError:
+        parsed = {}
+    return parsed if isinstance(parsed, dict) else {}
+
+def raw_key_skills(analysis_json):
+    """key_skills text from a stored resume analysis ("" when missing/unparseable)."""
+    try:
+        data = json.loads(analysis_json)
+    except (TypeError, ValueError):
+        data = {}
+    return data.get("key_skills", "") if isinstance(data, dict) else ""
+
+# ---------------------------------------------------
+# Prompts
+# ---------------------------------------------------
+def skills_summary_prompt(raw_skills):
+    cleaned = re.sub(r"(Languages|Tools|Technologies/Frameworks):", "", raw_skills, flags=re.IGNORECASE)
+    return f"""
+We have these raw skill lines from a resume:
+\"\"\"{cleaned}\"\"\"
+
+Ignore any mention that the candidate lacks skills.
+Produce a SHORT bullet list (max 10) of distinct skill names.
+No explanation, no code fences, just bullet items.
+"""
+
+def resume_analysis_prompt(resume_text, job_description=""):
+    if job_description:
+        return f"""
+You are an HR assistant analyzing a resume for a specific job.
+Extract the following details in a structured JSON:
+{{
+  "full_name": string,
+  "contact_details": string,
+  "professional_summary": string,
+  "relevant_experience": string,
+  "key_skills": string,
+  "certifications": string,
+  "industry_expertise": string,
+  "match_score": number,
+  "match_explanation": string
+}}
+
+Resume Text:
+{resume_text}
+
+Job Description:
+{job_description}
+"""
+    return f"""
+You are an HR assistant analyzing a resume (no job description).
+Extract the following details in a structured JSON:
+{{
+  "full_name": string,
+  "contact_details": string,
+  "professional_summary": string,
+  "relevant_experience": string,
+  "key_skills": string,
+  "certifications": string,
+  "industry_expertise": string
+}}
+
+Resume Text:
+{resume_text}
+"""
+
+def skill_analysis_prompt(skill, transcript, rating):
+    return f"""Evaluate {skill}.
+Transcript: \"\"\"{transcript}\"\"\" Rating:{rating}/5.
+Give ≤5 bullet points."""
+
+def final_summary_prompt(avg_rating, filler_rt, tot_words, emo_digest):
+    return f"""Speech rating {avg_rating}, filler {filler_rt}, words {tot_words}. Emotions: {emo_digest}.
+Neutral = calm, happy/surprise = enthusiastic.
+Write 3–4 sentence assessment."""
+
+def emotion_bullets_prompt(emo_avg):
+    return f"Avg emotions: {json.dumps(emo_avg)}. Give ≤4 bullets on engagement/stress."
+
+def parse_bullets(raw):
+    return [l.lstrip("•- ").strip() for l in raw.splitlines() if l.strip()]
+
+# ---------------------------------------------------
+# Report aggregation
+# ---------------------------------------------------
+def speech_stats(answers):
+    """-> (total words, filler rate, average rating) over all answers."""
+    tot_words  = sum(len(a.get("transcript","").split()) for a in answers)
+    tot_filler = sum(a.get("fillerCount",0) for a in answers)
+    ratings    = [a.get("assessment",{}).get("rating",3) for a in answers if a.get("assessment")]
+    avg_rating = round(sum(ratings)/len(ratings),2) if ratings else 3.0
+    filler_rt  = round(tot_filler/tot_words,3) if tot_words else 0.0
+    return tot_words, filler_rt, avg_rating
+
+def aggregate_emotions(timeline):
+    """Per-emotion mean and population std-dev (1 dp) over the timeline snapshots."""
+    bucket={}
+    for snap in timeline:
+        for emo,v in (snap.get("distribution") or {}).items():
+            bucket.setdefault(emo,[]).append(float(v))
+    emo_avg = {e:round(sum(v)/len(v),1) for e,v in bucket.items()}
+    emo_std = {e:round(statistics.pstdev(v),1) for e,v in bucket.items() if len(v)>1}
+    return emo_avg, emo_std
+
+def emotion_digest(emo_avg, emo_std):
+    top = lambda d,k=2:", ".join(f"{e} ({v}%)" for e,v in sorted(d.items(),key=lambda x:x[1],reverse=True)[:k])
+    return "No emotion captured." if not emo_avg else f"Dominant → {top(emo_avg)} | Var → {top(emo_std)}"
+
+def soft_skill_answers(interview, tech_cnt):
+    """[(section, answer-or-None)] for the soft-skill part of an interview."""
+    answers  = interview.get("answers",[])
+    sections = interview.get("softSkillSections", SOFT_SKILL_SECTIONS)
+    return [(skill, next((a for a in answers if a["questionIndex"]==tech_cnt+i),None))
+            for i,skill in enumerate(sections)]
+
+# ---------------------------------------------------
+# Answer persistence
+# ---------------------------------------------------
+# An answer (with its assessment) is written in one update: an aggregation
+# pipeline drops any earlier answer with the same questionIndex, appends the
+# new one and bumps `version`. The filter pins the version the writer read,
+# so a concurrent write turns into a no-op the caller detects and retries.
+def version_filter(version):
+    """Match an interview still at `version` (pre-versioning documents count as 0)."""
+    return {"version": version} if version else {"version": {"$in": [None, 0]}}
+
+def upsert_answer_pipeline(ans_doc):
+    return [{"$set": {
+        "answers": {"$concatArrays": [
+            {"$filter": {"input": {"$ifNull": ["$answers", []]}, "as": "a",
+                         "cond": {"$ne": ["$$a.questionIndex", ans_doc["questionIndex"]]}}},
+            {"$literal": [ans_doc]},          # transcripts may contain "$..." — never evaluate them
+        ]},
+        "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]},
+    }}]
+
+def newer_answer(interview, ans_doc):
+    """The stored answer to ans_doc's question if it was recorded after ans_doc, else None."""
+    for a in interview.get("answers", []):
+        if a.get("questionIndex") == ans_doc["questionIndex"] and a.get("timestamp") \
+                and a["timestamp"] > ans_doc["timestamp"]:
+            return a
+    return None
@@ -0,0 +1,111 @@
+# answer_scorer.py
+# Local answer scoring: a CPU-only rating from the transcript, the question,
+# the skills the question names and the speech metrics. It gives the
+# provisional assessment while the LLM one is still on its way (and the
+# fallback when Gemini is down), so it only has to be roughly right.
+#
+#   score(question, transcript, speech, is_soft) -> assessment dict, same
+#   shape as the LLM assessment plus source="local"
+#
+# Features, each 0..1: length, relevance (question keywords + named skills
+# covered), structure (reasoning / STAR markers), lexical diversity and
+# delivery (filler rate, speaking pace). Rating = 1 + 4 * weighted sum.
+import re
+
+import skill_taxonomy
+
+STOPWORDS = set("""a about above after again all also am an and any are as at be because been before being
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers him his how i if in into is it its itself just me more most my no nor not now of off on
+once only or other our ours out over own same she should so some such than that the their theirs them then
+there these they this those through to too under until up very was we were what when where which while who
+whom why will with would you your yours tell describe explain give example time""".split())
+
+REASONING = ["because", "so that", "therefore", "for example", "for instance", "such as", "which meant",
+             "as a result", "trade-off", "tradeoff", "instead of", "compared to", "first", "then", "finally"]
+STAR      = ["situation", "task", "action", "result", "i decided", "i led", "we agreed", "outcome",
+             "learned", "feedback", "deadline", "the team", "my role"]
+
+WEIGHTS = {
+    False: dict(relevance=0.35, length=0.2, structure=0.15, diversity=0.1, delivery=0.2),   # technical
+    True:  dict(relevance=0.25, length=0.25, structure=0.25, diversity=0.1, delivery=0.15),  # soft skill
+}
+GOOD_WORDS = (60, 250)      # answer length (words) that scores fully
+GOOD_WPM   = (100, 170)
+
+
+def _stem(w):
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(w) > len(suffix) + 3 and w.endswith(suffix):
+            return w[:-len(suffix)]
+    return w
+
+def keywords(text):
+    return {_stem(w) for w in re.findall(r"[a-z][a-z+#.]*[a-z+#]|[a-z]", text.lower())
+            if len(w) > 2 and w not in STOPWORDS}
+
+def _ramp(x, lo, hi):
+    return 0.0 if x <= lo else 1.0 if x >= hi else (x - lo) / (hi - lo)
+
+def features(question, transcript, speech, is_soft):
+    words = re.findall(r"\w+", transcript.lower())
+    n     = len(words)
+    low, high = GOOD_WORDS
+    length = _ramp(n, 10, low) if n < high else max(0.6, 1 - (n - high) / 400)
+
+    q_kw, t_kw = keywords(question), keywords(transcript)
+    overlap    = len(q_kw & t_kw) / len(q_kw) if q_kw else 0.5
+    m          = skill_taxonomy.matcher()
+    q_skills   = {c for _, _, c, _ in m.matches(question)}
+    t_skills   = {c for _, _, c, _ in m.matches(transcript)}
+    if q_skills and not is_soft:
+        relevance = 0.4 * overlap + 0.6 * len(q_skills & t_skills) / len(q_skills)
+    else:
+        relevance = overlap
+
+    text      = transcript.lower()
+    markers   = REASONING + (STAR if is_soft else [])
+    structure = min(1.0, sum(text.count(mk) for mk in markers) / 3 + (0.2 if re.search(r"\d", text) else 0))
+
+    content   = [w for w in words if w not in STOPWORDS]
+    diversity = _ramp(len(set(content)) / len(content), 0.3, 0.6) if content else 0.0
+
+    filler = speech.get("filler_rate", 0) or 0
+    wpm    = speech.get("wpm", 0) or 0
+    pace   = 1.0 if GOOD_WPM[0] <= wpm <= GOOD_WPM[1] else 0.5 if wpm else 0.7   # no timing -> neutral
+    delivery = 0.6 * (1 - min(1.0, filler / 0.08)) + 0.4 * pace
+
+    return dict(length=length, relevance=relevance, structure=structure, diversity=diversity,
+                delivery=delivery, words=n, skills_missing=sorted(q_skills - t_skills) if not is_soft else [])
+
+def _notes(f, is_soft, strengths, improvements):
+    if f["relevance"] >= 0.6:  strengths.append("Stays on the question")
+    else:                      improvements.append("Address the question more directly")
+    if f["skills_missing"]:    improvements.append("Say how you used " + " and ".join(f["skills_missing"]))
+    if f["structure"] >= 0.6:  strengths.append("Explains reasoning with concrete steps or examples")
+    else:                      improvements.append("Walk through a concrete example" + (" (situation, action, result)" if is_soft else ""))
+    if f["length"] < 0.5:      improvements.append("Give a fuller answer")
+    if f["delivery"] >= 0.8:   strengths.append("Clear delivery with few filler words")
+    elif f["delivery"] < 0.5:  improvements.append("Reduce filler words and keep a steady pace")
+
+def score(question, transcript, speech, is_soft):
+    f = features(question or "", transcript or "", speech or {}, is_soft)
+    strengths, improvements = [], []
+    if f["words"] < 5:
+        rating = 1
+        improvements.append("The answer was too short to assess")
+    else:
+        total  = sum(w * f[k] for k, w in WEIGHTS[is_soft].items())
+        rating = max(1, min(5, round(1 + 4 * total)))
+        _notes(f, is_soft, strengths, improvements)
+
+    if is_soft:
+        return dict(rating=rating, strengths=strengths[:5], improvements=improvements[:5],
+                    explanation="Explanation not applicable", ideal_answer="Ideal answer not applicable",
+                    source="local")
+    # technical answers keep strengths/improvements empty (the UI shows those only for soft skills),
+    # so both groups go into the explanation, labelled
+    parts = ([f"Strengths: {'; '.join(strengths)}."] if strengths else []) + \
+            ([f"To improve: {'; '.join(improvements)}."] if improvements else [])
+    return dict(rating=rating, explanation=" ".join(parts) or "Quick local estimate",
+                ideal_answer="Ideal answer not available", strengths=[], improvements=[], source="local")
@@ -1,27 +1,84 @@
-import os, re, cv2, base64, json, numpy as np, tempfile, traceback
+import os, sys, re, cv2, base64, numpy as np, tempfile, traceback
 from collections import Counter
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv; load_dotenv()
 
-import PyPDF2, docx2txt, google.generativeai as genai
-from deepface import DeepFace
-import whisper, requests
+import google.generativeai as genai
 from pymongo import MongoClient
 from bson.objectid import ObjectId
+from bson.binary import Binary
+
+from question_bank import QuestionBank
+from llm_client import make_client, LLMUnavailable
+import metrics
+from metrics import stage, inference
+from profiling import profiled
+from frame_sampling import sampler as frame_sampler
+from idempotency import IdempotencyStore
+from question_cache import TechQuestionCache
+from job_queue import JobQueue, QueueJobFailed
+import model_manager
+from model_manager import ModelManager
+from admission import (admitted, Overloaded, whisper_gate, deepface_gate, frame_limiter, audio_limiter,
+                       frame_client_key)
+from analysis_core import (remove_code_fences, parse_json_obj, raw_key_skills, skills_summary_prompt,
+                           skill_analysis_prompt, final_summary_prompt, emotion_bullets_prompt,
+                           parse_bullets, speech_stats, aggregate_emotions, emotion_digest,
+                           soft_skill_answers, SOFT_SKILL_SECTIONS, version_filter, upsert_answer_pipeline,
+                           newer_answer, resume_analysis_prompt)
+import tech_questions
+import skill_taxonomy
+import answer_scorer
+from background_jobs import JobTracker, JobFailed, job_view
+from resume_text import extract_resume_text, ResumeExtractionError
+from prompt_budget import condense_resume, condense_job_description
 
 NUM_TECH_Q = 2            # default fallback
 
+# STUB_MODELS=1 swaps Whisper/DeepFace for fixed-latency stand-ins (load tests, benchmarks)
+if os.getenv("STUB_MODELS") == "1":
+    from perf.stubs import DeepFace, whisper
+else:
+    from deepface import DeepFace
+    import whisper
+
 # ─────────────────────────── DB & Gemini init ──────────────────────────────
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 MONGO_URI      = os.getenv("MONGO_URI","mongodb://localhost:27017")
 
-client = MongoClient(MONGO_URI)
-db     = client["soft-skill"]
+def connect_db():
+    """(Re)create the Mongo client and collection handles; called again in each forked worker."""
+    global client, db, resume_collection, interviews_collection
+    if MONGO_URI.startswith("mongomock://"):       # in-memory Mongo for local load tests
+        import mongomock; client = mongomock.MongoClient()
+    else:
+        client = MongoClient(MONGO_URI, event_listeners=[metrics.MongoCommandTimer()])
+    db     = client["soft-skill"]
+
+    resume_collection      = db["resume"]
+    interviews_collection  = db["interviews"]
+
+connect_db()
+
+# history listing: keyset pagination on (created_at, _id) per user
+interviews_collection.create_index([("email",1),("created_at",-1),("_id",-1)])
+
+question_bank = QuestionBank(db)       # loaded and refreshed from start_background()
+
+# Idempotency-Key records for submitAnswer / resume retries
+idempotency = IdempotencyStore(db["idempotencyKeys"]).ensure_indexes()
+
+# background jobs (resume analysis) and their status docs
+jobs = JobTracker(db["jobs"]).ensure_indexes()
+
+# inference handed to worker.py processes (INFERENCE_QUEUE=1), see offload()
+work_queue = JobQueue(db["workQueue"], db["workQueueDead"]).ensure_indexes()
 
-resume_collection      = db["resume"]
-interviews_collection  = db["interviews"]
+# technical questions shared across candidates, keyed by skill pair
+question_cache = TechQuestionCache(db["techQuestionCache"])
 
 genai.configure(api_key=GEMINI_API_KEY)
 try:
@@ -29,10 +86,44 @@ try:
 except Exception as e:
     print("Gemini load error:", e); gemini_model = None
 
-app = Flask(__name__); CORS(app)
+# every LLM call goes through this: deadlines, retries, concurrency cap, circuit breaker
+llm = make_client(gemini_model)
+
+app = Flask(__name__); CORS(app); metrics.init_app(app)   # per-stage histograms on /metrics
+app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_UPLOAD_MB","25"))*1024*1024   # uploads over this get 413
+
+# ─────────────────────────── Inference offload (job_queue.py / worker.py) ───
+INFERENCE_QUEUE   = os.getenv("INFERENCE_QUEUE","0") == "1"
+OFFLOAD_TIMEOUT   = dict(transcription = float(os.getenv("QUEUE_TRANSCRIPTION_TIMEOUT_SEC","120")),
+                         frames        = float(os.getenv("QUEUE_FRAME_TIMEOUT_SEC","5")),
+                         llm           = float(os.getenv("QUEUE_LLM_TIMEOUT_SEC","60")))
+MAX_QUEUED_AUDIO  = 15*1024*1024          # BSON documents top out at 16 MB; bigger uploads run here
+
+def offload(queue, kind, payload, **enqueue_kw):
+    """Run `kind` on a worker.py process and wait for its result (QueueJobFailed on failure/timeout)."""
+    return work_queue.wait(work_queue.enqueue(queue, kind, payload, **enqueue_kw), OFFLOAD_TIMEOUT[queue])
+
+# ─────────────────────────── Models (load on demand, see model_manager.py) ──
+def load_deepface():
+    """Emotion weights are cached inside DeepFace; one analyze() pulls them in."""
+    DeepFace.analyze(np.zeros((48,48,3),np.uint8), actions=['emotion'], enforce_detection=False)
+    return DeepFace
+
+def unload_deepface(_):
+    # the cache moved between DeepFace releases; clear whichever exists
+    for mod_name, attr in (("deepface.modules.modeling","cached_models"), ("deepface.DeepFace","model_obj")):
+        cache = getattr(sys.modules.get(mod_name), attr, None)
+        if isinstance(cache, dict):
+            cache.clear()
+    if "tensorflow" in sys.modules:
+        sys.modules["tensorflow"].keras.backend.clear_session()
+
+models = ModelManager().register("whisper", lambda: whisper.load_model("base"), size_mb=400) \
+                       .register("deepface", load_deepface, size_mb=350, unload=unload_deepface)
+if model_manager.PRELOAD and not INFERENCE_QUEUE:     # web nodes that offload never touch them
+    models.load_all()
 
 # ─────────────────────────── Whisper helpers ───────────────────────────────
-whisper_model = whisper.load_model("base")
 FILLER_WORDS  = {"um","uh","like","you","know","er","ah","so","well","actually"}
 
 def compute_speech_metrics(res):
@@ -50,15 +141,22 @@ def compute_speech_metrics(res):
     )
 
 def transcribe_audio(path):
-    res = whisper_model.transcribe(path, language=None)
+    if INFERENCE_QUEUE and os.path.getsize(path) <= MAX_QUEUED_AUDIO:
+        with open(path, "rb") as f:
+            audio = Binary(f.read())
+        with inference("whisper", "transcription"):
+            res = offload("transcription", "transcribe", {"audio": audio, "suffix": os.path.splitext(path)[1]})
+        return res["language"], res["transcript"], res["metrics"]
+    with models.use("whisper") as whisper_model, inference("whisper", "transcription"):
+        res = whisper_model.transcribe(path, language=None)
     return res.get("language","UNK").upper(), res.get("text",""), compute_speech_metrics(res)
 
-def remove_code_fences(t): return t.replace("```json","").replace("```","").strip()
 
 # ---------------------------------------------------
 # 1) Audio Endpoint
 # ---------------------------------------------------
 @app.route("/processAudio", methods=["POST"])
+@admitted(None, audio_limiter)
 def process_audio():
     if "audio" not in request.files:
         return jsonify({"error":"No audio file provided"}),400
@@ -66,11 +164,12 @@ def process_audio():
     audio_file = request.files["audio"]
     tmp_path = None
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
+        with stage("audio_decode"), tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
             audio_file.save(tmp.name)
             tmp_path = tmp.name
 
-        lang, transcript, metrics = transcribe_audio(tmp_path)
+        with whisper_gate.slot():
+            lang, transcript, metrics = transcribe_audio(tmp_path)
         return jsonify({
             "language": lang,
             "transcript": transcript,
@@ -79,6 +178,8 @@ def process_audio():
             "fillerCount": metrics["filler_count"],
             "fillerWordsUsed": metrics["filler_words_used"]
         })
+    except Overloaded:
+        raise
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
@@ -89,41 +190,67 @@ def process_audio():
 # ---------------------------------------------------
 # 2) Frame Analysis (DeepFace)
 # ---------------------------------------------------
+def decode_frame(data_url):
+    """'data:image/jpeg;base64,...' -> BGR ndarray (None if undecodable)."""
+    return decode_jpeg(base64.b64decode(data_url.split(',')[1]))
+
+def decode_jpeg(raw):
+    """Encoded image bytes -> BGR ndarray (None if undecodable)."""
+    return cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_COLOR)
+
+def annotate_frame(img, region, label):
+    if region:
+        x, y = region.get('x',0), region.get('y',0)
+        w, h = region.get('w',0), region.get('h',0)
+        cv2.rectangle(img,(x,y),(x+w,y+h),(255,0,0),2)
+        cv2.putText(img, label,(x,y-10),
+                    cv2.FONT_HERSHEY_SIMPLEX,0.9,(255,0,0),2)
+    return img
+
+def encode_frame(img):
+    _, buffer = cv2.imencode('.jpg', img)
+    return f"data:image/jpeg;base64,{base64.b64encode(buffer).decode('utf-8')}"
+
+def detect_emotion(img):
+    """DeepFace emotion on a decoded frame -> (dominant, distribution, face region)."""
+    if INFERENCE_QUEUE:
+        _, jpeg = cv2.imencode('.jpg', img)
+        with inference("deepface", "emotion_inference"):   # frames are perishable: one try, no backlog
+            res = offload("frames", "emotion", {"jpeg": Binary(jpeg.tobytes())},
+                          max_attempts=1, start_within=OFFLOAD_TIMEOUT["frames"])
+        return res["dominant"], res["distribution"], res["region"]
+    with models.use("deepface") as deepface, inference("deepface", "emotion_inference"):
+        analysis = deepface.analyze(img, actions=['emotion'], enforce_detection=False)
+    face_data = analysis[0] if isinstance(analysis, list) else analysis
+    distribution = {e: float(v) for e,v in (face_data.get('emotion') or {}).items()}
+    return face_data.get('dominant_emotion','unknown'), distribution, face_data.get('region',{})
+
 @app.route('/analyzeFrame', methods=['POST'])
+@admitted(deepface_gate, frame_limiter, key=frame_client_key)
+@profiled
 def analyze_frame():
     data = request.json
     if not data or 'image' not in data:
         return jsonify({'error':'No image data'}),400
 
     try:
-        encoded_image = data['image'].split(',')[1]
-        np_arr = np.frombuffer(base64.b64decode(encoded_image), np.uint8)
-        img = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+        with stage("frame_decode"):
+            img = decode_frame(data['image'])
         if img is None:
             return jsonify({'error':'Invalid image data'}),400
 
-        analysis = DeepFace.analyze(img, actions=['emotion'], enforce_detection=False)
-        face_data = analysis[0] if isinstance(analysis, list) else analysis
-
-        dominant_emotion = face_data.get('dominant_emotion','unknown')
-        emotion_distribution = face_data.get('emotion',{})
-
-        region = face_data.get('region',{})
-        if region:
-            x, y = region.get('x',0), region.get('y',0)
-            w, h = region.get('w',0), region.get('h',0)
-            cv2.rectangle(img,(x,y),(x+w,y+h),(255,0,0),2)
-            cv2.putText(img, dominant_emotion,(x,y-10),
-                        cv2.FONT_HERSHEY_SIMPLEX,0.9,(255,0,0),2)
+        dominant_emotion, emotion_distribution, region = detect_emotion(img)
 
-        _, buffer = cv2.imencode('.jpg', img)
-        processed_base64 = base64.b64encode(buffer).decode('utf-8')
-        processed_image = f"data:image/jpeg;base64,{processed_base64}"
+        with stage("jpeg_encode"):
+            annotate_frame(img, region, dominant_emotion)
+            processed_image = encode_frame(img)
 
+        session_key = data.get('sessionId') or request.headers.get('Clerk-User-Email') or request.remote_addr
         return jsonify({
             'dominant_emotion': dominant_emotion,
             'emotion_distribution': emotion_distribution,
-            'image': processed_image
+            'image': processed_image,
+            'nextIntervalMs': frame_sampler.recommend(session_key, emotion_distribution)
         })
     except Exception as e:
         traceback.print_exc()
@@ -167,116 +294,156 @@ def log_emotion():
     return jsonify({"message":"Emotion logged"})
 
 # ---------------------------------------------------
-# 4) Resume Analysis Endpoint (unchanged)
+# 4) Resume Analysis Endpoint
 # ---------------------------------------------------
-def extract_text_from_pdf(pdf_path):
-    text_content = ""
-    with open(pdf_path, "rb") as f:
-        reader = PyPDF2.PdfReader(f)
-        for page in reader.pages:
-            text_content += page.extract_text() or ""
-    return text_content.strip()
-
-def extract_text_from_docx(docx_path):
-    return docx2txt.process(docx_path).strip()
-
 @app.route("/api/resume", methods=["POST"])
+@idempotency.idempotent
+@profiled
 def analyze_resume():
+    """Queue the resume for background analysis -> 202 {jobId}; poll /api/resume/jobs/<jobId>."""
     clerk_email = request.headers.get("Clerk-User-Email")
     if not clerk_email:
-        return jsonify({"analysis":"User not authenticated."}),401
+        return jsonify({"error":"User not authenticated."}),401
 
     if "resumeFile" not in request.files:
-        return jsonify({"analysis":"No resume file provided."}),200
+        return jsonify({"error":"No resume file provided."}),400
 
     resume_file = request.files["resumeFile"]
     job_description = request.form.get("jobDescription","").strip()
 
-    tmp_path = None
+    file_ext = (resume_file.filename or "").split(".")[-1].lower()
+    if file_ext not in ["pdf","docx"]:
+        return jsonify({"error":"Unsupported file type. Please upload PDF or DOCX."}),400
+
+    with stage("resume_save"), tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_ext}") as tmp:
+        resume_file.save(tmp.name)
     try:
-        file_ext = resume_file.filename.split(".")[-1].lower()
-        if file_ext not in ["pdf","docx"]:
-            return jsonify({"analysis":"Unsupported file type. Please upload PDF or DOCX."}),200
+        job_id = jobs.submit(clerk_email, "resume", resume_pipeline, clerk_email, tmp.name, file_ext, job_description)
+    except Exception as e:
+        os.remove(tmp.name)       # resume_pipeline normally removes it; it will never run
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_ext}") as tmp:
-            resume_file.save(tmp.name)
-            tmp_path = tmp.name
+    return jsonify({"jobId": job_id, "status": "queued",
+                    "statusUrl": f"/api/resume/jobs/{job_id}"}), 202, {"Location": f"/api/resume/jobs/{job_id}"}
 
-        if file_ext == "pdf":
-            resume_text = extract_text_from_pdf(tmp_path)
-        else:
-            resume_text = extract_text_from_docx(tmp_path)
+@app.route("/api/resume/jobs/<job_id>", methods=["GET"])
+def resume_job_status(job_id):
+    clerk_email = request.headers.get("Clerk-User-Email")
+    if not clerk_email:
+        return jsonify({"error":"Not authenticated"}),401
+    job = jobs.get(job_id, clerk_email)
+    if not job:
+        return jsonify({"error":"Job not found"}),404
+    return jsonify(job_view(job))
 
+def resume_pipeline(job, clerk_email, tmp_path, file_ext, job_description):
+    """Background job: extract -> LLM analysis -> skills summary -> resume doc."""
+    try:
+        # page-by-page, capped and time-boxed in a worker process
+        job.progress("extracting", 0.1)
+        try:
+            resume_text = extract_resume_text(tmp_path, file_ext)
+        except ResumeExtractionError as e:
+            raise JobFailed(str(e))
         if not resume_text.strip():
-            return jsonify({"analysis":"No text could be extracted from the resume."}),200
-
-        if not gemini_model:
-            return jsonify({"analysis":"Gemini model not loaded or unavailable."}),200
-
-        if job_description:
-            prompt = f"""
-You are an HR assistant analyzing a resume for a specific job.
-Extract the following details in a structured JSON:
-{{
-  "full_name": string,
-  "contact_details": string,
-  "professional_summary": string,
-  "relevant_experience": string,
-  "key_skills": string,
-  "certifications": string,
-  "industry_expertise": string,
-  "match_score": number,
-  "match_explanation": string
-}}
-
-Resume Text:
-{resume_text}
-
-Job Description:
-{job_description}
-"""
-        else:
-            prompt = f"""
-You are an HR assistant analyzing a resume (no job description).
-Extract the following details in a structured JSON:
-{{
-  "full_name": string,
-  "contact_details": string,
-  "professional_summary": string,
-  "relevant_experience": string,
-  "key_skills": string,
-  "certifications": string,
-  "industry_expertise": string
-}}
+            raise JobFailed("No text could be extracted from the resume.")
 
-Resume Text:
-{resume_text}
-"""
+        if not llm.available:
+            raise JobFailed("Gemini model not loaded or unavailable.")
 
+        # fit resume/JD into the prompt token budget (sections the prompt asks for first)
+        job.progress("analyzing", 0.4)
+        prompt = resume_analysis_prompt(condense_resume(resume_text),
+                                        condense_job_description(job_description) if job_description else "")
         try:
-            response = gemini_model.generate_content(prompt)
-            gemini_output = response.text if response and response.text else "No response from Gemini."
-            gemini_output = remove_code_fences(gemini_output)
-        except Exception as e:
-            gemini_output = f"Error analyzing resume with Gemini: {e}"
+            analysis = remove_code_fences(llm.generate(prompt, label="resume_analysis") or "No response from Gemini.")
+        except LLMUnavailable as e:
+            raise JobFailed(f"Error analyzing resume with Gemini: {e}")
+
+        # done here so /api/extractSkills and /api/startInterview never wait on it
+        job.progress("summarizing_skills", 0.75)
+        raw_skills = raw_key_skills(analysis)
+        skills_summary = (summarize_skills(raw_skills) or "") if raw_skills.strip() else ""
 
         resume_doc = {
             "email": clerk_email,
-            "analysis": gemini_output,
+            "analysis": analysis,
             "job_description": job_description,
             "resume_text": resume_text[:1000],
             "created_at": datetime.utcnow()
         }
-        resume_collection.insert_one(resume_doc)
-        return jsonify({"analysis": gemini_output})
-
-    except Exception as e:
-        traceback.print_exc()
-        return jsonify({"analysis":str(e)}),200
+        if skills_summary and not skills_summary.lower().startswith("error"):
+            resume_doc["skills_summary"] = skills_summary
+        res = resume_collection.insert_one(resume_doc)
+        if "skills_summary" in resume_doc:
+            jobs.submit(clerk_email, "tech_questions", tech_questions_job, res.inserted_id)
+        return {"resumeId": str(res.inserted_id), "analysis": analysis, "skills_summary": skills_summary}
     finally:
-        if tmp_path and os.path.exists(tmp_path):
+        if os.path.exists(tmp_path):
             os.remove(tmp_path)
 
+def tech_questions_job(job, resume_id):
+    """Background job: pick the technical questions ahead of the interview start."""
+    resume = resume_collection.find_one({"_id": resume_id}, {"skills_summary": 1, "email": 1})
+    skills_summary = (resume or {}).get("skills_summary", "").strip()
+    if not skills_summary:
+        raise JobFailed("No skills summary to generate questions from")
+    job.progress("generating", 0.2)
+    questions = pick_tech_questions(resume["email"], skills_summary)
+    if questions is None:
+        raise JobFailed("Gemini model not loaded or unavailable.")
+    resume_collection.update_one({"_id": resume_id, "skills_summary": resume["skills_summary"]},
+                                 {"$set": {"tech_questions": tech_questions.precomputed_doc(questions, skills_summary)}})
+    return {"resumeId": str(resume_id), "count": len(questions)}
+
+def refill_question_cache_job(job, skills_summary):
+    """Background job: one more live generation into the shared question cache."""
+    if not llm.available:
+        raise JobFailed("Gemini model not loaded or unavailable.")
+    skills = tech_questions.skill_lines(skills_summary)
+    added = question_cache.add(tech_questions.generate(llm, skills_summary, NUM_TECH_Q), skills)
+    metrics.TECH_Q_CACHE.inc(result="refill")
+    return {"added": added}
+
+def seen_questions(email, last=20):
+    """Technical questions this candidate already had in their recent interviews."""
+    seen = set()
+    for iv in interviews_collection.find({"email": email}, {"questions": 1, "technicalCount": 1}) \
+                                   .sort("created_at", -1).limit(last):
+        seen.update(iv.get("questions", [])[:iv.get("technicalCount", NUM_TECH_Q)])
+    return seen
+
+def pick_tech_questions(email, skills_summary):
+    """Unseen questions from the shared cache, else a live generation that then feeds the
+    cache. A thin cache is refilled in the background. None when Gemini is needed but down."""
+    skills = tech_questions.skill_lines(skills_summary)
+    questions, thin = question_cache.sample(skills, NUM_TECH_Q, exclude=seen_questions(email))
+    if questions is None:
+        if not llm.available:
+            return None
+        questions = tech_questions.generate(llm, skills_summary, NUM_TECH_Q)
+        question_cache.add(questions, skills)
+    elif thin and llm.available:
+        jobs.submit(email, "tech_questions_refill", refill_question_cache_job, skills_summary)
+    return questions
+
+def summarize_skills(raw_skills):
+    """key_skills text -> bullet list. The local taxonomy first; Gemini only when it
+    covers too little of the list. None when neither is available."""
+    summary_text = skill_taxonomy.local_summary(raw_skills)
+    if summary_text:
+        metrics.SKILL_SUMMARIES.inc(source="taxonomy")
+        return summary_text
+    if not llm.available:
+        return None
+    metrics.SKILL_SUMMARIES.inc(source="llm")
+    try:
+        summary_text = llm.generate(skills_summary_prompt(raw_skills), label="skills_summary") or "- No Skills"
+        return remove_code_fences(summary_text)
+    except LLMUnavailable as e:
+        return f"Error summarizing skills: {e}"
+
 # ---------------------------------------------------
 # 5) Summarize Key Skills
 # ---------------------------------------------------
@@ -294,34 +461,18 @@ def extract_skills():
     if not analysis_json:
         return jsonify({"error": "No analysis found"}), 400
 
-    try:
-        data = json.loads(analysis_json)
-    except:
-        data = {}
+    # precomputed by the resume job
+    if last_resume.get("skills_summary", "").strip():
+        return jsonify({"skills_summary": last_resume["skills_summary"]})
 
-    raw_skills = data.get("key_skills", "")
+    raw_skills = raw_key_skills(analysis_json)
     if not raw_skills.strip():
         return jsonify({"error": "No key_skills found in analysis"}), 400
 
-    if not gemini_model:
+    summary_text = summarize_skills(raw_skills)
+    if summary_text is None:
         return jsonify({"error": "Gemini model not loaded"}), 500
 
-    cleaned = re.sub(r"(Languages|Tools|Technologies/Frameworks):", "", raw_skills, flags=re.IGNORECASE)
-    prompt = f"""
-We have these raw skill lines from a resume:
-\"\"\"{cleaned}\"\"\"
-
-Ignore any mention that the candidate lacks skills.
-Produce a SHORT bullet list (max 10) of distinct skill names.
-No explanation, no code fences, just bullet items.
-"""
-    try:
-        resp = gemini_model.generate_content(prompt)
-        summary_text = resp.text if (resp and resp.text) else "- No Skills"
-        summary_text = remove_code_fences(summary_text)
-    except Exception as e:
-        summary_text = f"Error summarizing skills: {e}"
-
     resume_collection.update_one(
         {"_id": last_resume["_id"]},
         {"$set": {"skills_summary": summary_text}}
@@ -336,8 +487,8 @@ No explanation, no code fences, just bullet items.
 def start_interview():
     """
     1) Summarize the resume's key_skills if missing
-    2) Generate 5 skill-based (technical) Qs from Gemini
-    3) Fetch 1 random question from each of the 6 soft skill sections in softSkillQuestions:
+    2) Take the precomputed skill-based (technical) Qs, or generate them with Gemini
+    3) Pick 1 random question from each of the 6 soft skill sections (in-memory question bank):
        communication, teamwork, problemSolving, adaptability, leadership, timeManagement
     4) Merge them -> final questions (total 11)
     5) Create interview doc
@@ -350,38 +501,19 @@ def start_interview():
     if not last_resume:
         return jsonify({"error": "No resume found; please upload resume first"}), 400
 
-    if not gemini_model:
-        return jsonify({"error": "Gemini model not loaded"}), 500
-
     # Summarize if needed
     skills_summary = last_resume.get("skills_summary", "").strip()
     if not skills_summary:
         analysis_json = last_resume.get("analysis", "")
         if not analysis_json:
             return jsonify({"error": "No analysis found. Please upload resume first."}), 400
-        try:
-            data = json.loads(analysis_json)
-        except:
-            data = {}
-        raw_skills = data.get("key_skills", "")
+        raw_skills = raw_key_skills(analysis_json)
         if not raw_skills.strip():
             return jsonify({"error": "No key_skills found in analysis"}), 400
 
-        cleaned = re.sub(r"(Languages|Tools|Technologies/Frameworks):", "", raw_skills, flags=re.IGNORECASE)
-        sum_prompt = f"""
-We have these raw skill lines from a resume:
-\"\"\"{cleaned}\"\"\"
-
-Ignore any mention that the candidate lacks skills.
-Produce a SHORT bullet list (max 10) of distinct skill names.
-No explanation, no code fences, just bullet items.
-"""
-        try:
-            resp = gemini_model.generate_content(sum_prompt)
-            summary_text = resp.text if (resp and resp.text) else "- No Skills"
-            summary_text = remove_code_fences(summary_text)
-        except Exception as e:
-            summary_text = f"Error summarizing skills: {e}"
+        summary_text = summarize_skills(raw_skills)
+        if summary_text is None:
+            return jsonify({"error": "Gemini model not loaded"}), 500
 
         resume_collection.update_one(
             {"_id": last_resume["_id"]},
@@ -392,78 +524,23 @@ No explanation, no code fences, just bullet items.
     if not skills_summary or skills_summary.lower().startswith("error"):
         return jsonify({"error": "Failed to summarize skills automatically."}), 400
 
-    # 1) Generate the 5 skill-based (technical) Qs from the resume skills
-    lines = []
-    for ln in skills_summary.split("\n"):
-        sk = ln.strip("-").strip()
-        if sk:
-            lines.append(sk)
-    lines = list(dict.fromkeys(lines))[:10]
-    bullet_list = "\n".join([f"- {s}" for s in lines])
-
-    tech_prompt = f"""
-Below is the candidate's skill list (ignore any mention of lacking skill):
-{bullet_list}
-
-Generate exactly {NUM_TECH_Q} skill-based interview questions.
-Each question must mention at least two distinct skill names from above 
-and ask how the candidate has used them in real projects.
-
-Return only a valid JSON array of {NUM_TECH_Q} strings, with no extra commentary or metadata.
-If you cannot comply, return "Unable to comply."
-"""
-
-    def call_model(p):
-        try:
-            r = gemini_model.generate_content(p)
-            text_out = r.text if (r and r.text) else "[]"
-            return remove_code_fences(text_out)
-        except Exception as e:
-            return f"Error calling model: {e}"
-
-    raw_output = call_model(tech_prompt)
+    # 1) skill-based (technical) Qs: precomputed right after the resume job, else the
+    #    shared cache, else live. The conditional $unset hands one precomputed set to
+    #    exactly one interview.
+    cached = tech_questions.fresh_precomputed(last_resume, skills_summary, NUM_TECH_Q)
+    took_precomputed = bool(cached) and resume_collection.update_one(
+        {"_id": last_resume["_id"], "tech_questions.generated_at": cached["generated_at"]},
+        {"$unset": {"tech_questions": ""}}).modified_count > 0
+    if took_precomputed:
+        skill_questions = cached["questions"]
+    else:
+        skill_questions = pick_tech_questions(clerk_email, skills_summary)
+        if skill_questions is None:
+            return jsonify({"error": "Gemini model not loaded"}), 500
 
-    def parse_json_arr(txt):
-        try:
-            arr = json.loads(txt)
-            if not isinstance(arr, list):
-                return [txt]
-            return arr
-        except:
-            return [txt]
-
-    skill_questions = parse_json_arr(raw_output)
-
-    # optional check each question references 2+ skill names
-    def skill_count_in_q(q):
-        q_lower = q.lower()
-        found = []
-        for sk in lines:
-            if sk.lower() in q_lower:
-                found.append(sk)
-        return len(set(found))
-
-    all_ok = True
-    for q in skill_questions:
-        if skill_count_in_q(q) < 2:
-            all_ok = False
-            break
-    if not all_ok:
-        raw2 = call_model(tech_prompt)
-        skill_questions = parse_json_arr(raw2)
-
-    # 2) 6 soft-skill sections to pick from the DB: communication, teamwork, etc.
-    sections = ["communication", "teamwork", "problemSolving", "adaptability", "leadership", "timeManagement"]
-    soft_skill_questions = []
-    import random
-    for section in sections:
-        doc = db["softSkillQuestions"].find_one({"section": section})
-        if doc and doc.get("questions"):
-            qlist = doc["questions"]
-            chosen = random.choice(qlist)
-            soft_skill_questions.append(chosen)
-        else:
-            soft_skill_questions.append(f"[Missing question for {section}]")
+    # 2) 6 soft-skill sections from the in-memory question bank: communication, teamwork, etc.
+    sections = SOFT_SKILL_SECTIONS
+    soft_skill_questions = question_bank.pick(sections)
 
     # Combine final list: 5 technical + 6 soft skill => 11 total
     final_questions = skill_questions + soft_skill_questions
@@ -472,6 +549,7 @@ If you cannot comply, return "Unable to comply."
         "email": clerk_email,
         "questions": final_questions,
         "answers": [],
+        "version": 0,
         "emotionTimeline": [],
         "status": "in_progress",
         "created_at": datetime.utcnow(),
@@ -480,6 +558,8 @@ If you cannot comply, return "Unable to comply."
         "softSkillSections": sections
     }
     res = interviews_collection.insert_one(interview_doc)
+    if took_precomputed:   # next interview's set; after the insert so it counts these as seen
+        jobs.submit(clerk_email, "tech_questions", tech_questions_job, last_resume["_id"])
 
     return jsonify({
         "message": "Interview started with skill-based + 6 soft-skill questions",
@@ -490,52 +570,26 @@ If you cannot comply, return "Unable to comply."
 # ---------------------------------------------------
 # 7) /api/submitAnswer  ← ★ UPDATED BLOCK INSIDE ★
 # ---------------------------------------------------
-@app.route("/api/submitAnswer", methods=["POST"])
-def submit_answer():
-    clerk_email  = request.headers.get("Clerk-User-Email")
-    if not clerk_email:  return jsonify({"error":"Not authenticated"}),401
-
-    interview_id = request.form.get("interviewId")
-    q_idx        = int(request.form.get("questionIndex","0"))
-    if not interview_id:           return jsonify({"error":"Missing interviewId"}),400
-    if "audio" not in request.files:return jsonify({"error":"No audio file"}),400
-
-    obj_id   = ObjectId(interview_id)
-    interview= interviews_collection.find_one({"_id":obj_id,"email":clerk_email})
-    if not interview:              return jsonify({"error":"Interview not found"}),404
+def answer_doc(q_idx, lang, transcript, metrics):
+    return dict(
+        questionIndex   = q_idx,
+        transcript      = transcript,
+        language        = lang,
+        wpm             = metrics["wpm"],
+        fillerRate      = metrics["filler_rate"],
+        fillerCount     = metrics["filler_count"],
+        fillerWordsUsed = metrics["filler_words_used"],
+        timestamp       = datetime.utcnow()
+    )
 
-    tmp_path = None
-    try:
-        # -- save audio temp
-        with tempfile.NamedTemporaryFile(delete=False,suffix=".wav") as tmp:
-            request.files["audio"].save(tmp.name)
-            tmp_path = tmp.name
+# Gemini assessments run here so submitAnswer can stop waiting after ANSWER_SLO_SEC
+ANSWER_SLO_SEC  = float(os.getenv("ANSWER_SLO_SEC","4"))
+assessment_pool = ThreadPoolExecutor(int(os.getenv("ASSESSMENT_WORKERS","8")), thread_name_prefix="assess")
 
-        lang, transcript, metrics = transcribe_audio(tmp_path)
-
-        # -- push raw answer
-        ans_doc = dict(
-            questionIndex   = q_idx,
-            transcript      = transcript,
-            language        = lang,
-            wpm             = metrics["wpm"],
-            fillerRate      = metrics["filler_rate"],
-            fillerCount     = metrics["filler_count"],
-            fillerWordsUsed = metrics["filler_words_used"],
-            timestamp       = datetime.utcnow()
-        )
-        interviews_collection.update_one({"_id":obj_id},{"$push":{"answers":ans_doc}})
-        answer_pos = len(interview.get("answers",[]))  # position after push
-
-        # -- LLM assessment --------------------------------------------------
-        assessment = {}
-        if gemini_model:
-            tech_cnt = interview.get("technicalCount", NUM_TECH_Q)
-            is_soft  = q_idx >= tech_cnt
-            q_text   = interview["questions"][q_idx] if q_idx < len(interview["questions"]) else ""
-
-            if is_soft:
-                prompt = f"""
+def llm_assessment(q_text, transcript, is_soft):
+    """Gemini assessment of one answer; None when the call or its output fails."""
+    if is_soft:
+        prompt = f"""
 You are a behavioural-interview assessor.
 
 Return JSON:
@@ -548,8 +602,8 @@ Return JSON:
 Question: {q_text}
 Answer transcript: {transcript}
 """
-            else:
-                prompt = f"""
+    else:
+        prompt = f"""
 You are a technical interviewer.
 
 Return JSON:
@@ -563,53 +617,139 @@ Question: {q_text}
 Answer transcript: {transcript}
 """
 
-            try:
-                raw = remove_code_fences(gemini_model.generate_content(prompt).text or "{}")
-                print("Gemini raw:", raw)                           # debug line
-                try:
-                    parsed = json.loads(raw) if raw.strip().startswith("{") else {}
-                except:
-                    parsed = {}
-                if not isinstance(parsed, dict):
-                    parsed = {}
-
-                if is_soft:
-                    # Always include placeholders for explanation/ideal
-                    assessment = {
-                        "rating"      : parsed.get("rating", 3),
-                        "strengths"   : parsed.get("strengths", []),
-                        "improvements": parsed.get("improvements", []),
-                        "explanation" : "Explanation not applicable",
-                        "ideal_answer": "Ideal answer not applicable"
-                    }
-                else:
-                    assessment = {
-                        "rating"      : parsed.get("rating", 3),
-                        "explanation" : parsed.get("explanation", "Explanation not available"),
-                        "ideal_answer": parsed.get("ideal_answer", "Ideal answer not available"),
-                        # keep empty arrays for UI consistency
-                        "strengths"   : [],
-                        "improvements": []
-                    }
+    try:
+        raw = remove_code_fences(llm.generate(prompt, label="answer_assessment") or "{}")
+        print("Gemini raw:", raw)                           # debug line
+        parsed = parse_json_obj(raw)
+        if not parsed.get("rating"):
+            return None
+
+        if is_soft:
+            # Always include placeholders for explanation/ideal
+            assessment = {
+                "rating"      : parsed["rating"],
+                "strengths"   : parsed.get("strengths", []),
+                "improvements": parsed.get("improvements", []),
+                "explanation" : "Explanation not applicable",
+                "ideal_answer": "Ideal answer not applicable"
+            }
+        else:
+            assessment = {
+                "rating"      : parsed["rating"],
+                "explanation" : parsed.get("explanation", "Explanation not available"),
+                "ideal_answer": parsed.get("ideal_answer", "Ideal answer not available"),
+                # keep empty arrays for UI consistency
+                "strengths"   : [],
+                "improvements": []
+            }
+        assessment["source"] = "llm"
+        return assessment
+    except Exception as e:
+        print("Answer assessment failed:", e)
+        return None
+
+def assess_answer(interview, q_idx, transcript, speech):
+    """-> (assessment, late). Gemini's assessment if it arrives within ANSWER_SLO_SEC;
+    otherwise the local scorer's provisional one, and `late` is the Gemini call still
+    running (see replace_assessment). With Gemini down or failing: local, late=None."""
+    is_soft = q_idx >= interview.get("technicalCount", NUM_TECH_Q)
+    q_text  = interview["questions"][q_idx] if q_idx < len(interview["questions"]) else ""
+    if llm.available:
+        if INFERENCE_QUEUE:
+            pending = assessment_pool.submit(offload, "llm", "assess",
+                                             dict(question=q_text, transcript=transcript, is_soft=is_soft))
+        else:
+            pending = assessment_pool.submit(llm_assessment, q_text, transcript, is_soft)
+        try:
+            assessment = pending.result(timeout=ANSWER_SLO_SEC)
+        except FutureTimeout:
+            metrics.ANSWER_ASSESSMENTS.inc(path="provisional")
+            return dict(answer_scorer.score(q_text, transcript, speech, is_soft), provisional=True), pending
+        except QueueJobFailed:
+            assessment = None
+        if assessment:
+            metrics.ANSWER_ASSESSMENTS.inc(path="llm")
+            return assessment, None
+    metrics.ANSWER_ASSESSMENTS.inc(path="local")
+    return answer_scorer.score(q_text, transcript, speech, is_soft), None
+
+def replace_assessment(late, interview_id, ans_doc):
+    """When the late Gemini assessment lands, swap it in for the provisional one —
+    only on this very answer (questionIndex + timestamp), never on a newer retake."""
+    def swap(fut):
+        assessment = None if fut.exception() else fut.result()
+        this_answer = {"_id": interview_id, "answers": {"$elemMatch": {"questionIndex": ans_doc["questionIndex"],
+                                                                       "timestamp": ans_doc["timestamp"]}}}
+        if not assessment:
+            # no better rating is coming: the local one is final, so drop its provisional flag
+            interviews_collection.update_one(this_answer, {"$unset": {"answers.$.assessment.provisional": ""}})
+            metrics.ANSWER_ASSESSMENTS.inc(path="late_failed")
+            return
+        res = interviews_collection.update_one(this_answer, {"$set": {"answers.$.assessment": assessment}})
+        metrics.ANSWER_ASSESSMENTS.inc(path="replaced" if res.modified_count else "superseded")
+    late.add_done_callback(swap)
+
+ANSWER_WRITE_RETRIES = int(os.getenv("ANSWER_WRITE_RETRIES","5"))
+
+def store_answer(interview, ans_doc):
+    """Atomically replace/append the answer for ans_doc's question (see analysis_core).
+    On a version conflict re-read and retry; if a newer answer to the same
+    question landed meanwhile, that one wins. -> the answer now stored."""
+    version = interview.get("version", 0)
+    for _ in range(ANSWER_WRITE_RETRIES):
+        res = interviews_collection.update_one({"_id": interview["_id"], **version_filter(version)},
+                                               upsert_answer_pipeline(ans_doc))
+        if res.matched_count:
+            interview["version"] = version + 1
+            return ans_doc
+        current = interviews_collection.find_one({"_id": interview["_id"]}, {"answers": 1, "version": 1})
+        if current is None:
+            raise RuntimeError("Interview disappeared")
+        newer = newer_answer(current, ans_doc)
+        if newer:
+            return newer
+        version = current.get("version", 0)
+    raise RuntimeError("Answer write kept conflicting, try again")
 
-            except Exception as e:
-                assessment = {
-                    "rating"      : 3,
-                    "explanation" : f"Parse error: {e}",
-                    "ideal_answer": "N/A",
-                    "strengths"   : [],
-                    "improvements": []
-                }
-
-        # -- store assessment
-        interviews_collection.update_one(
-            {"_id":obj_id},
-            {"$set":{f"answers.{answer_pos}.assessment":assessment}}
-        )
+@app.route("/api/submitAnswer", methods=["POST"])
+@idempotency.idempotent
+@admitted(None, audio_limiter)
+@profiled
+def submit_answer():
+    clerk_email  = request.headers.get("Clerk-User-Email")
+    if not clerk_email:  return jsonify({"error":"Not authenticated"}),401
+
+    interview_id = request.form.get("interviewId")
+    q_idx        = int(request.form.get("questionIndex","0"))
+    if not interview_id:           return jsonify({"error":"Missing interviewId"}),400
+    if "audio" not in request.files:return jsonify({"error":"No audio file"}),400
+
+    obj_id   = ObjectId(interview_id)
+    interview= interviews_collection.find_one({"_id":obj_id,"email":clerk_email})
+    if not interview:              return jsonify({"error":"Interview not found"}),404
+
+    tmp_path = None
+    try:
+        # -- save audio temp
+        with stage("audio_decode"), tempfile.NamedTemporaryFile(delete=False,suffix=".wav") as tmp:
+            request.files["audio"].save(tmp.name)
+            tmp_path = tmp.name
+
+        with whisper_gate.slot():             # the slot covers Whisper only, not the LLM wait or writes
+            lang, transcript, metrics = transcribe_audio(tmp_path)
+
+        # -- assessment (LLM within the SLO, else provisional), then one write -
+        ans_doc = answer_doc(q_idx, lang, transcript, metrics)
+        ans_doc["assessment"], late = assess_answer(interview, q_idx, transcript, metrics)
+        stored = store_answer(interview, ans_doc)
+        if late and stored is ans_doc:
+            replace_assessment(late, interview["_id"], ans_doc)
 
         return jsonify({"message":"Answer submitted",
                         "metrics":metrics,
-                        "assessment":assessment})
+                        "assessment":stored["assessment"]})
+    except Overloaded:
+        raise
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error":str(e)}),500
@@ -652,6 +792,7 @@ def finalize_interview():
 # 9) /api/getAnalysis — UPDATED
 # ---------------------------------------------------
 @app.route("/api/getAnalysis", methods=["POST"])
+@profiled
 def get_analysis():
     clerk_email = request.headers.get("Clerk-User-Email")
     if not clerk_email: return jsonify({"error":"Not authenticated"}),401
@@ -669,58 +810,38 @@ def get_analysis():
     tech_cnt      = interview.get("technicalCount", NUM_TECH_Q)      ##### <NEW>
 
     # ----- speech stats -------------------------------------------------------
-    tot_words  = sum(len(a.get("transcript","").split()) for a in answers)
-    tot_filler = sum(a.get("fillerCount",0) for a in answers)
-    ratings    = [a.get("assessment",{}).get("rating",3) for a in answers if a.get("assessment")]
-    avg_rating = round(sum(ratings)/len(ratings),2) if ratings else 3.0
-    filler_rt  = round(tot_filler/tot_words,3) if tot_words else 0.0
-
-    # ----- emotion aggregate (unchanged) --------------------------------------
-    import statistics
-    bucket={}
-    for snap in emo_timeline:
-        for emo,v in (snap.get("distribution") or {}).items():
-            bucket.setdefault(emo,[]).append(float(v))
-    emo_avg = {e:round(sum(v)/len(v),1) for e,v in bucket.items()}
-    emo_std = {e:round(statistics.pstdev(v),1) for e,v in bucket.items() if len(v)>1}
+    tot_words, filler_rt, avg_rating = speech_stats(answers)
+
+    # ----- emotion aggregate --------------------------------------------------
+    emo_avg, emo_std = aggregate_emotions(emo_timeline)
 
     # ----- per-skill analysis --------------------------------------------------
-    skill_sections = interview.get("softSkillSections",
-        ["communication","teamwork","problemSolving","adaptability","leadership","timeManagement"])
+    skill_answers  = soft_skill_answers(interview, tech_cnt)
     skillAnalysis  = {}
-    if gemini_model:
-        for i,skill in enumerate(skill_sections):
-            q_idx = tech_cnt + i                                     ##### <NEW>
-            ans   = next((a for a in answers if a["questionIndex"]==q_idx),None)
+    if llm.available:
+        for skill,ans in skill_answers:
             if not ans:
                 skillAnalysis[skill]="No answer provided."
                 continue
             tr   = ans.get("transcript","")
             rat  = ans.get("assessment",{}).get("rating",3)
             try:
-                txt = gemini_model.generate_content(
-f"""Evaluate {skill}.
-Transcript: \"\"\"{tr}\"\"\" Rating:{rat}/5.
-Give ≤5 bullet points.""").text
+                txt = llm.generate(skill_analysis_prompt(skill, tr, rat), label="skill_analysis")
                 skillAnalysis[skill]=remove_code_fences(txt)
             except Exception as e:
                 skillAnalysis[skill]=f"Error: {e}"
     else:
-        skillAnalysis = {s:"Gemini not loaded." for s in skill_sections}
+        skillAnalysis = {s:"Gemini not loaded." for s,_ in skill_answers}
 
     # ----- final summary & emotion bullets (same code as before) --------------
-    top = lambda d,k=2:", ".join(f"{e} ({v}%)" for e,v in sorted(d.items(),key=lambda x:x[1],reverse=True)[:k])
-    emo_digest = "No emotion captured." if not emo_avg else f"Dominant → {top(emo_avg)} | Var → {top(emo_std)}"
+    digest = emotion_digest(emo_avg, emo_std)
     final_summary="Gemini not loaded"; emo_bullets=[]
-    if gemini_model:
+    if llm.available:
         try:
-            final_summary = gemini_model.generate_content(
-f"""Speech rating {avg_rating}, filler {filler_rt}, words {tot_words}. Emotions: {emo_digest}.
-Neutral = calm, happy/surprise = enthusiastic.
-Write 3–4 sentence assessment.""").text.strip()
-            raw = gemini_model.generate_content(
-f"Avg emotions: {json.dumps(emo_avg)}. Give ≤4 bullets on engagement/stress.").text
-            emo_bullets=[l.lstrip("•- ").strip() for l in raw.splitlines() if l.strip()]
+            final_summary = llm.generate(final_summary_prompt(avg_rating, filler_rt, tot_words, digest),
+                                         label="final_summary").strip()
+            raw = llm.generate(emotion_bullets_prompt(emo_avg), label="emotion_bullets")
+            emo_bullets=parse_bullets(raw)
         except: pass
 
     return jsonify(dict(
@@ -769,5 +890,120 @@ def get_assessment():
         "completed_at": interview.get("completed_at", None)
     })
 
+# ---------------------------------------------------
+# 11) /api/interviews => paginated interview history (summary only)
+# ---------------------------------------------------
+HISTORY_PAGE_SIZE = 20
+HISTORY_MAX_PAGE  = 100
+
+def encode_history_cursor(doc):
+    raw = f"{doc['created_at'].isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_history_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    ts, oid = raw.split("|", 1)
+    return datetime.fromisoformat(ts), ObjectId(oid)
+
+@app.route("/api/interviews", methods=["GET"])
+def list_interviews():
+    """
+    Newest-first interview history for the dashboard.
+    ?limit=N (default 20, max 100) and ?cursor=<nextCursor from the previous page>.
+    Served from the (email, created_at, _id) index; answers are never shipped,
+    only their count and average rating are computed server-side.
+    """
+    clerk_email = request.headers.get("Clerk-User-Email")
+    if not clerk_email:
+        return jsonify({"error": "Not authenticated"}), 401
+
+    try:
+        limit = min(max(int(request.args.get("limit", HISTORY_PAGE_SIZE)), 1), HISTORY_MAX_PAGE)
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+
+    match = {"email": clerk_email}
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            ts, oid = decode_history_cursor(cursor)
+        except Exception:
+            return jsonify({"error": "Invalid cursor"}), 400
+        match["$or"] = [
+            {"created_at": {"$lt": ts}},
+            {"created_at": ts, "_id": {"$lt": oid}}
+        ]
+
+    docs = list(interviews_collection.aggregate([
+        {"$match": match},
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        {"$project": {
+            "status": 1,
+            "created_at": 1,
+            "completed_at": 1,
+            "questionCount": {"$size": {"$ifNull": ["$questions", []]}},
+            "answerCount": {"$size": {"$ifNull": ["$answers", []]}},
+            "avgRating": {"$avg": "$answers.assessment.rating"}
+        }}
+    ]))
+
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    items = [dict(
+        interviewId   = str(d["_id"]),
+        status        = d.get("status", "in_progress"),
+        created_at    = d.get("created_at"),
+        completed_at  = d.get("completed_at"),
+        questionCount = d.get("questionCount", 0),
+        answerCount   = d.get("answerCount", 0),
+        avgRating     = round(d["avgRating"], 2) if d.get("avgRating") is not None else None
+    ) for d in docs]
+
+    return jsonify({
+        "interviews": items,
+        "nextCursor": encode_history_cursor(docs[-1]) if has_more else None
+    })
+
+# ---------------------------------------------------
+# Pre-fork serving hooks (used by serve.py)
+# ---------------------------------------------------
+def warm_models():
+    """Run each model once so all weights are resident before workers fork
+    (skipped with MODEL_PRELOAD=0 or INFERENCE_QUEUE=1: loaded on demand instead)."""
+    if model_manager.PRELOAD and not INFERENCE_QUEUE:
+        models.load_all()
+
+_background_started = False
+
+def start_background():
+    """
+    Question-bank refresh, job heartbeat and model reaper threads. Never at
+    import: serve.py's master imports this module and forks, and threads don't
+    survive fork(). Called from on_fork_child, __main__ and the other entry
+    points (asgi_app, worker, perf harness); later calls are no-ops.
+    """
+    global _background_started
+    if _background_started:
+        return
+    _background_started = True
+    question_bank.start()
+    jobs.start()              # owner id + heartbeat thread for this process's jobs
+    models.start()
+
+def on_fork_child():
+    """Per-worker re-init: Mongo clients and background threads don't survive fork()."""
+    global question_bank, _background_started
+    if not MONGO_URI.startswith("mongomock://"):
+        connect_db()          # inherited client is abandoned, never used across processes
+    question_bank = QuestionBank(db)
+    idempotency.collection = db["idempotencyKeys"]
+    jobs.collection = db["jobs"]
+    question_cache.collection = db["techQuestionCache"]
+    work_queue.collection, work_queue.dead_letter = db["workQueue"], db["workQueueDead"]
+    _background_started = False
+    start_background()
+
 if __name__ == "__main__":
+    start_background()
     app.run(debug=True)
@@ -0,0 +1,624 @@
+# asgi_app.py
+# Async (ASGI) implementation of the I/O-bound routes:
+#   /api/logEmotion, /api/finalizeInterview, /api/getAssessment,
+#   /api/extractSkills, /api/getAnalysis
+# They only wait on Mongo (Motor) and Gemini (LLMClient.generate_async), so one
+# event loop can hold thousands of them in flight instead of one WSGI thread each.
+#
+#   uvicorn asgi_app:asgi --port 5000          # instead of the Flask app (default)
+#   ASGI_MOUNT_FLASK=0 uvicorn asgi_app:asgi   # next to it, async routes only
+#
+# With ASGI_MOUNT_FLASK=1 (default) every other path is forwarded to the Flask
+# app through asgiref's WsgiToAsgi, which runs it in a thread pool, so the
+# CPU-bound Whisper/DeepFace endpoints stay in executor threads.
+#
+# It also serves the interview WebSocket, /ws/interview/<interviewId> (section 12).
+import os
+import json
+import time
+import asyncio
+import secrets
+import tempfile
+import traceback
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from quart import Quart, request, jsonify, websocket
+from bson.objectid import ObjectId
+from dotenv import load_dotenv; load_dotenv()
+
+import metrics
+import skill_taxonomy
+from llm_client import make_client, LLMUnavailable
+from frame_sampling import sampler as frame_sampler
+from admission import Overloaded, whisper_gate, deepface_gate
+from analysis_core import (remove_code_fences, raw_key_skills, skills_summary_prompt, skill_analysis_prompt,
+                           final_summary_prompt, emotion_bullets_prompt, parse_bullets, speech_stats,
+                           aggregate_emotions, emotion_digest, soft_skill_answers, version_filter,
+                           upsert_answer_pipeline, newer_answer)
+
+NUM_TECH_Q  = 2
+ANSWER_WRITE_RETRIES = int(os.getenv("ANSWER_WRITE_RETRIES","5"))
+MONGO_URI   = os.getenv("MONGO_URI","mongodb://localhost:27017")
+MOUNT_FLASK = os.getenv("ASGI_MOUNT_FLASK","1") == "1"
+
+ASYNC_PATHS = {"/api/logEmotion", "/api/finalizeInterview", "/api/getAssessment",
+               "/api/extractSkills", "/api/getAnalysis", "/api/interviewSocket"}
+
+# ─────────────────────────── DB & Gemini init ──────────────────────────────
+if MONGO_URI.startswith("mongomock://"):
+    from mongomock_motor import AsyncMongoMockClient; client = AsyncMongoMockClient()
+else:
+    from motor.motor_asyncio import AsyncIOMotorClient; client = AsyncIOMotorClient(MONGO_URI)
+db = client["soft-skill"]
+
+resume_collection     = db["resume"]
+interviews_collection = db["interviews"]
+ws_tickets            = db["wsTickets"]
+
+def _gemini_model():
+    if os.getenv("GEMINI_BASE_URL"):
+        return None                    # REST transport, no SDK model needed
+    import google.generativeai as genai
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    try:
+        return genai.GenerativeModel("gemini-1.5-flash")
+    except Exception as e:
+        print("Gemini load error:", e); return None
+
+llm = make_client(_gemini_model())
+
+aio = Quart(__name__)
+
+@aio.after_request
+async def _cors(resp):
+    resp.headers["Access-Control-Allow-Origin"] = "*"
+    resp.headers["Access-Control-Allow-Headers"] = request.headers.get(
+        "Access-Control-Request-Headers", "Content-Type, Clerk-User-Email")
+    resp.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+    return resp
+
+async def _own_interview(clerk_email, interview_id, projection=None):
+    """-> (interview, obj_id, error_response)"""
+    if not interview_id:
+        return None, None, (jsonify({"error":"Missing interviewId"}),400)
+    try:
+        obj_id = ObjectId(interview_id)
+    except Exception:
+        return None, None, (jsonify({"error":"Invalid interviewId"}),400)
+    interview = await interviews_collection.find_one({"_id": obj_id, "email": clerk_email}, projection)
+    if not interview:
+        return None, obj_id, (jsonify({"error":"Interview not found"}),404)
+    return interview, obj_id, None
+
+# ---------------------------------------------------
+# 3) Log Emotion to Timeline
+# ---------------------------------------------------
+@aio.route("/api/logEmotion", methods=["POST"])
+async def log_emotion():
+    clerk_email = request.headers.get("Clerk-User-Email")
+    if not clerk_email:
+        return jsonify({"error":"Not authenticated"}),401
+
+    data = await request.get_json(silent=True) or {}
+    interview_id = data.get("interviewId")
+    if not interview_id:
+        return jsonify({"error":"Missing interviewId"}),400
+
+    distribution = data.get("emotion_distribution",{})
+    if not isinstance(distribution, dict) or not distribution:
+        return jsonify({"error":"No valid emotion distribution"}),400
+
+    try:
+        obj_id = ObjectId(interview_id)
+    except Exception:
+        return jsonify({"error":"Invalid interviewId"}),400
+
+    # ownership check and write in one round trip
+    res = await interviews_collection.update_one(
+        {"_id": obj_id, "email": clerk_email},
+        {"$push":{"emotionTimeline": {"timestamp": datetime.utcnow(), "distribution": distribution}}}
+    )
+    if not res.matched_count:
+        return jsonify({"error":"Interview not found"}),404
+    return jsonify({"message":"Emotion logged"})
+
+# ---------------------------------------------------
+# 5) Summarize Key Skills
+# ---------------------------------------------------
+@aio.route("/api/extractSkills", methods=["POST"])
+async def extract_skills():
+    clerk_email = request.headers.get("Clerk-User-Email")
+    if not clerk_email:
+        return jsonify({"error": "Not authenticated"}), 401
+
+    last_resume = await resume_collection.find_one({"email": clerk_email}, sort=[("created_at", -1)])
+    if not last_resume:
+        return jsonify({"error": "No resume found"}), 404
+
+    analysis_json = last_resume.get("analysis", "")
+    if not analysis_json:
+        return jsonify({"error": "No analysis found"}), 400
+
+    # precomputed by the resume job
+    if last_resume.get("skills_summary", "").strip():
+        return jsonify({"skills_summary": last_resume["skills_summary"]})
+
+    raw_skills = raw_key_skills(analysis_json)
+    if not raw_skills.strip():
+        return jsonify({"error": "No key_skills found in analysis"}), 400
+
+    summary_text = skill_taxonomy.local_summary(raw_skills)
+    if summary_text:
+        metrics.SKILL_SUMMARIES.inc(source="taxonomy")
+    elif not llm.available:
+        return jsonify({"error": "Gemini model not loaded"}), 500
+    else:
+        metrics.SKILL_SUMMARIES.inc(source="llm")
+        try:
+            summary_text = await llm.generate_async(skills_summary_prompt(raw_skills), label="skills_summary")
+            summary_text = remove_code_fences(summary_text or "- No Skills")
+        except LLMUnavailable as e:
+            summary_text = f"Error summarizing skills: {e}"
+
+    await resume_collection.update_one(
+        {"_id": last_resume["_id"]},
+        {"$set": {"skills_summary": summary_text}}
+    )
+    return jsonify({"skills_summary": summary_text})
+
+# ---------------------------------------------------
+# 8) finalizeInterview => mark as completed
+# ---------------------------------------------------
+@aio.route("/api/finalizeInterview", methods=["POST"])
+async def finalize_interview():
+    clerk_email = request.headers.get("Clerk-User-Email")
+    if not clerk_email:
+        return jsonify({"error": "Not authenticated"}),401
+
+    data = await request.get_json(silent=True) or {}
+    interview_id = data.get("interviewId")
+    if not interview_id:
+        return jsonify({"error":"Missing interviewId"}),400
+    try:
+        obj_id = ObjectId(interview_id)
+    except Exception:
+        return jsonify({"error":"Invalid interviewId"}),400
+
+    res = await interviews_collection.update_one(
+        {"_id": obj_id, "email": clerk_email},
+        {"$set": {"status": "completed", "completed_at": datetime.utcnow()}}
+    )
+    if not res.matched_count:
+        return jsonify({"error":"Interview not found"}),404
+    return jsonify({"message":"Interview finalized"})
+
+# ---------------------------------------------------
+# 9) /api/getAnalysis — LLM sections run concurrently
+# ---------------------------------------------------
+async def _skill_analysis(skill, ans):
+    if not ans:
+        return skill, "No answer provided."
+    rat = ans.get("assessment",{}).get("rating",3)
+    try:
+        txt = await llm.generate_async(skill_analysis_prompt(skill, ans.get("transcript",""), rat),
+                                       label="skill_analysis")
+        return skill, remove_code_fences(txt)
+    except Exception as e:
+        return skill, f"Error: {e}"
+
+async def _summary_and_bullets(avg_rating, filler_rt, tot_words, emo_avg, emo_std):
+    # independent calls: one failing must not throw away the other's result
+    final_summary, raw = await asyncio.gather(
+        llm.generate_async(final_summary_prompt(avg_rating, filler_rt, tot_words,
+                                                emotion_digest(emo_avg, emo_std)), label="final_summary"),
+        llm.generate_async(emotion_bullets_prompt(emo_avg), label="emotion_bullets"),
+        return_exceptions=True)
+    final_summary = "Gemini not loaded" if isinstance(final_summary, BaseException) else final_summary.strip()
+    try:
+        emo_bullets = [] if isinstance(raw, BaseException) else parse_bullets(raw)
+    except Exception:
+        emo_bullets = []
+    return final_summary, emo_bullets
+
+@aio.route("/api/getAnalysis", methods=["POST"])
+async def get_analysis():
+    clerk_email = request.headers.get("Clerk-User-Email")
+    if not clerk_email: return jsonify({"error":"Not authenticated"}),401
+
+    data = await request.get_json(silent=True) or {}
+    interview, _, err = await _own_interview(clerk_email, data.get("interviewId"))
+    if err: return err
+
+    answers       = interview.get("answers",[])
+    emo_timeline  = interview.get("emotionTimeline",[])
+    tech_cnt      = interview.get("technicalCount", NUM_TECH_Q)
+
+    tot_words, filler_rt, avg_rating = speech_stats(answers)
+    emo_avg, emo_std = aggregate_emotions(emo_timeline)
+    skill_answers = soft_skill_answers(interview, tech_cnt)
+
+    if llm.available:
+        skills, (final_summary, emo_bullets) = await asyncio.gather(
+            asyncio.gather(*(_skill_analysis(s, a) for s, a in skill_answers)),
+            _summary_and_bullets(avg_rating, filler_rt, tot_words, emo_avg, emo_std))
+        skillAnalysis = dict(skills)
+    else:
+        skillAnalysis = {s:"Gemini not loaded." for s,_ in skill_answers}
+        final_summary, emo_bullets = "Gemini not loaded", []
+
+    return jsonify(dict(
+        status          = interview.get("status"),
+        completed_at    = interview.get("completed_at"),
+        emotionTimeline = emo_timeline,
+        emotionAverages = emo_avg,
+        emotionStd      = emo_std,
+        emotionAnalysis = emo_bullets,
+        avgRating       = avg_rating,
+        fillerRate      = filler_rt,
+        totalWordsSpoken= tot_words,
+        final_summary   = final_summary,
+        skillAnalysis   = skillAnalysis
+    ))
+
+# ---------------------------------------------------
+# 10) getAssessment => Q & A details for AnswerAssessment page
+# ---------------------------------------------------
+@aio.route("/api/getAssessment", methods=["POST"])
+async def get_assessment():
+    clerk_email = request.headers.get("Clerk-User-Email")
+    if not clerk_email:
+        return jsonify({"error": "Not authenticated"}), 401
+
+    data = await request.get_json(silent=True) or {}
+    interview, _, err = await _own_interview(
+        clerk_email, data.get("interviewId"),
+        {"questions": 1, "answers": 1, "status": 1, "completed_at": 1})
+    if err: return err
+
+    return jsonify({
+        "questions": interview.get("questions", []),
+        "answers": interview.get("answers", []),
+        "status": interview.get("status", "in_progress"),
+        "completed_at": interview.get("completed_at", None)
+    })
+
+# ---------------------------------------------------
+# 12) /ws/interview/<interviewId> — one socket per interview
+# ---------------------------------------------------
+# Replaces the per-frame POST /analyzeFrame + POST /api/logEmotion pair and
+# the audio upload with a single connection.
+#
+# Authenticated like the HTTP routes: a Clerk-User-Email header on the
+# handshake, or, since browsers cannot set headers on a WebSocket, a ticket.
+# POST /api/interviewSocket {"interviewId"} with the header returns
+# {"ticket","url"}; the ticket is good for one connection to that interview
+# within WS_TICKET_SEC, then connect to url (…?ticket=…).
+#
+# Upstream binary messages, first byte = kind:
+#   0x01 + JPEG bytes    video frame -> {"type":"emotion","dominant_emotion","emotion_distribution",
+#                                           "nextIntervalMs"}  (see frame_sampling.py)
+#   0x02 + audio bytes   next chunk of the answer being recorded
+# Upstream text messages (JSON):
+#   {"type":"answer_start","questionIndex":n,"format":"webm"}
+#   {"type":"answer_end"}  -> {"type":"answer","questionIndex","transcript","metrics","assessment"}
+#                             and, when that assessment is provisional (Gemini missed ANSWER_SLO_SEC),
+#                             later {"type":"assessment","questionIndex","assessment"} with Gemini's
+#   {"type":"ping"}        -> {"type":"pong"}
+# Errors come back as {"type":"error","error":...}; work refused by admission
+# control (admission.py) as {"type":"throttled","error","retryAfter"}.
+#
+# Emotion snapshots go to emotionTimeline from the server, batched. A frame
+# that arrives while the previous one is still in DeepFace replaces any frame
+# already waiting (latest wins), so a slow model never builds a backlog.
+WS_FRAME, WS_AUDIO = 0x01, 0x02
+WS_FLUSH_EVERY     = int(os.getenv("WS_TIMELINE_FLUSH_EVERY","5"))
+WS_FLUSH_SEC       = float(os.getenv("WS_TIMELINE_FLUSH_SEC","10"))
+WS_MAX_AUDIO_BYTES = int(os.getenv("WS_MAX_AUDIO_MB", os.getenv("MAX_UPLOAD_MB","25"))) * 1024 * 1024
+WS_TICKET_SEC      = int(os.getenv("WS_TICKET_SEC","30"))
+
+# Answers and frames get separate executors, so an answer never queues behind
+# frames. Frames are also refused (throttled) while every frame thread is
+# busy, instead of piling up in the executor's queue.
+WS_FRAME_THREADS  = int(os.getenv("WS_FRAME_THREADS","2"))
+frame_pool  = ThreadPoolExecutor(WS_FRAME_THREADS, thread_name_prefix="ws-frame")
+answer_pool = ThreadPoolExecutor(int(os.getenv("WS_ANSWER_THREADS","2")), thread_name_prefix="ws-answer")
+frames_in_flight = 0                  # touched only on the event loop
+
+def _backend():
+    # the models live in app.py; imported lazily so ASGI_MOUNT_FLASK=0 only
+    # pays for them once a socket actually connects
+    import app as flask_backend
+    flask_backend.start_background()
+    return flask_backend
+
+def _frame_emotion(raw):
+    backend = _backend()
+    with deepface_gate.slot():
+        img = backend.decode_jpeg(raw)
+        if img is None:
+            return None
+        dominant, distribution, _ = backend.detect_emotion(img)
+    return dominant, distribution
+
+def _answer(interview, q_idx, path):
+    backend = _backend()
+    with whisper_gate.slot():
+        lang, transcript, metrics = backend.transcribe_audio(path)
+    ans_doc = backend.answer_doc(q_idx, lang, transcript, metrics)
+    ans_doc["assessment"], late = backend.assess_answer(interview, q_idx, transcript, metrics)
+    return ans_doc, metrics, late
+
+async def _store_answer(interview, ans_doc):
+    """Async twin of app.store_answer."""
+    version = interview.get("version", 0)
+    for _ in range(ANSWER_WRITE_RETRIES):
+        res = await interviews_collection.update_one({"_id": interview["_id"], **version_filter(version)},
+                                                     upsert_answer_pipeline(ans_doc))
+        if res.matched_count:
+            interview["version"] = version + 1
+            return ans_doc
+        current = await interviews_collection.find_one({"_id": interview["_id"]}, {"answers": 1, "version": 1})
+        if current is None:
+            raise RuntimeError("Interview disappeared")
+        newer = newer_answer(current, ans_doc)
+        if newer:
+            return newer
+        version = current.get("version", 0)
+    raise RuntimeError("Answer write kept conflicting, try again")
+
+
+class InterviewChannel:
+    def __init__(self, interview):
+        self.interview   = interview
+        self.obj_id      = interview["_id"]
+        self.timeline    = []
+        self.flushed_at  = time.monotonic()
+        self.frame_task  = None
+        self.next_frame  = None
+        self.flushing    = None           # timeline write in progress
+        self.audio       = None           # open temp file while an answer is recorded
+        self.audio_bytes = 0
+        self.q_idx       = None
+        self.tasks       = set()
+
+    async def send(self, **msg):
+        await websocket.send(json.dumps(msg, default=str))
+
+    def spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    # -- frames ---------------------------------------------------------------
+    def on_frame(self, raw):
+        if self.frame_task and not self.frame_task.done():
+            self.next_frame = raw
+        else:
+            self.frame_task = self.spawn(self.run_frames(raw))
+
+    async def run_frames(self, raw):
+        global frames_in_flight
+        loop = asyncio.get_running_loop()
+        while raw is not None:
+            if frames_in_flight >= WS_FRAME_THREADS:
+                await self.send(type="throttled", error="Frame analysis busy", retryAfter=1)
+                raw, self.next_frame = self.next_frame, None
+                continue
+            frames_in_flight += 1
+            try:
+                result = await loop.run_in_executor(frame_pool, _frame_emotion, raw)
+            except Overloaded as e:
+                await self.send(type="throttled", error=e.reason, retryAfter=e.retry_after)
+                raw, self.next_frame = self.next_frame, None
+                continue
+            except Exception as e:
+                traceback.print_exc()
+                await self.send(type="error", error=f"Frame error: {e}")
+                result = None
+            finally:
+                frames_in_flight -= 1
+            if result is None:
+                await self.send(type="error", error="Could not decode image")
+            else:
+                dominant, distribution = result
+                await self.send(type="emotion", dominant_emotion=dominant, emotion_distribution=distribution,
+                                nextIntervalMs=frame_sampler.recommend(str(self.obj_id), distribution))
+                if distribution:
+                    self.timeline.append({"timestamp": datetime.utcnow(), "distribution": distribution})
+                    if (len(self.timeline) >= WS_FLUSH_EVERY
+                            or time.monotonic() - self.flushed_at >= WS_FLUSH_SEC):
+                        await self.flush()
+            raw, self.next_frame = self.next_frame, None
+
+    async def flush(self):
+        batch, self.timeline = self.timeline, []
+        self.flushed_at = time.monotonic()
+        if batch:
+            # shielded: cancelling the frame task on close must not lose a batch already off the timeline
+            self.flushing = asyncio.ensure_future(interviews_collection.update_one(
+                {"_id": self.obj_id}, {"$push": {"emotionTimeline": {"$each": batch}}}))
+            await asyncio.shield(self.flushing)
+
+    # -- audio ----------------------------------------------------------------
+    async def on_control(self, msg):
+        kind = msg.get("type")
+        if kind == "ping":
+            await self.send(type="pong")
+        elif kind == "answer_start":
+            self.discard_audio()
+            try:
+                self.q_idx = int(msg.get("questionIndex", 0))
+            except (TypeError, ValueError):
+                return await self.send(type="error", error="Invalid questionIndex")
+            suffix = "." + "".join(c for c in str(msg.get("format","wav")) if c.isalnum())[:8]
+            self.audio = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+            self.audio_bytes = 0
+        elif kind == "answer_end":
+            if self.audio is None:
+                return await self.send(type="error", error="No answer in progress")
+            self.audio.close()
+            path, q_idx, self.audio = self.audio.name, self.q_idx, None
+            self.spawn(self.finish_answer(q_idx, path))
+        else:
+            await self.send(type="error", error=f"Unknown message type: {kind}")
+
+    async def on_audio(self, chunk):
+        if self.audio is None:
+            return await self.send(type="error", error="Audio before answer_start")
+        self.audio_bytes += len(chunk)
+        if self.audio_bytes > WS_MAX_AUDIO_BYTES:
+            self.discard_audio()
+            return await self.send(type="error", error="Answer audio too large")
+        self.audio.write(chunk)
+
+    async def finish_answer(self, q_idx, path):
+        loop = asyncio.get_running_loop()
+        try:
+            ans_doc, metrics, late = await loop.run_in_executor(answer_pool, _answer, self.interview, q_idx, path)
+            stored = await _store_answer(self.interview, ans_doc)
+            await self.send(type="answer", questionIndex=q_idx, transcript=stored["transcript"],
+                            metrics=metrics, assessment=stored["assessment"])
+            if late and stored is ans_doc:
+                self.spawn(self.finish_assessment(ans_doc, late))
+        except Overloaded as e:
+            await self.send(type="throttled", error=e.reason, retryAfter=e.retry_after, questionIndex=q_idx)
+        except Exception as e:
+            traceback.print_exc()
+            await self.send(type="error", error=str(e), questionIndex=q_idx)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def finish_assessment(self, ans_doc, late):
+        """Swap the provisional assessment for Gemini's once it lands (cf. app.replace_assessment)."""
+        assessment = await asyncio.wrap_future(late)
+        this_answer = {"_id": self.obj_id, "answers": {"$elemMatch": {"questionIndex": ans_doc["questionIndex"],
+                                                                      "timestamp": ans_doc["timestamp"]}}}
+        if not assessment:
+            # the local rating is final: clear its provisional flag, stored and on the client
+            metrics.ANSWER_ASSESSMENTS.inc(path="late_failed")
+            res = await interviews_collection.update_one(this_answer,
+                                                         {"$unset": {"answers.$.assessment.provisional": ""}})
+            if res.modified_count:
+                final = {k: v for k, v in ans_doc["assessment"].items() if k != "provisional"}
+                await self.send(type="assessment", questionIndex=ans_doc["questionIndex"], assessment=final)
+            return
+        res = await interviews_collection.update_one(this_answer, {"$set": {"answers.$.assessment": assessment}})
+        metrics.ANSWER_ASSESSMENTS.inc(path="replaced" if res.modified_count else "superseded")
+        if res.modified_count:
+            await self.send(type="assessment", questionIndex=ans_doc["questionIndex"], assessment=assessment)
+
+    def discard_audio(self):
+        if self.audio is not None:
+            self.audio.close()
+            os.remove(self.audio.name)
+            self.audio = None
+
+    async def close(self):
+        frame_sampler.forget(str(self.obj_id))
+        self.discard_audio()
+        pending = [t for t in self.tasks if t is not self.frame_task]
+        if self.frame_task:
+            self.frame_task.cancel()
+        if self.flushing:
+            await asyncio.gather(self.flushing, return_exceptions=True)   # a batch mid-write lands first
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)   # answers still get stored
+        await self.flush()
+
+
+@aio.before_serving
+async def _ticket_index():
+    await ws_tickets.create_index("expires_at", expireAfterSeconds=0)
+
+@aio.route("/api/interviewSocket", methods=["POST"])
+async def interview_socket_ticket():
+    clerk_email = request.headers.get("Clerk-User-Email")
+    if not clerk_email:
+        return jsonify({"error": "Not authenticated"}), 401
+    data = await request.get_json(silent=True) or {}
+    interview, obj_id, err = await _own_interview(clerk_email, data.get("interviewId"), {"_id": 1})
+    if err:
+        return err
+    ticket = secrets.token_urlsafe(24)
+    await ws_tickets.insert_one({"_id": ticket, "email": clerk_email, "interviewId": obj_id,
+                                 "expires_at": datetime.utcnow() + timedelta(seconds=WS_TICKET_SEC)})
+    return jsonify({"ticket": ticket, "url": f"/ws/interview/{obj_id}?ticket={ticket}",
+                    "expiresInSec": WS_TICKET_SEC})
+
+async def _socket_user(obj_id):
+    """Clerk-User-Email on the handshake, else the email a valid ticket was issued to (used up here)."""
+    clerk_email = websocket.headers.get("Clerk-User-Email")
+    if clerk_email:
+        return clerk_email
+    ticket = websocket.args.get("ticket")
+    if not ticket:
+        return None
+    doc = await ws_tickets.find_one_and_delete({"_id": ticket, "interviewId": obj_id,
+                                                "expires_at": {"$gt": datetime.utcnow()}})
+    return doc and doc["email"]
+
+@aio.websocket("/ws/interview/<interview_id>")
+async def interview_channel(interview_id):
+    await websocket.accept()
+    try:
+        obj_id = ObjectId(interview_id)
+    except Exception:
+        await websocket.send(json.dumps({"type":"error","error":"Invalid interviewId"}))
+        return await websocket.close(4400)
+    clerk_email = await _socket_user(obj_id)
+    if not clerk_email:
+        await websocket.send(json.dumps({"type":"error","error":"Not authenticated"}))
+        return await websocket.close(4401)
+    interview = await interviews_collection.find_one(
+        {"_id": obj_id, "email": clerk_email}, {"questions": 1, "technicalCount": 1, "version": 1})
+    if not interview:
+        await websocket.send(json.dumps({"type":"error","error":"Interview not found"}))
+        return await websocket.close(4404)
+
+    channel = InterviewChannel(interview)
+    await channel.send(type="ready", interviewId=interview_id)
+    try:
+        while True:
+            msg = await websocket.receive()
+            if isinstance(msg, (bytes, bytearray)):
+                if not msg:
+                    continue
+                if msg[0] == WS_FRAME:
+                    channel.on_frame(bytes(msg[1:]))
+                elif msg[0] == WS_AUDIO:
+                    await channel.on_audio(msg[1:])
+                else:
+                    await channel.send(type="error", error=f"Unknown binary kind: {msg[0]}")
+            else:
+                try:
+                    ctl = json.loads(msg)
+                except ValueError:
+                    await channel.send(type="error", error="Invalid JSON")
+                    continue
+                await channel.on_control(ctl if isinstance(ctl, dict) else {})
+    finally:
+        await asyncio.shield(channel.close())
+
+# ---------------------------------------------------
+# ASGI entry point
+# ---------------------------------------------------
+if MOUNT_FLASK:
+    from asgiref.wsgi import WsgiToAsgi
+    import app as flask_backend
+    _flask = WsgiToAsgi(flask_backend.app)
+
+    @aio.before_serving
+    async def _flask_background():
+        flask_backend.start_background()     # app.py starts no threads at import
+else:
+    _flask = None
+
+async def asgi(scope, receive, send):
+    if (_flask is None or scope["type"] in ("lifespan", "websocket")
+            or scope.get("path") in ASYNC_PATHS):
+        await aio(scope, receive, send)
+    else:
+        await _flask(scope, receive, send)
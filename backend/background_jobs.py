@@ -0,0 +1,129 @@
+# background_jobs.py
+# Background jobs with their status in Mongo (collection `jobs`).
+#
+#   tracker = JobTracker(db["jobs"]).ensure_indexes()
+#   job_id  = tracker.submit(email, "resume", pipeline, arg1, arg2)    # returns at once
+#   tracker.get(job_id, email)                                        # status doc for the poller
+#
+# `pipeline(job, *args)` runs on a worker thread; it reports progress with
+# job.progress(stage, fraction), returns a JSON-able result on success and
+# raises JobFailed(message) for an expected failure (bad upload, LLM down ...).
+# Status: queued -> running -> done | failed. Job docs expire via a TTL index.
+#
+# Jobs run in this process's thread pool, so a restart or crash strands them.
+# The process that owns a queued/running job stamps heartbeat_at every
+# JOB_HEARTBEAT_SEC. get() fails a job whose heartbeat is older than
+# JOB_STALE_SEC, so the poller gets an answer instead of waiting for the TTL.
+import os
+import time
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from bson.objectid import ObjectId
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS","2"))
+JOB_TTL_SEC = int(os.getenv("JOB_TTL_SEC", str(7 * 24 * 3600)))
+JOB_HEARTBEAT_SEC = float(os.getenv("JOB_HEARTBEAT_SEC","10"))
+JOB_STALE_SEC     = float(os.getenv("JOB_STALE_SEC","60"))
+ACTIVE = ["queued", "running"]
+
+
+class JobFailed(Exception):
+    pass
+
+
+class JobHandle:
+    def __init__(self, tracker, job_id):
+        self.tracker, self.id = tracker, job_id
+
+    def progress(self, stage, fraction):
+        self.tracker.collection.update_one(
+            {"_id": self.id}, {"$set": {"stage": stage, "progress": round(fraction, 2)}})
+
+
+class JobTracker:
+    def __init__(self, collection, workers=JOB_WORKERS):
+        self.collection = collection
+        self.executor   = ThreadPoolExecutor(workers, thread_name_prefix="job")
+        self.owner      = None
+        self._thread    = None
+
+    def ensure_indexes(self):
+        self.collection.create_index([("email",1),("created_at",-1)])
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+        return self
+
+    def _beat(self):
+        while True:
+            time.sleep(JOB_HEARTBEAT_SEC)
+            try:
+                self.collection.update_many({"owner": self.owner, "status": {"$in": ACTIVE}},
+                                            {"$set": {"heartbeat_at": datetime.utcnow()}})
+            except Exception as e:
+                print("Job heartbeat failed:", e)
+
+    def start(self):
+        """(Re)start the heartbeat; call again in a forked child, which owns its own jobs."""
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._beat, daemon=True, name="job-heartbeat")
+            self._thread.start()
+        return self
+
+    def submit(self, email, kind, fn, *args):
+        now = datetime.utcnow()
+        job_id = self.collection.insert_one(dict(
+            email=email, kind=kind, status="queued", stage="queued", progress=0.0,
+            owner=self.owner, heartbeat_at=now,
+            created_at=now, expires_at=now + timedelta(seconds=JOB_TTL_SEC))).inserted_id
+        self.executor.submit(self._run, job_id, fn, args)
+        return str(job_id)
+
+    def _run(self, job_id, fn, args):
+        self.collection.update_one({"_id": job_id},
+                                   {"$set": {"status": "running", "started_at": datetime.utcnow()}})
+        try:
+            result = fn(JobHandle(self, job_id), *args)
+            update = {"status": "done", "stage": "done", "progress": 1.0, "result": result}
+        except JobFailed as e:
+            update = {"status": "failed", "error": str(e)}
+        except Exception as e:
+            traceback.print_exc()
+            update = {"status": "failed", "error": f"Internal error: {e}"}
+        update["finished_at"] = datetime.utcnow()
+        self.collection.update_one({"_id": job_id}, {"$set": update})
+
+    def get(self, job_id, email):
+        try:
+            obj_id = ObjectId(job_id)
+        except Exception:
+            return None
+        job = self.collection.find_one({"_id": obj_id, "email": email})
+        if job and job.get("status") in ACTIVE and self._stale(job):
+            self.collection.update_one(        # only if no heartbeat landed since we read it
+                {"_id": obj_id, "status": job["status"], "heartbeat_at": job.get("heartbeat_at")},
+                {"$set": {"status": "failed", "finished_at": datetime.utcnow(),
+                          "error": "The job was interrupted by a server restart, please try again"}})
+            job = self.collection.find_one({"_id": obj_id, "email": email})
+        return job
+
+    @staticmethod
+    def _stale(job):
+        beat = job.get("heartbeat_at") or job.get("created_at")
+        return beat is not None and (datetime.utcnow() - beat).total_seconds() > JOB_STALE_SEC
+
+
+def job_view(job):
+    """Status doc -> JSON for the client."""
+    return dict(
+        jobId    = str(job["_id"]),
+        kind     = job.get("kind"),
+        status   = job.get("status"),
+        stage    = job.get("stage"),
+        progress = job.get("progress", 0.0),
+        error    = job.get("error"),
+        result   = job.get("result"),
+    )
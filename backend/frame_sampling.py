@@ -0,0 +1,85 @@
+# frame_sampling.py
+# Server-recommended capture interval for the emotion frames.
+#
+# Every analysed frame gets a `nextIntervalMs` back:
+#   * expression shifting  -> sample fast (FRAME_MIN_INTERVAL_MS)
+#   * expression stable    -> back off towards FRAME_MAX_INTERVAL_MS
+#   * DeepFace busy        -> stretch further, up to FRAME_SATURATED_INTERVAL_MS
+#
+# Change is the total-variation distance between consecutive emotion
+# distributions (0 = identical, 100 = disjoint, in percentage points),
+# smoothed per session with an EMA. Load is the DeepFace gate's backlog
+# (admission.py: calls running + waiting) relative to its capacity (slots +
+# queue): the interval grows by (1 + load) and jumps to
+# FRAME_SATURATED_INTERVAL_MS once the gate is full. With ADMISSION=0 there
+# is no gate, and load is the DeepFace calls in flight (metrics.INFERENCE_QUEUE)
+# relative to FRAME_SATURATION_DEPTH.
+import os
+import threading
+from collections import OrderedDict
+
+import admission
+import metrics
+
+MIN_INTERVAL_MS       = int(os.getenv("FRAME_MIN_INTERVAL_MS","750"))
+MAX_INTERVAL_MS       = int(os.getenv("FRAME_MAX_INTERVAL_MS","5000"))
+SATURATED_INTERVAL_MS = int(os.getenv("FRAME_SATURATED_INTERVAL_MS","10000"))
+DEFAULT_INTERVAL_MS   = int(os.getenv("FRAME_DEFAULT_INTERVAL_MS","2000"))
+CHANGE_HIGH           = float(os.getenv("FRAME_CHANGE_HIGH","20"))      # TV distance treated as "shifting"
+CHANGE_ALPHA          = float(os.getenv("FRAME_CHANGE_ALPHA","0.5"))    # EMA weight of the newest frame
+SATURATION_DEPTH      = int(os.getenv("FRAME_SATURATION_DEPTH", os.getenv("WEB_THREADS","4")))
+MAX_SESSIONS          = int(os.getenv("FRAME_MAX_SESSIONS","10000"))
+
+
+def distribution_change(prev, cur):
+    """Total-variation distance between two emotion distributions (percent)."""
+    keys = set(prev) | set(cur)
+    return 0.5 * sum(abs(float(prev.get(k,0)) - float(cur.get(k,0))) for k in keys)
+
+
+def deepface_load(gate=None):
+    """0 = idle .. 1 = every slot busy and the queue full."""
+    gate = gate or admission.deepface_gate
+    if not admission.ENABLED:
+        return metrics.INFERENCE_QUEUE.get(model="deepface") / max(1, SATURATION_DEPTH)
+    return (gate.active + gate.waiting) / max(1, gate.slots + gate.max_queue)
+
+
+class FrameSampler:
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self._sessions = OrderedDict()      # key -> (last distribution, smoothed change)
+        self._max = max_sessions
+        self._lock = threading.Lock()
+
+    def _observe(self, key, distribution):
+        with self._lock:
+            prev = self._sessions.pop(key, None)
+            if prev is None:
+                change = CHANGE_HIGH              # nothing to compare yet: stay attentive
+            else:
+                last, ema = prev
+                change = CHANGE_ALPHA * distribution_change(last, distribution) + (1 - CHANGE_ALPHA) * ema
+            self._sessions[key] = (distribution, change)
+            while len(self._sessions) > self._max:
+                self._sessions.popitem(last=False)
+        return change
+
+    def forget(self, key):
+        with self._lock:
+            self._sessions.pop(key, None)
+
+    def recommend(self, key, distribution):
+        """Record this frame for `key` and return the next capture interval in ms."""
+        if not distribution:
+            interval = DEFAULT_INTERVAL_MS
+        else:
+            stability = 1 - min(1.0, self._observe(key, distribution) / CHANGE_HIGH)
+            interval  = MIN_INTERVAL_MS + stability * (MAX_INTERVAL_MS - MIN_INTERVAL_MS)
+
+        load = deepface_load()
+        if load >= 1:
+            return SATURATED_INTERVAL_MS
+        return int(min(SATURATED_INTERVAL_MS, interval * (1 + load)))
+
+
+sampler = FrameSampler()
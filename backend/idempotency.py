@@ -0,0 +1,167 @@
+# idempotency.py
+# `Idempotency-Key` support for the expensive POST endpoints.
+#
+# A request carrying the header claims a record in the idempotencyKeys
+# collection (_id = endpoint:email:key) before doing any work:
+#   * no record          -> run the handler, store its JSON response under the key
+#   * completed record   -> replay the stored response (header Idempotent-Replayed: true)
+#   * in-progress record -> wait for the owner to finish (in-process: an Event,
+#                           another worker: polling) and replay; past the owner's
+#                           lease the record is taken over and the work re-run
+#   * same key, different request body -> 422
+# Records expire through a TTL index on `expires_at` (IDEMPOTENCY_TTL_SEC).
+# 5xx and 429 responses are not stored, so a retry runs the handler again.
+import os
+import time
+import uuid
+import hashlib
+import threading
+from functools import wraps
+from datetime import datetime, timedelta
+
+from flask import request, jsonify, current_app
+from pymongo.errors import DuplicateKeyError
+
+ENABLED   = os.getenv("IDEMPOTENCY","1") == "1"
+TTL_SEC   = int(os.getenv("IDEMPOTENCY_TTL_SEC", str(24 * 3600)))
+LEASE_SEC = float(os.getenv("IDEMPOTENCY_LEASE_SEC","300"))    # longest a handler may hold a key
+WAIT_SEC  = float(os.getenv("IDEMPOTENCY_WAIT_SEC","120"))     # how long a retry waits for the owner
+POLL_SEC  = float(os.getenv("IDEMPOTENCY_POLL_SEC","0.25"))
+MAX_KEY   = 255
+
+
+def request_fingerprint():
+    """sha256 over form fields, JSON body and uploaded file contents."""
+    h = hashlib.sha256()
+    for k in sorted(request.form):
+        h.update(f"{k}={request.form.get(k)}\0".encode())
+    if request.is_json:
+        h.update(request.get_data())
+    for name in sorted(request.files):
+        f = request.files[name]
+        h.update(f"{name}:{f.filename}\0".encode())
+        for chunk in iter(lambda: f.stream.read(1 << 16), b""):
+            h.update(chunk)
+        f.stream.seek(0)
+    return h.hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, collection):
+        self.collection = collection
+        self._local = {}                  # key id -> Event, for owners in this process
+        self._lock  = threading.Lock()
+
+    def ensure_indexes(self):
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+        return self
+
+    # -- records --------------------------------------------------------------
+    def begin(self, key_id, fingerprint):
+        """-> (state, record, owner): state is "new" (caller owns the key), "done", "busy" or "mismatch"."""
+        now, owner = datetime.utcnow(), uuid.uuid4().hex
+        try:
+            self.collection.insert_one(dict(
+                _id=key_id, state="in_progress", owner=owner, fingerprint=fingerprint,
+                created_at=now, lease_until=now + timedelta(seconds=LEASE_SEC),
+                expires_at=now + timedelta(seconds=TTL_SEC)))
+        except DuplicateKeyError:
+            rec = self.collection.find_one({"_id": key_id})
+            if rec is None:                          # expired between insert and read
+                return self.begin(key_id, fingerprint)
+            if rec.get("fingerprint") != fingerprint:
+                return "mismatch", rec, None
+            if rec["state"] == "completed":
+                return "done", rec, None
+            if not self._take_over(key_id, owner):
+                return "busy", rec, None
+        with self._lock:
+            self._local[key_id] = threading.Event()
+        return "new", None, owner
+
+    def _take_over(self, key_id, owner):
+        """Claim an in-progress record whose owner let its lease run out."""
+        now = datetime.utcnow()
+        return self.collection.find_one_and_update(
+            {"_id": key_id, "state": "in_progress", "lease_until": {"$lt": now}},
+            {"$set": {"owner": owner, "lease_until": now + timedelta(seconds=LEASE_SEC)}})
+
+    def complete(self, key_id, owner, status, body):
+        self.collection.update_one(
+            {"_id": key_id, "owner": owner},
+            {"$set": {"state": "completed", "status": status, "body": body,
+                      "completed_at": datetime.utcnow(),
+                      "expires_at": datetime.utcnow() + timedelta(seconds=TTL_SEC)}})
+        self._release(key_id)
+
+    def abandon(self, key_id, owner):
+        self.collection.delete_one({"_id": key_id, "owner": owner})
+        self._release(key_id)
+
+    def _release(self, key_id):
+        with self._lock:
+            ev = self._local.pop(key_id, None)
+        if ev:
+            ev.set()
+
+    def wait(self, key_id, timeout=WAIT_SEC):
+        """Block until the record is completed/gone or `timeout` passes; -> latest record (or None)."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            ev = self._local.get(key_id)
+        if ev is not None and not ev.wait(timeout):
+            return self.collection.find_one({"_id": key_id})
+        while True:
+            rec = self.collection.find_one({"_id": key_id})
+            if rec is None or rec["state"] == "completed" or time.monotonic() >= deadline:
+                return rec
+            if rec["lease_until"] < datetime.utcnow():
+                return rec                            # owner died; caller may take over
+            time.sleep(POLL_SEC)
+
+    # -- Flask ----------------------------------------------------------------
+    def idempotent(self, fn):
+        """View decorator: honour the Idempotency-Key header (needs Clerk-User-Email)."""
+        endpoint = fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get("Idempotency-Key")
+            email = request.headers.get("Clerk-User-Email")
+            if not ENABLED or not key or not email:
+                return fn(*args, **kwargs)
+            if len(key) > MAX_KEY:
+                return jsonify({"error": "Idempotency-Key too long"}),400
+
+            key_id, fp = f"{endpoint}:{email}:{key}", request_fingerprint()
+            for _ in range(3):
+                state, rec, owner = self.begin(key_id, fp)
+                if state == "busy":
+                    rec = self.wait(key_id)
+                    if rec is not None and rec["state"] == "in_progress" \
+                            and rec["lease_until"] >= datetime.utcnow():
+                        return jsonify({"error": "Request with this Idempotency-Key is still in progress"}), \
+                            409, {"Retry-After": "1"}
+                    continue                         # completed, vanished or lease expired: look again
+                break
+            else:
+                return jsonify({"error": "Could not claim Idempotency-Key"}),409
+
+            if state == "mismatch":
+                return jsonify({"error": "Idempotency-Key reused with a different request"}),422
+            if state == "done":
+                return jsonify(rec["body"]), rec["status"], {"Idempotent-Replayed": "true"}
+
+            try:
+                resp = current_app.make_response(fn(*args, **kwargs))
+            except Exception:
+                self.abandon(key_id, owner)
+                raise
+            body = resp.get_json(silent=True) if resp.is_json else None
+            if body is not None and resp.status_code < 500 and resp.status_code != 429:
+                self.complete(key_id, owner, resp.status_code, body)
+            else:
+                self.abandon(key_id, owner)
+            return resp
+
+        return wrapper
@@ -0,0 +1,147 @@
+# job_queue.py
+# Durable work queue in Mongo (collection `workQueue`, dead letters in
+# `workQueueDead`). It lets inference run in worker processes (worker.py) on
+# any number of nodes, apart from the web tier that accepted the request.
+#
+#   queue  = JobQueue(db["workQueue"], db["workQueueDead"]).ensure_indexes()
+#   job_id = queue.enqueue("transcription", "transcribe", {"audio": Binary(...)})
+#   result = queue.wait(job_id, timeout=120)           # web side: block for the result
+#
+#   job = queue.lease(["transcription"], worker_id)    # worker side
+#   queue.complete(job, result)  /  queue.fail(job, "why")
+#
+# Leasing is one atomic find_one_and_update. It takes the oldest job that is
+# either queued or whose lease has expired, and stamps it with a fresh
+# lease_token and lease_expires = now + visibility. A worker that dies
+# mid-job simply lets its lease run out, and another worker picks the job up
+# again. A live worker extends its lease with heartbeat(). complete() and fail()
+# only match the caller's lease_token, so a worker that lost its lease cannot
+# overwrite the new holder's outcome.
+#
+# attempts counts leases. A failure re-queues the job with exponential backoff
+# until max_attempts. After that, or when a lease has expired on every attempt,
+# the job is dead-lettered: status "dead" on the job, plus a copy in the
+# dead-letter collection. Waiters get QueueJobFailed.
+#
+# Status: queued -> leased -> done | queued (retry) | dead; queued -> cancelled.
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+
+VISIBILITY_SEC = float(os.getenv("QUEUE_VISIBILITY_SEC","60"))
+MAX_ATTEMPTS   = int(os.getenv("QUEUE_MAX_ATTEMPTS","3"))
+RETRY_BASE_SEC = float(os.getenv("QUEUE_RETRY_BASE_SEC","2"))
+RESULT_TTL_SEC = int(os.getenv("QUEUE_RESULT_TTL_SEC", str(24 * 3600)))
+DEAD_TTL_SEC   = int(os.getenv("QUEUE_DEAD_TTL_SEC", str(14 * 24 * 3600)))
+
+
+class QueueJobFailed(Exception):
+    pass
+
+class QueueTimeout(QueueJobFailed):
+    pass
+
+
+class JobQueue:
+    def __init__(self, collection, dead_letter):
+        self.collection, self.dead_letter = collection, dead_letter
+
+    def ensure_indexes(self):
+        self.collection.create_index([("queue",1),("status",1),("available_at",1)])
+        self.collection.create_index([("status",1),("lease_expires",1)])
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self.dead_letter.create_index("expires_at", expireAfterSeconds=0)
+        return self
+
+    # ------------------------------------------------------------ producer
+    def enqueue(self, queue, kind, payload, max_attempts=MAX_ATTEMPTS, start_within=None):
+        """-> job id. start_within (sec): drop the job if no worker has started it by then."""
+        now = datetime.utcnow()
+        return self.collection.insert_one(dict(
+            queue=queue, kind=kind, payload=payload, status="queued", attempts=0,
+            max_attempts=max_attempts, available_at=now, created_at=now,
+            deadline=now + timedelta(seconds=start_within) if start_within else None,
+            expires_at=now + timedelta(seconds=RESULT_TTL_SEC))).inserted_id
+
+    def wait(self, job_id, timeout, poll=0.01, max_poll=0.1):
+        """Block until the job is done -> its result. QueueJobFailed when it is dead,
+        QueueTimeout (after cancelling it if still queued) when `timeout` runs out."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.collection.find_one({"_id": job_id}, {"status": 1, "result": 1, "error": 1})
+            status = (job or {}).get("status")
+            if status == "done":
+                return job.get("result")
+            if status in ("dead", "cancelled") or job is None:
+                raise QueueJobFailed((job or {}).get("error") or f"job {status or 'vanished'}")
+            if time.monotonic() >= deadline:
+                self.cancel(job_id)
+                raise QueueTimeout(f"no result within {timeout:g}s")
+            time.sleep(poll)
+            poll = min(poll * 2, max_poll)
+
+    def cancel(self, job_id):
+        """Withdraw a job nobody has started yet."""
+        return self.collection.update_one({"_id": job_id, "status": "queued"},
+                                          {"$set": {"status": "cancelled"}, "$unset": {"payload": ""}}).modified_count > 0
+
+    # -------------------------------------------------------------- worker
+    def lease(self, queues, worker_id, visibility=VISIBILITY_SEC):
+        """Atomically take the oldest runnable job in `queues` -> job doc, or None."""
+        while True:
+            now = datetime.utcnow()
+            job = self.collection.find_one_and_update(
+                {"queue": {"$in": list(queues)},
+                 "$or": [{"status": "queued", "available_at": {"$lte": now}},
+                         {"status": "leased", "lease_expires": {"$lte": now}}],
+                 "deadline": {"$not": {"$lte": now}}},
+                {"$set": {"status": "leased", "worker": worker_id, "lease_token": uuid.uuid4().hex,
+                          "leased_at": now, "lease_expires": now + timedelta(seconds=visibility)},
+                 "$inc": {"attempts": 1}},
+                sort=[("available_at", 1)], return_document=ReturnDocument.AFTER)
+            if job is None:
+                return None
+            if job["attempts"] > job["max_attempts"]:       # every earlier lease expired mid-job
+                self._dead(job, job.get("error") or "lease expired on every attempt")
+                continue
+            return job
+
+    def heartbeat(self, job, visibility=VISIBILITY_SEC):
+        """Extend our lease; False when it was lost (expired and re-leased)."""
+        return self.collection.update_one(
+            {"_id": job["_id"], "lease_token": job["lease_token"]},
+            {"$set": {"lease_expires": datetime.utcnow() + timedelta(seconds=visibility)}}).matched_count > 0
+
+    def complete(self, job, result):
+        return self.collection.update_one(
+            {"_id": job["_id"], "lease_token": job["lease_token"], "status": "leased"},
+            {"$set": {"status": "done", "result": result, "finished_at": datetime.utcnow()},
+             "$unset": {"payload": "", "lease_token": ""}}).modified_count > 0
+
+    def fail(self, job, error, retry=True):
+        """Re-queue with backoff, or dead-letter once attempts are used up (or retry=False).
+        -> "retried" | "dead" | "lost" (our lease was gone)."""
+        if not retry or job["attempts"] >= job["max_attempts"]:
+            return "dead" if self._dead(job, error) else "lost"
+        backoff = RETRY_BASE_SEC * 2 ** (job["attempts"] - 1)
+        res = self.collection.update_one(
+            {"_id": job["_id"], "lease_token": job["lease_token"], "status": "leased"},
+            {"$set": {"status": "queued", "error": error,
+                      "available_at": datetime.utcnow() + timedelta(seconds=backoff)},
+             "$unset": {"worker": "", "lease_token": "", "lease_expires": ""}})
+        return "retried" if res.modified_count else "lost"
+
+    def _dead(self, job, error):
+        now = datetime.utcnow()
+        res = self.collection.update_one(
+            {"_id": job["_id"], "lease_token": job["lease_token"]},
+            {"$set": {"status": "dead", "error": error, "finished_at": now}, "$unset": {"payload": ""}})
+        if not res.modified_count:
+            return False
+        self.dead_letter.replace_one({"_id": job["_id"]}, dict(
+            job, status="dead", error=error, dead_at=now,
+            expires_at=now + timedelta(seconds=DEAD_TTL_SEC)), upsert=True)
+        return True
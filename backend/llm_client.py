@@ -0,0 +1,434 @@
+# llm_client.py
+# Shared wrapper around the Gemini model used by every endpoint.
+#
+#   * per-call deadline (covers all retries of one call)
+#   * jittered exponential-backoff retries on transient errors (4xx API errors
+#     other than 429 are neither retried nor counted by the breaker)
+#   * semaphore cap on concurrent upstream calls
+#   * circuit breaker that fails fast while the upstream is unhealthy
+#   * generate_hedged(): race extra copies of a slow call, keep the first valid answer
+#
+# Failures surface as LLMUnavailable so callers keep their existing
+# fallback values. Set GEMINI_BASE_URL to talk plain REST to a local fake
+# server instead of the SDK.
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+try:
+    from google.api_core import exceptions as api_exceptions
+except ImportError:                       # REST-only installs
+    api_exceptions = None
+
+from metrics import LLM_LATENCY, LLM_IN_FLIGHT, LLM_QUEUE, LLM_HEDGES
+
+LLM_TIMEOUT         = float(os.getenv("LLM_TIMEOUT_SEC", "30"))
+LLM_RETRIES         = int(os.getenv("LLM_RETRIES", "2"))
+LLM_BACKOFF         = float(os.getenv("LLM_BACKOFF_SEC", "0.5"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_QUEUE_TIMEOUT   = float(os.getenv("LLM_QUEUE_TIMEOUT_SEC", "5"))
+BREAKER_FAILURES    = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+BREAKER_RESET       = float(os.getenv("LLM_BREAKER_RESET_SEC", "30"))
+HEDGE_PERCENTILE    = float(os.getenv("LLM_HEDGE_PERCENTILE", "90"))   # hedge once a call is slower than this
+HEDGE_DEFAULT_SEC   = float(os.getenv("LLM_HEDGE_DELAY_SEC", "2"))     # ... until enough samples exist
+HEDGE_MIN_SAMPLES   = 20
+
+
+class LLMUnavailable(Exception):
+    pass
+
+class TransientLLMError(Exception):
+    pass
+
+
+def _rejected(e):
+    """A 4xx-class API error (bad request, permission, not found ...): retrying won't help and the
+    upstream is healthy, so it is not a breaker failure. 429 stays transient."""
+    return (api_exceptions is not None and isinstance(e, api_exceptions.ClientError)
+            and not isinstance(e, api_exceptions.TooManyRequests))
+
+
+# ---------------------------------------------------
+# Transports: prompt + timeout -> text
+# ---------------------------------------------------
+class GeminiSDKTransport:
+    def __init__(self, model):
+        self.model = model
+        self.name  = getattr(model, "model_name", "gemini")
+
+    def __call__(self, prompt, timeout):
+        resp = self.model.generate_content(prompt, request_options={"timeout": timeout})
+        return resp.text if resp and resp.text else ""
+
+    async def acall(self, prompt, timeout):
+        resp = await self.model.generate_content_async(prompt, request_options={"timeout": timeout})
+        return resp.text if resp and resp.text else ""
+
+class GeminiHTTPTransport:
+    """generateContent over REST; works against the real API or a local fake."""
+    def __init__(self, base_url, model_name="gemini-1.5-flash", api_key=None):
+        self.url     = f"{base_url.rstrip('/')}/v1beta/models/{model_name}:generateContent"
+        self.api_key = api_key
+        self.name    = model_name
+        self.session = requests.Session()
+        self._aclient = None
+
+    def __call__(self, prompt, timeout):
+        r = self.session.post(
+            self.url,
+            params={"key": self.api_key} if self.api_key else None,
+            json={"contents": [{"parts": [{"text": prompt}]}]},
+            timeout=timeout
+        )
+        return self._parse(r)
+
+    async def acall(self, prompt, timeout):
+        import httpx                              # only the async app needs it
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient()
+        r = await self._aclient.post(
+            self.url,
+            params={"key": self.api_key} if self.api_key else None,
+            json={"contents": [{"parts": [{"text": prompt}]}]},
+            timeout=timeout
+        )
+        return self._parse(r)
+
+    def _parse(self, r):
+        if r.status_code == 429 or r.status_code >= 500:
+            raise TransientLLMError(f"HTTP {r.status_code}")
+        if r.status_code >= 400:
+            raise ValueError(f"HTTP {r.status_code}: {r.text[:200]}")
+        cands = r.json().get("candidates") or []
+        if not cands:
+            return ""
+        return "".join(p.get("text", "") for p in cands[0].get("content", {}).get("parts", []))
+
+
+# ---------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------
+class CircuitBreaker:
+    """closed -> open after N consecutive failures -> half-open after reset_timeout."""
+    def __init__(self, failure_threshold=BREAKER_FAILURES, reset_timeout=BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout     = reset_timeout
+        self._failures  = 0
+        self._opened_at = None
+        self._probing   = False
+        self._lock      = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True          # let exactly one trial call through
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures, self._opened_at, self._probing = 0, None, False
+
+    def cancel_probe(self):
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+# ---------------------------------------------------
+# Client
+# ---------------------------------------------------
+class LLMClient:
+    def __init__(self, transport, timeout=LLM_TIMEOUT, retries=LLM_RETRIES, backoff=LLM_BACKOFF,
+                 max_concurrency=LLM_MAX_CONCURRENCY, queue_timeout=LLM_QUEUE_TIMEOUT, breaker=None):
+        self.transport     = transport
+        self.name          = getattr(transport, "name", "llm") if transport else "llm"
+        self.timeout       = timeout
+        self.retries       = retries
+        self.backoff       = backoff
+        self.queue_timeout = queue_timeout
+        self.breaker       = breaker or CircuitBreaker()
+        self._slots        = threading.BoundedSemaphore(max_concurrency)
+        self._max_concurrency = max_concurrency
+        self._aslots       = None          # asyncio.Semaphore, created on first async call
+        self._latencies    = {}            # label -> recent successful call durations
+        self._hedge_pool   = ThreadPoolExecutor(max_concurrency, thread_name_prefix="llm-hedge")
+
+    @property
+    def available(self):
+        return self.transport is not None
+
+    def _sleep_backoff(self, attempt, deadline):
+        delay = self.backoff * (2 ** attempt)
+        delay = random.uniform(delay / 2, delay)      # jitter
+        delay = min(delay, deadline - time.monotonic())
+        if delay > 0:
+            time.sleep(delay)
+
+    def generate(self, prompt, timeout=None, label="llm", use_breaker=True):
+        """Return the model's text, or raise LLMUnavailable. `label` names the call in /metrics.
+        use_breaker=False: the caller consults and updates the breaker itself (hedged copies)."""
+        t0, outcome = time.perf_counter(), "error"
+        try:
+            text = self._generate(prompt, timeout, use_breaker)
+            outcome = "ok"
+            self._latencies.setdefault(label, deque(maxlen=200)).append(time.perf_counter() - t0)
+            return text
+        except LLMUnavailable as e:
+            outcome = getattr(e, "outcome", "error")
+            raise
+        finally:
+            LLM_LATENCY.observe(time.perf_counter() - t0, call=label, model=self.name, outcome=outcome)
+
+    def hedge_delay(self, label):
+        """Recent HEDGE_PERCENTILE latency of `label` calls (HEDGE_DEFAULT_SEC until there is history)."""
+        samples = sorted(self._latencies.get(label, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_SEC
+        return samples[int(HEDGE_PERCENTILE / 100 * (len(samples) - 1))]
+
+    def generate_hedged(self, prompt, validate=None, max_requests=2, hedge_after=None, timeout=None, label="llm"):
+        """Race up to `max_requests` copies of one call -> first text passing `validate`.
+
+        Another copy starts when the newest one is still out after `hedge_after`
+        seconds (default: hedge_delay(label); 0 starts them all at once), or right
+        away when a copy comes back failed/invalid. If no copy passes, the last
+        text received is returned, or LLMUnavailable raised when all failed.
+        Losing copies cannot be interrupted mid-request; their results are dropped.
+        """
+        validate = validate or (lambda text: True)
+        delay    = self.hedge_delay(label) if hedge_after is None else hedge_after
+        deadline = time.monotonic() + (timeout or self.timeout)
+        pending, launched = {}, 0
+        fallback = last_err = None
+        if not self.available:
+            raise LLMUnavailable("LLM not configured")
+        # one logical call: one breaker check up front and at most one outcome recorded (settle)
+        if not self.breaker.allow():
+            raise _unavailable("LLM circuit open", "circuit_open")
+        settled = False
+
+        def settle(healthy):
+            nonlocal settled
+            if settled:
+                return
+            settled = True
+            if healthy is None:
+                self.breaker.cancel_probe()
+            elif healthy:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+        def run_copy():
+            # the copy may have queued for a pool thread: its budget is what is left now
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise _unavailable("LLM hedged copy never got a thread", "busy")
+            return self.generate(prompt, remaining, label, use_breaker=False)
+
+        def launch():
+            nonlocal launched
+            if launched:
+                LLM_HEDGES.inc(call=label, model=self.name, event="launched")
+            pending[self._hedge_pool.submit(run_copy)] = launched
+            launched += 1
+
+        upstream_failed = False
+        launch()
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            can_hedge = launched < max_requests
+            done, _ = wait(pending, timeout=min(delay, remaining) if can_hedge else remaining,
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                if can_hedge:
+                    launch()                     # slow: race another copy
+                continue
+            retry = False
+            for f in done:
+                copy = pending.pop(f)
+                try:
+                    text = f.result()
+                except LLMUnavailable as e:
+                    last_err, retry = e, True
+                    outcome = getattr(e, "outcome", "error")
+                    if outcome in ("unusable", "rejected"):
+                        settle(True)             # upstream answered; the request was the problem
+                    elif outcome == "error":
+                        upstream_failed = True
+                    continue
+                settle(True)
+                if validate(text):
+                    for other in pending:
+                        other.cancel()           # only stops copies still queued for a thread
+                    if copy:
+                        LLM_HEDGES.inc(call=label, model=self.name, event="won")
+                    return text
+                fallback, retry = text, True
+            if retry and launched < max_requests:
+                launch()
+
+        # nothing usable came back: a failure if the upstream failed or hung, else (busy) neutral
+        settle(None if not upstream_failed and not pending else False)
+        if fallback is not None:
+            return fallback
+        raise last_err or _unavailable("LLM hedged call timed out", "timeout")
+
+    def _generate(self, prompt, timeout, use_breaker=True):
+        if not self.available:
+            raise LLMUnavailable("LLM not configured")
+        breaker = self.breaker if use_breaker else _NO_BREAKER
+        if not breaker.allow():
+            raise _unavailable("LLM circuit open", "circuit_open")
+
+        deadline = time.monotonic() + (timeout or self.timeout)
+        with LLM_QUEUE.track(model=self.name):
+            got_slot = self._slots.acquire(timeout=min(self.queue_timeout, deadline - time.monotonic()))
+        if not got_slot:
+            # not an upstream failure, so the breaker only gives back its trial slot
+            breaker.cancel_probe()
+            raise _unavailable("LLM concurrency limit reached", "busy")
+        try:
+            with LLM_IN_FLIGHT.track(model=self.name):
+                return self._attempts(prompt, deadline, breaker)
+        finally:
+            self._slots.release()
+
+    def _attempts(self, prompt, deadline, breaker):
+        last_err = None
+        for attempt in range(self.retries + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                text = self.transport(prompt, remaining)
+                breaker.record_success()
+                return text
+            except (ValueError, TypeError) as e:   # blocked / malformed response: not transient
+                breaker.record_success()
+                raise _unavailable(f"LLM response unusable: {e}", "unusable")
+            except Exception as e:
+                if _rejected(e):
+                    breaker.record_success()
+                    raise _unavailable(f"LLM request rejected: {e}", "rejected")
+                last_err = e
+                if attempt < self.retries:
+                    self._sleep_backoff(attempt, deadline)
+        breaker.record_failure()
+        raise LLMUnavailable(f"LLM call failed: {last_err or 'deadline exceeded'}")
+
+
+    # ---------------------------------------------------------------- async
+    async def generate_async(self, prompt, timeout=None, label="llm"):
+        """Async twin of generate(): same deadline, retries, breaker and metrics, no thread held."""
+        t0, outcome = time.perf_counter(), "error"
+        try:
+            text = await self._generate_async(prompt, timeout)
+            outcome = "ok"
+            return text
+        except LLMUnavailable as e:
+            outcome = getattr(e, "outcome", "error")
+            raise
+        finally:
+            LLM_LATENCY.observe(time.perf_counter() - t0, call=label, model=self.name, outcome=outcome)
+
+    async def _generate_async(self, prompt, timeout):
+        if not self.available or not hasattr(self.transport, "acall"):
+            raise LLMUnavailable("Async LLM not configured")
+        if not self.breaker.allow():
+            raise _unavailable("LLM circuit open", "circuit_open")
+        if self._aslots is None:
+            self._aslots = asyncio.Semaphore(self._max_concurrency)
+
+        deadline = time.monotonic() + (timeout or self.timeout)
+        try:
+            with LLM_QUEUE.track(model=self.name):
+                await asyncio.wait_for(self._aslots.acquire(),
+                                       min(self.queue_timeout, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self.breaker.cancel_probe()
+            raise _unavailable("LLM concurrency limit reached", "busy")
+        try:
+            with LLM_IN_FLIGHT.track(model=self.name):
+                last_err = None
+                for attempt in range(self.retries + 1):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        text = await asyncio.wait_for(self.transport.acall(prompt, remaining), remaining)
+                        self.breaker.record_success()
+                        return text
+                    except (ValueError, TypeError) as e:
+                        self.breaker.record_success()
+                        raise _unavailable(f"LLM response unusable: {e}", "unusable")
+                    except Exception as e:
+                        if _rejected(e):
+                            self.breaker.record_success()
+                            raise _unavailable(f"LLM request rejected: {e}", "rejected")
+                        last_err = e
+                        if attempt < self.retries:
+                            delay = self.backoff * (2 ** attempt)
+                            delay = min(random.uniform(delay / 2, delay), deadline - time.monotonic())
+                            if delay > 0:
+                                await asyncio.sleep(delay)
+                self.breaker.record_failure()
+                raise LLMUnavailable(f"LLM call failed: {last_err or 'deadline exceeded'}")
+        finally:
+            self._aslots.release()
+
+
+class _NoBreaker:
+    """Stand-in for calls whose breaker bookkeeping is done by the caller."""
+    def allow(self):
+        return True
+    def record_success(self):
+        pass
+    def record_failure(self):
+        pass
+    def cancel_probe(self):
+        pass
+
+_NO_BREAKER = _NoBreaker()
+
+
+def _unavailable(msg, outcome):
+    e = LLMUnavailable(msg)
+    e.outcome = outcome
+    return e
+
+
+def make_client(model=None):
+    """REST transport when GEMINI_BASE_URL is set, else the SDK model (if it loaded)."""
+    base_url = os.getenv("GEMINI_BASE_URL")
+    if base_url:
+        transport = GeminiHTTPTransport(base_url, os.getenv("GEMINI_MODEL", "gemini-1.5-flash"),
+                                        os.getenv("GEMINI_API_KEY"))
+    else:
+        transport = GeminiSDKTransport(model) if model is not None else None
+    return LLMClient(transport)
@@ -1,7 +1,21 @@
 # makedb.py
+#
+#   python makedb.py                          # load the built-in default bank
+#   python makedb.py bank.json extra.csv ...  # load question-bank files instead
+#
+# Files may be JSON ({section: [questions]}, or a list of
+# {"section", "questions"|"question", "role"?, "locale"?} objects),
+# JSON Lines (.jsonl/.ndjson, one row per line) or CSV with a header of
+# section,question[,role,locale]. JSONL and CSV are streamed row by row.
 import os
+import re
 import sys
-from pymongo import MongoClient
+import csv
+import json
+import time
+import argparse
+from datetime import datetime
+from pymongo import MongoClient, ReturnDocument, UpdateOne, ASCENDING
 from dotenv import load_dotenv
 
 load_dotenv()  # explicitly load the .env file
@@ -14,9 +28,15 @@ if not MONGO_URI:
 client = MongoClient(MONGO_URI)
 db = client["soft-skill"]
 soft_skill_coll = db["softSkillQuestions"]
+meta_coll       = db["softSkillMeta"]
 
 
-# Insert or update each section
+DEFAULT_ROLE   = "general"
+DEFAULT_LOCALE = "en"
+SECTION_RE     = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+MAX_QUESTION_LEN = 1000
+
+# Built-in bank, used when no files are given
 sections_data = [
     {
       "section": "communication",
@@ -74,11 +94,155 @@ sections_data = [
     }
 ]
 
-for doc in sections_data:
-    soft_skill_coll.update_one(
-        {"section": doc["section"]},
-        {"$set": {"questions": doc["questions"]}},
-        upsert=True
+# ---------------------------------------------------
+# Readers: each yields raw row dicts, lazily where the format allows
+# ---------------------------------------------------
+def _expand(obj):
+    """Normalise a JSON object into one row per question."""
+    if not isinstance(obj, dict):
+        yield {"_invalid": obj}
+        return
+    qs = obj.get("questions")
+    if isinstance(qs, list):
+        for q in qs:
+            yield dict(obj, question=q, questions=None)
+    else:
+        yield obj
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):          # {section: [questions]}
+        data = [{"section": sec, "questions": qs} for sec, qs in data.items()]
+    for obj in data:
+        yield from _expand(obj)
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    yield from _expand(json.loads(line))
+                except ValueError:
+                    yield {"_invalid": line}
+
+def read_csv(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
+
+READERS = {".json": read_json, ".jsonl": read_jsonl, ".ndjson": read_jsonl, ".csv": read_csv}
+
+def read_rows(paths):
+    for path in paths:
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in READERS:
+            raise SystemExit(f"Unsupported question-bank file: {path}")
+        yield from READERS[ext](path)
+
+# ---------------------------------------------------
+# Validate + deduplicate
+# ---------------------------------------------------
+def clean_row(row):
+    """Return (section, role, locale, question) or None if the row is invalid."""
+    if "_invalid" in row:
+        return None
+    section  = str(row.get("section") or "").strip()
+    question = " ".join(str(row.get("question") or "").split())
+    role     = str(row.get("role") or DEFAULT_ROLE).strip()
+    locale   = str(row.get("locale") or DEFAULT_LOCALE).strip().lower()
+    if not SECTION_RE.match(section) or not question or len(question) > MAX_QUESTION_LEN:
+        return None
+    return section, role, locale, question
+
+def collect(rows, stats):
+    """Group valid rows by (section, role, locale), dropping case-insensitive duplicates."""
+    bank, seen = {}, set()
+    for row in rows:
+        stats["rows"] += 1
+        cleaned = clean_row(row)
+        if not cleaned:
+            stats["invalid"] += 1
+            continue
+        section, role, locale, question = cleaned
+        dedupe_key = (section, role, locale, question.lower())
+        if dedupe_key in seen:
+            stats["duplicates"] += 1
+            continue
+        seen.add(dedupe_key)
+        bank.setdefault((section, role, locale), []).append(question)
+    return bank
+
+# ---------------------------------------------------
+# Write
+# ---------------------------------------------------
+def build_ops(bank, merge=False):
+    for (section, role, locale), questions in bank.items():
+        update = ({"$addToSet": {"questions": {"$each": questions}}} if merge
+                  else {"$set": {"questions": questions}})
+        yield UpdateOne({"section": section, "role": role, "locale": locale}, update, upsert=True)
+
+def write_bank(bank, batch_size, merge, stats):
+    # Older docs were keyed by section only; give them the default role/locale
+    soft_skill_coll.update_many(
+        {"role": {"$exists": False}},
+        {"$set": {"role": DEFAULT_ROLE, "locale": DEFAULT_LOCALE}}
     )
+    soft_skill_coll.create_index([("section", ASCENDING), ("role", ASCENDING), ("locale", ASCENDING)])
+
+    batch = []
+    def flush():
+        if not batch:
+            return
+        res = soft_skill_coll.bulk_write(batch, ordered=False)
+        stats["batches"]  += 1
+        stats["upserted"] += res.upserted_count
+        stats["modified"] += res.modified_count
+        stats["matched"]  += res.matched_count
+        batch.clear()
+
+    for op in build_ops(bank, merge):
+        batch.append(op)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load soft-skill question banks into MongoDB.")
+    ap.add_argument("files", nargs="*", help="JSON / JSONL / CSV question-bank files")
+    ap.add_argument("--batch-size", type=int, default=500, help="operations per bulk_write")
+    ap.add_argument("--merge", action="store_true",
+                    help="add to existing questions instead of replacing them")
+    ap.add_argument("--dry-run", action="store_true", help="validate only, do not write")
+    args = ap.parse_args(argv)
+
+    stats = dict(rows=0, invalid=0, duplicates=0, batches=0, upserted=0, modified=0, matched=0)
+    t0 = time.perf_counter()
+    rows = read_rows(args.files) if args.files else (
+        r for doc in sections_data for r in _expand(doc))
+    bank = collect(rows, stats)
+    t_read = time.perf_counter() - t0
+
+    print(f"Read {stats['rows']} rows -> {sum(map(len, bank.values()))} questions "
+          f"in {len(bank)} section groups ({stats['invalid']} invalid, "
+          f"{stats['duplicates']} duplicates) in {t_read:.2f}s")
+    if args.dry_run or not bank:
+        return
+
+    t1 = time.perf_counter()
+    write_bank(bank, max(1, args.batch_size), args.merge, stats)
+    t_write = time.perf_counter() - t1
+
+    # Bump the bank version so running app servers reload their in-memory copy
+    meta = meta_coll.find_one_and_update(
+        {"_id": "questionBank"},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+
+    print(f"Wrote {stats['batches']} batch(es): {stats['upserted']} upserted, "
+          f"{stats['modified']} modified, {stats['matched']} matched in {t_write:.2f}s")
+    print(f"Soft skill questions inserted/updated! (bank version {meta['version']})")
 
-print("Soft skill questions inserted/updated!")
+if __name__ == "__main__":
+    main()
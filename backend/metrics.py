@@ -0,0 +1,368 @@
+# metrics.py
+# Tiny in-process metrics registry rendered in the Prometheus text format
+# (exposed by app.py on /metrics). Histograms time each hot-path stage,
+# gauges track in-flight requests and inference queue depths, and a pymongo
+# command listener times every Mongo operation.
+#
+# Under the prefork server (serve.py) every worker process has its own
+# registry. With METRICS_MULTIPROC_DIR set, /metrics renders the whole node;
+# see "Multi-process aggregation" below.
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from pymongo import monitoring
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _fmt_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+def _fmt_value(v):
+    return "+Inf" if v == float("inf") else repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), val] for key, val in self._values.items()]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    @staticmethod
+    def _add(a, b):
+        return a + b
+
+    def merge_into(self, values, snapshot):
+        """Add a snapshot() (possibly from another process) into `values`."""
+        for key, val in snapshot:
+            key = tuple(key)
+            values[key] = self._add(values[key], val) if key in values else val
+
+    def render(self, values=None):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        if values is None:
+            with self._lock:
+                values = dict(self._values)
+        for key, val in sorted(values.items()):
+            lines.extend(self._render_one(key, val))
+        return lines
+
+    def _render_one(self, key, val):
+        return [f"{self.name}{_fmt_labels(self.labelnames, key)} {_fmt_value(val)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    @contextmanager
+    def track(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), [list(counts), total]] for key, (counts, total) in self._values.items()]
+
+    @staticmethod
+    def _add(a, b):
+        return [x + y for x, y in zip(a[0], b[0])], a[1] + b[1]
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def _render_one(self, key, val):
+        counts, total = val
+        out = [f"{self.name}_bucket{_fmt_labels(self.labelnames, key, [('le', _fmt_value(b))])} {c}"
+               for b, c in zip(self.buckets, counts)]
+        out.append(f"{self.name}_sum{_fmt_labels(self.labelnames, key)} {total!r}")
+        out.append(f"{self.name}_count{_fmt_labels(self.labelnames, key)} {counts[-1]}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def snapshot(self, gauges=True):
+        return {m.name: m.snapshot() for m in self._metrics if gauges or m.kind != "gauge"}
+
+    def clear_events(self):
+        """Forget counters and histograms (gauges describe this process's state and stay)."""
+        for m in self._metrics:
+            if m.kind != "gauge":
+                m.clear()
+
+    def render(self):
+        if multiproc_dir():
+            return self.render_node()
+        lines = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+    def render_node(self):
+        """Sum of every process's snapshot in METRICS_MULTIPROC_DIR (ours is written fresh first)."""
+        write_snapshot()
+        merged = {m.name: {} for m in self._metrics}
+        for data, live in _read_snapshots():
+            for m in self._metrics:
+                if m.name in data and (live or m.kind != "gauge"):
+                    m.merge_into(merged[m.name], data[m.name])
+        lines = []
+        for m in self._metrics:
+            lines.extend(m.render(merged[m.name]))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ---------------------------------------------------
+# Multi-process aggregation
+# ---------------------------------------------------
+# A scrape lands on whichever prefork worker accepts it, so each worker dumps
+# its registry to <METRICS_MULTIPROC_DIR>/<pid>.json every METRICS_SNAPSHOT_SEC
+# and /metrics sums all the files:
+#   <pid>.json     live workers: counters, histograms and gauges
+#   master.json    what the preloading master recorded before forking (model loads)
+#   dead.json      counters/histograms of exited workers (retire_worker), so totals never go back
+# Gauges are summed over live workers only. Other workers' values can be up
+# to METRICS_SNAPSHOT_SEC old. Without the env var every process renders just itself.
+SNAPSHOT_SEC = float(os.getenv("METRICS_SNAPSHOT_SEC","5"))
+
+def multiproc_dir():
+    return os.getenv("METRICS_MULTIPROC_DIR","")
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)                  # readers never see a half-written file
+
+def _load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_snapshot(name=None, gauges=True):
+    path = os.path.join(multiproc_dir(), f"{name or os.getpid()}.json")
+    _write_json(path, REGISTRY.snapshot(gauges))
+
+def _read_snapshots():
+    base = multiproc_dir()
+    for fn in os.listdir(base):
+        if fn.endswith(".json"):
+            data = _load_json(os.path.join(base, fn))
+            if data is not None:
+                yield data, fn[:-5].isdigit()
+
+def retire_worker(pid):
+    """Master side, when a worker exits: fold its counters/histograms into dead.json."""
+    base = multiproc_dir()
+    path = os.path.join(base, f"{pid}.json")
+    data = _load_json(path)
+    if data is None:
+        return
+    dead = _load_json(os.path.join(base, "dead.json")) or {}
+    for m in REGISTRY._metrics:
+        if m.kind != "gauge" and m.name in data:
+            values = {tuple(k): v for k, v in dead.get(m.name, [])}
+            m.merge_into(values, data[m.name])
+            dead[m.name] = [[list(k), v] for k, v in values.items()]
+    _write_json(os.path.join(base, "dead.json"), dead)
+    os.remove(path)
+
+def start_snapshots():
+    """Worker side, after fork: drop the counts inherited from the master and dump ours periodically."""
+    if not multiproc_dir():
+        return
+    REGISTRY.clear_events()
+    def loop():
+        while True:
+            try:
+                write_snapshot()
+            except Exception as e:
+                print("Metrics snapshot failed:", e)
+            time.sleep(SNAPSHOT_SEC)
+    threading.Thread(target=loop, daemon=True, name="metrics-snapshot").start()
+
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "softskill_http_request_seconds", "HTTP request latency.", ["endpoint", "method", "status"]))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "softskill_http_in_flight", "Requests currently being served.", ["endpoint"]))
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "softskill_stage_seconds", "Latency of individual hot-path stages.", ["stage", "endpoint", "model"]))
+INFERENCE_QUEUE = REGISTRY.register(Gauge(
+    "softskill_inference_queue_depth", "Inference calls waiting or running, per model.", ["model"]))
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    "softskill_admission_rejected_total", "Requests refused by admission control.", ["model", "reason"]))
+MODEL_LOADS = REGISTRY.register(Histogram(
+    "softskill_model_load_seconds", "Model load time; reason=reload after an eviction.", ["model", "reason"]))
+MODEL_EVICTIONS = REGISTRY.register(Counter(
+    "softskill_model_evictions_total", "Models dropped from memory (idle or budget).", ["model", "reason"]))
+MODEL_RESIDENT = REGISTRY.register(Gauge(
+    "softskill_model_resident_mb", "Estimated memory of each loaded model, 0 when evicted.", ["model"]))
+QUEUE_JOBS = REGISTRY.register(Counter(
+    "softskill_queue_jobs_total", "Work-queue jobs handled by workers, by outcome.", ["queue", "kind", "outcome"]))
+QUEUE_WAIT = REGISTRY.register(Histogram(
+    "softskill_queue_wait_seconds", "Time from enqueue to a worker leasing the job.", ["queue"]))
+LLM_LATENCY = REGISTRY.register(Histogram(
+    "softskill_llm_call_seconds", "LLM call latency including retries.", ["call", "model", "outcome"]))
+LLM_HEDGES = REGISTRY.register(Counter(
+    "softskill_llm_hedges_total", "Hedged LLM copies launched, and hedges that won.", ["call", "model", "event"]))
+TECH_Q_CACHE = REGISTRY.register(Counter(
+    "softskill_tech_question_cache_total", "Technical-question cache lookups (hit/miss) and refills.", ["result"]))
+ANSWER_ASSESSMENTS = REGISTRY.register(Counter(
+    "softskill_answer_assessments_total",
+    "Answer assessments by path (llm, provisional, local; late: replaced, superseded, late_failed).", ["path"]))
+SKILL_SUMMARIES = REGISTRY.register(Counter(
+    "softskill_skill_summaries_total", "Skill summaries by source (local taxonomy or LLM).", ["source"]))
+LLM_IN_FLIGHT = REGISTRY.register(Gauge(
+    "softskill_llm_in_flight", "LLM calls holding a concurrency slot.", ["model"]))
+LLM_QUEUE = REGISTRY.register(Gauge(
+    "softskill_llm_queue_depth", "LLM calls waiting for a concurrency slot.", ["model"]))
+MONGO_LATENCY = REGISTRY.register(Histogram(
+    "softskill_mongo_command_seconds", "MongoDB command latency.",
+    ["command", "collection", "outcome"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)))
+
+
+def current_endpoint():
+    return (request.endpoint or "unknown") if has_request_context() else "background"
+
+@contextmanager
+def stage(name, model=""):
+    """Time one stage of the current request: `with stage("transcription", "whisper"): ...`"""
+    with STAGE_LATENCY.time(stage=name, endpoint=current_endpoint(), model=model):
+        yield
+
+@contextmanager
+def inference(model, name="inference"):
+    """Count a model call in the queue-depth gauge and time it as a stage."""
+    with INFERENCE_QUEUE.track(model=model), stage(name, model):
+        yield
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """Pass in MongoClient(event_listeners=[...]) to time every command."""
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        coll = event.command.get(event.command_name)
+        self._pending[(event.connection_id, event.request_id)] = (
+            event.command_name, coll if isinstance(coll, str) else "")
+
+    def _finish(self, event, outcome):
+        cmd, coll = self._pending.pop((event.connection_id, event.request_id), (event.command_name, ""))
+        MONGO_LATENCY.observe(event.duration_micros / 1e6, command=cmd, collection=coll, outcome=outcome)
+
+    def succeeded(self, event):
+        self._finish(event, "ok")
+
+    def failed(self, event):
+        self._finish(event, "error")
+
+
+def init_app(app):
+    """Per-request latency + in-flight tracking and the /metrics route."""
+    @app.before_request
+    def _metrics_start():
+        g._metrics_t0 = time.perf_counter()
+        HTTP_IN_FLIGHT.inc(endpoint=request.endpoint or "unknown")
+
+    @app.teardown_request
+    def _metrics_end(exc):
+        t0 = g.pop("_metrics_t0", None)
+        if t0 is None:
+            return
+        HTTP_IN_FLIGHT.dec(endpoint=request.endpoint or "unknown")
+        status = g.pop("_metrics_status", 500 if exc else 200)
+        HTTP_LATENCY.observe(time.perf_counter() - t0, endpoint=request.endpoint or "unknown",
+                             method=request.method, status=status)
+
+    @app.after_request
+    def _metrics_status(resp):
+        g._metrics_status = resp.status_code
+        return resp
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return REGISTRY.render(), 200, {"Content-Type": CONTENT_TYPE}
@@ -0,0 +1,181 @@
+# model_manager.py
+# On-demand model residency under a memory budget.
+#
+#   models = ModelManager()
+#   models.register("whisper", load=lambda: whisper.load_model("base"), size_mb=400)
+#   with models.use("whisper") as m:          # loads on first use / after eviction
+#       m.transcribe(path)
+#
+# Every use stamps the model's last-use time. A model idle for MODEL_IDLE_SEC
+# is dropped by a reaper thread. When loading one more model would go over
+# MODEL_MEMORY_BUDGET_MB, the least recently used idle models are dropped
+# first. A model in use is never evicted; if nothing idle is left to drop,
+# the load goes ahead over budget. Eviction drops the weights from RAM, and
+# the next use reads them back from disk. That reload time goes to
+# softskill_model_load_seconds{reason="reload"}.
+#
+# Sizes: the RSS growth measured on the first load, else the size_mb estimate
+# (override with MODEL_SIZE_MB_<NAME>).
+#
+# Defaults keep every model resident (MODEL_IDLE_SEC=0, no budget). On a quiet
+# node, set MODEL_IDLE_SEC and/or MODEL_MEMORY_BUDGET_MB, plus MODEL_PRELOAD=0.
+# Otherwise a preloading master keeps its own copy of the weights, and workers
+# evicting theirs frees nothing.
+import os
+import gc
+import sys
+import time
+import ctypes
+import threading
+from contextlib import contextmanager
+
+import metrics
+
+BUDGET_MB = float(os.getenv("MODEL_MEMORY_BUDGET_MB","0"))        # 0 = unlimited
+IDLE_SEC  = float(os.getenv("MODEL_IDLE_SEC","0"))                # 0 = never unload idle models
+PRELOAD   = os.getenv("MODEL_PRELOAD","1") == "1"
+
+
+def rss_mb():
+    """Resident set size of this process (Linux /proc; 0 elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+def release_memory():
+    """Collect the dropped weights and hand freed heap pages back to the OS."""
+    gc.collect()
+    if sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+class ManagedModel:
+    def __init__(self, name, load, unload, size_mb):
+        self.name, self._load, self._unload = name, load, unload
+        self.size_mb   = float(os.getenv(f"MODEL_SIZE_MB_{name.upper()}", size_mb))
+        self.measured  = False
+        self.obj       = None
+        self.loads     = 0
+        self.in_use    = 0
+        self.last_used = 0.0
+        self.load_lock = threading.Lock()
+
+
+class ModelManager:
+    def __init__(self, budget_mb=BUDGET_MB, idle_sec=IDLE_SEC):
+        self.budget_mb, self.idle_sec = budget_mb, idle_sec
+        self._models = {}
+        self._lock   = threading.Lock()
+        self._thread = None
+
+    def register(self, name, load, size_mb, unload=None):
+        self._models[name] = ManagedModel(name, load, unload, size_mb)
+        return self
+
+    # ------------------------------------------------------------------ use
+    @contextmanager
+    def use(self, name):
+        m = self._models[name]
+        with self._lock:
+            m.in_use += 1                      # pins it: never evicted while someone holds it
+        try:
+            if m.obj is None:
+                self._ensure_loaded(m)
+            yield m.obj
+        finally:
+            with self._lock:
+                m.in_use -= 1
+                m.last_used = time.monotonic()
+
+    def _ensure_loaded(self, m):
+        with m.load_lock:                      # concurrent first users wait for one load
+            if m.obj is not None:
+                return
+            self._make_room(m)
+            reason = "reload" if m.loads else "cold"
+            before, t0 = rss_mb(), time.perf_counter()
+            obj = m._load()
+            took = time.perf_counter() - t0
+            grown = rss_mb() - before
+            if grown >= 1 and not m.measured:        # stubs and tiny models keep the estimate
+                m.size_mb, m.measured = grown, True
+            with self._lock:
+                m.obj, m.loads, m.last_used = obj, m.loads + 1, time.monotonic()
+            metrics.MODEL_LOADS.observe(took, model=m.name, reason=reason)
+            metrics.MODEL_RESIDENT.set(round(m.size_mb, 1), model=m.name)
+            if reason == "reload":
+                print(f"Model {m.name} reloaded in {took:.2f}s")
+
+    # ------------------------------------------------------------- eviction
+    def resident_mb(self):
+        return sum(m.size_mb for m in self._models.values() if m.obj is not None)
+
+    def _make_room(self, incoming):
+        if not self.budget_mb:
+            return
+        with self._lock:
+            idle = sorted((m for m in self._models.values()
+                           if m is not incoming and m.obj is not None and not m.in_use),
+                          key=lambda m: m.last_used)
+        for m in idle:                          # least recently used first
+            if self.resident_mb() + incoming.size_mb <= self.budget_mb:
+                break
+            self._evict(m, "budget")
+
+    def _evict(self, m, reason):
+        if not m.load_lock.acquire(blocking=False):     # being loaded right now: not idle
+            return False
+        try:
+            with self._lock:
+                if m.obj is None or m.in_use:
+                    return False
+                obj, m.obj = m.obj, None
+        finally:
+            m.load_lock.release()
+        if m._unload:
+            try:
+                m._unload(obj)
+            except Exception as e:
+                print(f"Model {m.name} unload hook failed:", e)
+        del obj
+        release_memory()
+        metrics.MODEL_EVICTIONS.inc(model=m.name, reason=reason)
+        metrics.MODEL_RESIDENT.set(0, model=m.name)
+        return True
+
+    def evict_idle(self, now=None):
+        if not self.idle_sec:
+            return []
+        now = now or time.monotonic()
+        with self._lock:
+            stale = [m for m in self._models.values()
+                     if m.obj is not None and not m.in_use and now - m.last_used >= self.idle_sec]
+        return [m.name for m in stale if self._evict(m, "idle")]
+
+    def _reap(self):
+        while True:
+            time.sleep(max(1.0, self.idle_sec / 4))
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print("Model reaper error:", e)
+
+    def start(self):
+        """Start the idle reaper (no-op without MODEL_IDLE_SEC)."""
+        if self.idle_sec and (self._thread is None or not self._thread.is_alive()):
+            self._thread = threading.Thread(target=self._reap, daemon=True, name="model-reaper")
+            self._thread.start()
+        return self
+
+    def load_all(self):
+        for name in self._models:
+            with self.use(name):
+                pass
@@ -0,0 +1 @@
+# Load-test and benchmark tooling for the backend (run from backend/, e.g. `python -m perf.loadtest`).
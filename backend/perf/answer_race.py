@@ -0,0 +1,85 @@
+# perf/answer_race.py
+# Concurrency check for answer persistence: fire parallel submitAnswer calls
+# at ONE interview (several per question) and verify the stored answers.
+#
+#   python -m perf.answer_race                                  # in-process, like perf.loadtest
+#   python -m perf.answer_race --base-url http://127.0.0.1:5000 --parallel 16
+#
+# Expected afterwards: exactly one answer per submitted questionIndex, every
+# answer carrying an assessment, and no other questionIndex present. Exits 1
+# otherwise. Against a remote server run it with ADMISSION=0 there, or the
+# per-user audio rate limit will refuse most of the burst.
+import os
+import sys
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from perf import fixtures
+from perf.loadtest import start_local_app, wait_for_job
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Parallel submitAnswer against one interview")
+    ap.add_argument("--base-url", help="target server; omit to run everything in-process")
+    ap.add_argument("--parallel", type=int, default=12, help="simultaneous submissions")
+    ap.add_argument("--questions", type=int, default=3, help="spread them over this many questionIndex values")
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--llm-latency-ms", type=float, default=200, help="fake Gemini latency (in-process only)")
+    ap.add_argument("--llm-error-rate", type=float, default=0.0)
+    args = ap.parse_args(argv)
+
+    if not args.base_url:
+        os.environ.setdefault("ADMISSION", "0")
+    base = (args.base_url or start_local_app(args)).rstrip("/")
+    http = requests.Session()
+    http.headers["Clerk-User-Email"] = "race@example.com"
+    wav = fixtures.make_wav(1.0)
+
+    queued = http.post(base + "/api/resume", timeout=args.timeout,
+                       files={"resumeFile": ("resume.pdf", fixtures.make_pdf(1), "application/pdf")},
+                       data={"jobDescription": "Backend engineer"})
+    queued.raise_for_status()
+    if wait_for_job(http, base, queued.json()["jobId"], args.timeout).get("status") != "done":
+        sys.exit("resume analysis job did not finish")
+
+    failures = 0
+    for rnd in range(args.rounds):
+        started = http.post(base + "/api/startInterview", timeout=args.timeout).json()
+        iid = started["interviewId"]
+        barrier = threading.Barrier(args.parallel)
+
+        def submit(i):
+            barrier.wait()
+            r = requests.post(base + "/api/submitAnswer", timeout=args.timeout,
+                              headers={"Clerk-User-Email": "race@example.com"},
+                              files={"audio": ("a.wav", wav, "audio/wav")},
+                              data={"interviewId": iid, "questionIndex": str(i % args.questions)})
+            return r.status_code
+
+        with ThreadPoolExecutor(args.parallel) as pool:
+            statuses = Counter(pool.map(submit, range(args.parallel)))
+
+        answers = http.post(base + "/api/getAssessment", json={"interviewId": iid},
+                            timeout=args.timeout).json().get("answers", [])
+        per_q    = Counter(a["questionIndex"] for a in answers)
+        expected = set(range(min(args.questions, args.parallel)))
+        problems = []
+        if set(per_q) != expected:
+            problems.append(f"question indexes {sorted(per_q)} != {sorted(expected)}")
+        problems += [f"q{q}: {n} answers" for q, n in sorted(per_q.items()) if n != 1]
+        problems += [f"q{a['questionIndex']}: no assessment" for a in answers if not a.get("assessment")]
+
+        print(f"round {rnd + 1}: statuses {dict(statuses)}, answers per question {dict(sorted(per_q.items()))}"
+              + ("  OK" if not problems else "  FAIL: " + "; ".join(problems)))
+        failures += bool(problems) or statuses.get(200, 0) != args.parallel
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
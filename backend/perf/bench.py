@@ -0,0 +1,186 @@
+# perf/bench.py
+# Micro-benchmarks for the backend's hot functions, compared against the
+# committed baseline in perf/bench_baseline.json.
+#
+#   python -m perf.bench                 # run all, flag regressions (exit 1)
+#   python -m perf.bench -k frame        # only benchmarks whose name contains "frame"
+#   python -m perf.bench --save          # re-record the baseline on this machine
+#
+# Everything runs offline: stub models, in-memory Mongo, generated fixtures.
+import os
+import gc
+import sys
+import json
+import atexit
+import time
+import random
+import argparse
+import platform
+import statistics
+import tempfile
+
+os.environ.setdefault("STUB_MODELS", "1")
+os.environ.setdefault("MONGO_URI", "mongomock://localhost")
+os.environ.setdefault("QUESTION_BANK_REFRESH_SEC", "0")
+
+from perf import fixtures
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "bench_baseline.json")
+BENCHMARKS    = {}
+
+
+def bench(name):
+    """Register a benchmark. The decorated function does the setup and returns the callable to time."""
+    def deco(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return deco
+
+
+# ---------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------
+@bench("speech_metrics_5k_segments")
+def _speech_metrics():
+    from app import compute_speech_metrics
+    rng = random.Random(1)
+    vocab = "so um I think the design uh used python like flask and mongo well actually we shipped".split()
+    segs, t = [], 0.0
+    for _ in range(5000):
+        segs.append({"start": t, "end": t + 2.5, "text": " ".join(rng.choice(vocab) for _ in range(8))})
+        t += 2.5
+    res = {"segments": segs}
+    return lambda: compute_speech_metrics(res)
+
+@bench("frame_decode_annotate_encode_640x480")
+def _frame_path():
+    from app import decode_frame, annotate_frame, encode_frame
+    data_url = fixtures.make_frame_data_url(640, 480)
+    region = {"x": 160, "y": 120, "w": 320, "h": 240}
+    def run():
+        img = decode_frame(data_url)
+        annotate_frame(img, region, "neutral")
+        return encode_frame(img)
+    return run
+
+@bench("emotion_aggregate_1800_snapshots")
+def _emotion_aggregate():
+    from app import aggregate_emotions
+    rng = random.Random(2)
+    emos = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+    timeline = [{"distribution": {e: rng.uniform(0, 100) for e in emos}} for _ in range(1800)]   # 1 h @ 2 s
+    return lambda: aggregate_emotions(timeline)
+
+def _pdf_file(pages):
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(fixtures.make_pdf(pages))
+    atexit.register(os.remove, path)
+    return path
+
+@bench("pdf_extract_200_pages_full")
+def _pdf_full():
+    from resume_text import extract_text_from_pdf
+    path = _pdf_file(200)
+    return lambda: extract_text_from_pdf(path, max_chars=10 ** 9, max_pages=10 ** 6)
+
+@bench("pdf_extract_200_pages_capped")
+def _pdf_capped():
+    from resume_text import extract_text_from_pdf
+    path = _pdf_file(200)
+    return lambda: extract_text_from_pdf(path)
+
+@bench("llm_output_fence_strip_and_parse")
+def _llm_parse():
+    from app import remove_code_fences, parse_json_obj
+    obj = {"rating": 4, "explanation": "x" * 2000, "ideal_answer": "y" * 2000,
+           "strengths": [f"point {i}" for i in range(5)], "improvements": [f"idea {i}" for i in range(5)]}
+    raw = "```json\n" + json.dumps(obj, indent=2) + "\n```"
+    arr = "```json\n" + json.dumps([f"How did you combine Python and Flask in project {i}?" for i in range(5)]) + "\n```"
+    def run():
+        parse_json_obj(remove_code_fences(raw))
+        json.loads(remove_code_fences(arr))
+    return run
+
+@bench("prompt_condense_single_line_20k_words")
+def _condense_single_line():
+    from prompt_budget import condense_resume, condense_job_description
+    rng = random.Random(3)
+    vocab = "python flask mongo react docker led team shipped api latency tests design".split()
+    text = " ".join(rng.choice(vocab) for _ in range(20000))    # pasted/extracted with no line breaks
+    if not condense_resume(text) or not condense_job_description(text):
+        raise AssertionError("single-line input condensed to nothing")
+    def run():
+        condense_resume(text)
+        condense_job_description(text)
+    return run
+
+
+# ---------------------------------------------------
+# Runner
+# ---------------------------------------------------
+def measure(fn, min_time=0.5, max_rounds=1000, warmup=1):
+    for _ in range(warmup):
+        fn()
+    gc.collect(); gc.disable()           # keep collector pauses out of the rounds
+    try:
+        times, start = [], time.perf_counter()
+        while len(times) < max_rounds and (len(times) < 5 or time.perf_counter() - start < min_time):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    return dict(rounds=len(times), min=min(times), median=statistics.median(times),
+                mean=statistics.fmean(times), stddev=statistics.pstdev(times))
+
+def load_baseline():
+    try:
+        with open(BASELINE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Backend micro-benchmarks")
+    ap.add_argument("-k", dest="pattern", default="", help="only run benchmarks containing this text")
+    ap.add_argument("--min-time", type=float, default=0.5, help="seconds per benchmark")
+    ap.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown of the best round vs baseline")
+    ap.add_argument("--save", action="store_true", help="write results as the new baseline")
+    args = ap.parse_args(argv)
+
+    baseline = load_baseline().get("benchmarks", {})
+    results, regressions = {}, []
+    # regressions are judged on the fastest round, which is far less noisy than the median
+    print(f"{'benchmark':<40}{'rounds':>7}{'median ms':>11}{'min ms':>9}{'base min':>10}{'change':>9}")
+    for name, setup in BENCHMARKS.items():
+        if args.pattern not in name:
+            continue
+        res = results[name] = measure(setup(), args.min_time)
+        base = baseline.get(name, {}).get("min")
+        change = (res["min"] / base - 1) if base else None
+        flag = ""
+        if change is not None and change > args.tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40}{res['rounds']:>7}{res['median'] * 1000:>11.3f}{res['min'] * 1000:>9.3f}"
+              f"{(base or 0) * 1000:>10.3f}{'' if change is None else f'{change:+.0%}':>9}{flag}")
+
+    if args.save:
+        data = load_baseline()
+        data.setdefault("benchmarks", {}).update(
+            {n: {k: round(v, 7) if isinstance(v, float) else v for k, v in r.items()} for n, r in results.items()})
+        data["machine"] = dict(python=platform.python_version(), platform=platform.platform(),
+                               processor=platform.processor() or platform.machine())
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
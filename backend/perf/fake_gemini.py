@@ -0,0 +1,92 @@
+# perf/fake_gemini.py
+# Minimal local stand-in for the Gemini REST generateContent endpoint.
+#
+#   python -m perf.fake_gemini --port 8765 --latency-ms 300 --error-rate 0.02
+#   GEMINI_BASE_URL=http://127.0.0.1:8765 python app.py
+#
+# Replies are canned per prompt type so every code path in app.py gets a
+# well-formed answer.
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SKILLS = ["Python", "Flask", "MongoDB", "React", "Docker", "AWS"]
+
+
+def canned_reply(prompt):
+    if '"full_name"' in prompt:
+        out = dict(full_name="Test Candidate", contact_details="test@example.com",
+                   professional_summary="Backend engineer.", relevant_experience="4 years of APIs.",
+                   key_skills="Languages: Python, JavaScript\nTools: Docker, AWS\n"
+                              "Technologies/Frameworks: Flask, React, MongoDB",
+                   certifications="None", industry_expertise="SaaS")
+        if "match_score" in prompt:
+            out.update(match_score=78, match_explanation="Good overlap.")
+        return "```json\n" + json.dumps(out) + "\n```"
+    if "SHORT bullet list" in prompt:
+        return "\n".join(f"- {s}" for s in SKILLS)
+    if "skill-based interview questions" in prompt:
+        n = int((re.search(r"exactly (\d+)", prompt) or [0, 2])[1])
+        qs = [f"How have you used {SKILLS[i % len(SKILLS)]} together with "
+              f"{SKILLS[(i + 1) % len(SKILLS)]} in a real project?" for i in range(n)]
+        return json.dumps(qs)
+    if "behavioural-interview assessor" in prompt:
+        return json.dumps({"rating": 4, "strengths": ["Clear structure"], "improvements": ["More metrics"]})
+    if "technical interviewer" in prompt:
+        return json.dumps({"rating": 4, "explanation": "Solid answer.", "ideal_answer": "Mention trade-offs."})
+    return "- Engaged and calm\n- Clear communication\n- Could add more detail"
+
+
+def make_handler(latency, jitter, error_rate):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, code, body):
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+            if random.random() < error_rate:
+                return self._send(503, {"error": {"code": 503, "message": "fake overload"}})
+            prompt = "".join(p.get("text", "") for c in body.get("contents", []) for p in c.get("parts", []))
+            self._send(200, {"candidates": [{"content": {"parts": [{"text": canned_reply(prompt)}]}}]})
+
+    return Handler
+
+
+def serve(host="127.0.0.1", port=0, latency_ms=200, jitter_ms=50, error_rate=0.0, background=True):
+    """Start the fake server; returns (server, base_url). port=0 picks a free port."""
+    server = ThreadingHTTPServer((host, port),
+                                 make_handler(latency_ms / 1000, jitter_ms / 1000, error_rate))
+    server.daemon_threads = True
+    url = f"http://{host}:{server.server_address[1]}"
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, url
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Fake Gemini generateContent server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=200)
+    ap.add_argument("--jitter-ms", type=float, default=50)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    a = ap.parse_args()
+    server, url = serve(a.host, a.port, a.latency_ms, a.jitter_ms, a.error_rate, background=False)
+    print(f"Fake Gemini listening on {url}")
+    server.serve_forever()
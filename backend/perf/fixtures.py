@@ -0,0 +1,74 @@
+# perf/fixtures.py
+# Generated inputs (PDF, WAV, JPEG frames) so perf tooling runs fully offline.
+import io
+import math
+import wave
+import base64
+import struct
+
+RESUME_LINES = [
+    "Test Candidate", "test@example.com | +1 555 0100",
+    "SUMMARY", "Backend engineer with four years of experience building APIs.",
+    "EXPERIENCE", "Built REST services in Python and Flask backed by MongoDB.",
+    "Deployed containerised workloads with Docker on AWS.",
+    "SKILLS", "Python, Flask, MongoDB, React, Docker, AWS",
+    "EDUCATION", "BSc Computer Science",
+]
+
+
+def _pdf_escape(s):
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf(pages=1, lines=RESUME_LINES, lines_per_page=40):
+    """Build a valid text PDF with `pages` pages (no external dependencies)."""
+    body = list(lines)
+    while len(body) < lines_per_page:
+        body += [f"Detail line {len(body)}: delivered features end to end with tests and reviews."]
+    objs = []   # 1-based object bodies
+    objs.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    page_ids = [4 + 2 * i for i in range(pages)]
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objs.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode())
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for p in range(pages):
+        text = [f"BT /F1 10 Tf 50 780 Td 12 TL"]
+        for ln in body[:lines_per_page]:
+            text.append(f"({_pdf_escape(ln)}) Tj T*")
+        text.append(f"(Page {p + 1} of {pages}) Tj ET")
+        stream = "\n".join(text).encode()
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                    f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_ids[p] + 1} 0 R >>".encode())
+        objs.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + obj + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref))
+    return out.getvalue()
+
+def make_wav(seconds=3.0, rate=16000, freq=220.0):
+    """Mono 16-bit sine tone."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1); w.setsampwidth(2); w.setframerate(rate)
+        n = int(seconds * rate)
+        w.writeframes(b"".join(struct.pack("<h", int(8000 * math.sin(2 * math.pi * freq * i / rate)))
+                               for i in range(n)))
+    return buf.getvalue()
+
+def make_frame_data_url(width=640, height=480, seed=0):
+    """JPEG webcam-sized frame as the data URL the frontend sends to /analyzeFrame."""
+    import cv2
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    cv2.circle(img, (width // 2, height // 2), min(width, height) // 4, (200, 180, 160), -1)
+    _, buf = cv2.imencode(".jpg", img)
+    return "data:image/jpeg;base64," + base64.b64encode(buf).decode()
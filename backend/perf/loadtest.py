@@ -0,0 +1,216 @@
+# perf/loadtest.py
+# End-to-end load test: synthetic interview sessions against the Flask app.
+#
+#   # fully local: stub models, in-memory Mongo, fake Gemini, app served in-process
+#   python -m perf.loadtest --sessions 20 --concurrency 10
+#
+#   # against an already running server (models/Mongo/LLM as that server is configured)
+#   python -m perf.loadtest --base-url http://127.0.0.1:5000 --sessions 50
+#
+# Each session: resume upload (+ poll the analysis job) -> start interview ->
+# for every question a frame every --frame-interval seconds (analyzeFrame +
+# logEmotion; with --adaptive-frames the server's nextIntervalMs instead) while
+# the answer is "spoken", then submitAnswer -> finalize -> getAnalysis -> getAssessment.
+# Reports per-endpoint p50/p95/p99 latency, error and shed (429/503) counts and throughput.
+import os
+import sys
+import time
+import json
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from perf import fixtures
+
+SOFT_SECTIONS = ["communication", "teamwork", "problemSolving", "adaptability", "leadership", "timeManagement"]
+
+
+# ---------------------------------------------------
+# Recording
+# ---------------------------------------------------
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)   # endpoint -> [seconds]
+        self.errors  = defaultdict(int)
+        self.shed    = defaultdict(int)    # 429/503 from admission control (also counted as errors)
+        self._lock   = threading.Lock()
+
+    def record(self, endpoint, seconds, ok, shed=False):
+        with self._lock:
+            self.samples[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+            if shed:
+                self.shed[endpoint] += 1
+
+def percentile(sorted_vals, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, int(round(pct / 100 * len(sorted_vals) + 0.5)) - 1))
+    return sorted_vals[k]
+
+def report(rec, elapsed, out=sys.stdout):
+    rows = []
+    for ep in sorted(rec.samples):
+        vals = sorted(rec.samples[ep])
+        rows.append(dict(endpoint=ep, count=len(vals), errors=rec.errors[ep], shed=rec.shed[ep],
+                         p50=percentile(vals, 50) * 1000, p95=percentile(vals, 95) * 1000,
+                         p99=percentile(vals, 99) * 1000, rps=len(vals) / elapsed if elapsed else 0))
+    total = sum(r["count"] for r in rows)
+    print(f"\n{'endpoint':<24}{'count':>7}{'errors':>8}{'shed':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}", file=out)
+    for r in rows:
+        print(f"{r['endpoint']:<24}{r['count']:>7}{r['errors']:>8}{r['shed']:>7}{r['p50']:>10.1f}{r['p95']:>10.1f}"
+              f"{r['p99']:>10.1f}{r['rps']:>9.2f}", file=out)
+    print(f"\n{total} requests in {elapsed:.1f}s -> {total / elapsed if elapsed else 0:.1f} req/s", file=out)
+    return rows
+
+
+def wait_for_job(http, base, job_id, timeout, poll=0.2):
+    """Poll /api/resume/jobs/<id> until done/failed -> last status (status "timeout" if it never finished)."""
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            job = http.get(f"{base}/api/resume/jobs/{job_id}", timeout=timeout).json()
+        except (requests.RequestException, ValueError):
+            job = {}
+        if job.get("status") in ("done", "failed"):
+            return job
+        time.sleep(poll)
+    return {"status": "timeout"}
+
+
+# ---------------------------------------------------
+# Session driver
+# ---------------------------------------------------
+class Session:
+    def __init__(self, base_url, rec, idx, args, resume_pdf, answer_wav, frame):
+        self.base  = base_url.rstrip("/")
+        self.rec   = rec
+        self.email = f"load{idx}@example.com"
+        self.args  = args
+        self.http  = requests.Session()
+        self.http.headers["Clerk-User-Email"] = self.email
+        self.resume_pdf, self.answer_wav, self.frame = resume_pdf, answer_wav, frame
+
+    def call(self, name, method, path, **kw):
+        t0 = time.perf_counter()
+        try:
+            r = self.http.request(method, self.base + path, timeout=self.args.timeout, **kw)
+            ok, shed = r.status_code < 400, r.status_code in (429, 503)
+            body = r.json() if "json" in r.headers.get("Content-Type", "") else {}
+        except (requests.RequestException, ValueError):
+            ok, shed, body = False, False, {}
+        self.rec.record(name, time.perf_counter() - t0, ok, shed)
+        return body if ok else None
+
+    def frame_loop(self, interview_id, stop):
+        while not stop.is_set():
+            res = self.call("analyzeFrame", "POST", "/analyzeFrame",
+                            json={"image": self.frame, "sessionId": interview_id})
+            if res and res.get("emotion_distribution"):
+                self.call("logEmotion", "POST", "/api/logEmotion",
+                          json={"interviewId": interview_id, "emotion_distribution": res["emotion_distribution"]})
+            interval = self.args.frame_interval
+            if self.args.adaptive_frames and res and res.get("nextIntervalMs"):
+                interval = res["nextIntervalMs"] / 1000
+            stop.wait(interval)
+
+    def run(self):
+        queued = self.call("resume", "POST", "/api/resume",
+                           files={"resumeFile": ("resume.pdf", self.resume_pdf, "application/pdf")},
+                           data={"jobDescription": "Backend engineer, Python/Flask/MongoDB"})
+        if not queued or not queued.get("jobId"):
+            return
+        t0 = time.perf_counter()
+        job = wait_for_job(self.http, self.base, queued["jobId"], self.args.timeout)
+        self.rec.record("resumeJob", time.perf_counter() - t0, job.get("status") == "done")
+        started = self.call("startInterview", "POST", "/api/startInterview")
+        if not started or not started.get("interviewId"):
+            return
+        iid = started["interviewId"]
+        n_q = min(len(started.get("questions", [])), self.args.questions or 99)
+
+        stop = threading.Event()
+        frames = threading.Thread(target=self.frame_loop, args=(iid, stop), daemon=True)
+        frames.start()
+        try:
+            for q in range(n_q):
+                time.sleep(self.args.answer_seconds)       # candidate speaking; frames keep flowing
+                self.call("submitAnswer", "POST", "/api/submitAnswer",
+                          files={"audio": ("answer.wav", self.answer_wav, "audio/wav")},
+                          data={"interviewId": iid, "questionIndex": str(q)})
+        finally:
+            stop.set()
+            frames.join()
+
+        self.call("finalizeInterview", "POST", "/api/finalizeInterview", json={"interviewId": iid})
+        self.call("getAnalysis", "POST", "/api/getAnalysis", json={"interviewId": iid})
+        self.call("getAssessment", "POST", "/api/getAssessment", json={"interviewId": iid})
+
+
+# ---------------------------------------------------
+# In-process target
+# ---------------------------------------------------
+def start_local_app(args):
+    """Fake Gemini + stub models + mongomock, app served by a threaded werkzeug server."""
+    from perf import fake_gemini
+    _, llm_url = fake_gemini.serve(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_latency_ms / 4,
+                                   error_rate=args.llm_error_rate)
+    os.environ.setdefault("STUB_MODELS", "1")
+    os.environ.setdefault("MONGO_URI", "mongomock://localhost")
+    os.environ["GEMINI_BASE_URL"] = llm_url
+    os.environ.setdefault("QUESTION_BANK_REFRESH_SEC", "0")
+
+    import app as backend
+    backend.db["softSkillQuestions"].insert_many(
+        [{"section": s, "questions": [f"Tell me about your {s} ({i})." for i in range(4)]} for s in SOFT_SECTIONS])
+    backend.start_background()
+
+    import logging
+    from werkzeug.serving import make_server
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="End-to-end interview load test")
+    ap.add_argument("--base-url", help="target server; omit to run everything in-process")
+    ap.add_argument("--sessions", type=int, default=10)
+    ap.add_argument("--concurrency", type=int, default=5)
+    ap.add_argument("--questions", type=int, default=0, help="answer at most N questions (0 = all)")
+    ap.add_argument("--frame-interval", type=float, default=2.0)
+    ap.add_argument("--adaptive-frames", action="store_true",
+                    help="follow the server's nextIntervalMs instead of --frame-interval")
+    ap.add_argument("--answer-seconds", type=float, default=4.0)
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--resume-pages", type=int, default=2)
+    ap.add_argument("--llm-latency-ms", type=float, default=300, help="fake Gemini latency (in-process only)")
+    ap.add_argument("--llm-error-rate", type=float, default=0.0)
+    ap.add_argument("--json", help="also write the per-endpoint table to this file")
+    args = ap.parse_args(argv)
+
+    base_url = args.base_url or start_local_app(args)
+    resume_pdf = fixtures.make_pdf(args.resume_pages)
+    answer_wav = fixtures.make_wav(2.0)
+    frame      = fixtures.make_frame_data_url()
+
+    rec = Recorder()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        sessions = [Session(base_url, rec, i, args, resume_pdf, answer_wav, frame) for i in range(args.sessions)]
+        for f in [pool.submit(s.run) for s in sessions]:
+            f.result()
+    rows = report(rec, time.perf_counter() - t0)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
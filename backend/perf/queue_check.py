@@ -0,0 +1,236 @@
+# perf/queue_check.py
+# Multi-worker check of the Mongo work queue (job_queue.py + worker.py).
+#
+#   # N worker processes against one local mongod (the real test)
+#   python -m perf.queue_check --mongo-uri mongodb://localhost:27017 --workers 4 --jobs 200
+#
+#   # no mongod at hand: worker threads over in-memory Mongo (functional smoke check only)
+#   python -m perf.queue_check --in-process --workers 4
+#
+# Enqueues synthetic jobs into separate collections (db "soft-skill-perf"):
+#   ok      run once and succeed
+#   flaky   fail on the first run, succeed on the retry
+#   crash   the worker dies mid-job on the first run; its lease expires and
+#           another worker finishes it (dead workers are restarted)
+#   poison  always fail -> dead-lettered after QUEUE_MAX_ATTEMPTS runs
+# and checks every job's final status and how many times each ran. Exits 1
+# on any mismatch. Every run is recorded with the worker that did it, so the
+# report also shows how the load spread over the workers.
+import os
+import sys
+import time
+import random
+import argparse
+import subprocess
+import threading
+from collections import Counter
+
+os.environ.setdefault("QUEUE_VISIBILITY_SEC", "1.5")
+os.environ.setdefault("QUEUE_RETRY_BASE_SEC", "0.1")
+os.environ.setdefault("QUEUE_MAX_ATTEMPTS", "3")
+
+import worker
+from job_queue import JobQueue, MAX_ATTEMPTS
+
+QUEUE   = "queuecheck"
+DB_NAME = "soft-skill-perf"
+EXPECTED_RUNS = {"ok": 1, "flaky": 2, "crash": 2, "poison": MAX_ATTEMPTS}
+EXPECTED_END  = {"ok": "done", "flaky": "done", "crash": "done", "poison": "dead"}
+
+runs = None          # collection: one doc per handler execution
+IN_PROCESS = False
+
+
+class SimulatedCrash(BaseException):
+    """Kills a worker thread without complete()/fail(), like a process dying mid-job."""
+
+
+def _record(kind, payload):
+    n = runs.count_documents({"job": payload["n"]})
+    runs.insert_one({"job": payload["n"], "kind": kind, "worker": threading.current_thread().name
+                     if IN_PROCESS else str(os.getpid())})
+    time.sleep(random.uniform(0.002, 0.02))
+    return n
+
+@worker.handler("qc_ok")
+def qc_ok(payload):
+    _record("ok", payload)
+    return {"n": payload["n"]}
+
+@worker.handler("qc_flaky")
+def qc_flaky(payload):
+    if _record("flaky", payload) == 0:
+        raise RuntimeError("flaky: first run fails")
+    return {"n": payload["n"]}
+
+@worker.handler("qc_crash")
+def qc_crash(payload):
+    if _record("crash", payload) == 0:
+        if IN_PROCESS:
+            raise SimulatedCrash()
+        os._exit(3)
+    return {"n": payload["n"]}
+
+@worker.handler("qc_poison")
+def qc_poison(payload):
+    _record("poison", payload)
+    raise ValueError("poison: always fails")
+
+
+def collections(db, wrap=lambda c: c):
+    return JobQueue(wrap(db["queueCheck"]), wrap(db["queueCheckDead"])), wrap(db["queueCheckRuns"])
+
+class SerializedCollection:
+    """mongomock runs find_one_and_update as separate find + update steps, so two
+    threads can lease the same job; mongod applies it atomically per document.
+    Serializing calls gives the in-process mode the server's guarantee."""
+    def __init__(self, coll, lock):
+        self._coll, self._lock = coll, lock
+
+    def __getattr__(self, name):
+        attr = getattr(self._coll, name)
+        if not callable(attr):
+            return attr
+        def call(*args, **kw):
+            with self._lock:
+                return attr(*args, **kw)
+        return call
+
+
+# ---------------------------------------------------
+# Workers: processes (real Mongo) or threads (mongomock)
+# ---------------------------------------------------
+def worker_process(mongo_uri):
+    global runs
+    from pymongo import MongoClient
+    queue, runs = collections(MongoClient(mongo_uri)[DB_NAME])
+    stop, threads = worker.run(queue, [QUEUE], concurrency=1)
+    for t in threads:
+        t.join()
+
+def spawn_process(mongo_uri):
+    return subprocess.Popen([sys.executable, "-m", "perf.queue_check", "--worker-process", "--mongo-uri", mongo_uri],
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class ThreadWorkers:
+    """worker.drain() threads over a shared in-memory Mongo; a crashed thread is replaced."""
+    def __init__(self, queue, n):
+        self.queue, self.stop, self.threads, self.spawned = queue, threading.Event(), [], 0
+        for _ in range(n):
+            self.spawn()
+
+    def spawn(self):
+        def guarded(name):
+            try:
+                worker.drain(self.queue, [QUEUE], name, self.stop)
+            except SimulatedCrash:
+                pass
+        self.spawned += 1
+        t = threading.Thread(target=guarded, args=(f"t{self.spawned}",), name=f"t{self.spawned}")
+        t.start()
+        self.threads.append(t)
+
+    def supervise(self):
+        for t in list(self.threads):
+            if not t.is_alive():
+                self.threads.remove(t)
+                self.spawn()
+
+    def shutdown(self):
+        self.stop.set()
+        for t in self.threads:
+            t.join()
+
+
+# ---------------------------------------------------
+# Check
+# ---------------------------------------------------
+def main(argv=None):
+    global runs, IN_PROCESS
+    ap = argparse.ArgumentParser(description="Multi-worker check of the Mongo work queue")
+    ap.add_argument("--mongo-uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    ap.add_argument("--in-process", action="store_true", help="threads + mongomock instead of processes + mongod")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--jobs", type=int, default=120, help="ok jobs; plus jobs/10 each of flaky, crash, poison")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--worker-process", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.worker_process:
+        return worker_process(args.mongo_uri)
+
+    IN_PROCESS = args.in_process
+    if IN_PROCESS:
+        import mongomock
+        db   = mongomock.MongoClient()[DB_NAME]
+        lock = threading.Lock()
+        queue, runs = collections(db, lambda c: SerializedCollection(c, lock))
+    else:
+        from pymongo import MongoClient
+        db = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=3000)[DB_NAME]
+        db.command("ping")
+        queue, runs = collections(db)
+    for coll in (queue.collection, queue.dead_letter, runs):
+        coll.drop()
+    queue.ensure_indexes()
+
+    extra = max(1, args.jobs // 10)
+    plan  = ["ok"] * args.jobs + ["flaky"] * extra + ["crash"] * extra + ["poison"] * extra
+    random.shuffle(plan)
+    ids = {queue.enqueue(QUEUE, "qc_" + kind, {"n": n}): (n, kind) for n, kind in enumerate(plan)}
+
+    t0 = time.perf_counter()
+    if IN_PROCESS:
+        pool = ThreadWorkers(queue, args.workers)
+    else:
+        procs = [spawn_process(args.mongo_uri) for _ in range(args.workers)]
+    restarts = 0
+    try:
+        while queue.collection.count_documents({"status": {"$in": ["queued", "leased"]}}):
+            if time.perf_counter() - t0 > args.timeout:
+                print("timed out with jobs still pending")
+                break
+            if IN_PROCESS:
+                before = pool.spawned
+                pool.supervise()
+                restarts += pool.spawned - before
+            else:
+                for i, p in enumerate(procs):
+                    if p.poll() is not None:            # crashed on purpose: start a replacement
+                        procs[i] = spawn_process(args.mongo_uri)
+                        restarts += 1
+            time.sleep(0.1)
+    finally:
+        elapsed = time.perf_counter() - t0
+        if IN_PROCESS:
+            pool.shutdown()
+        else:
+            for p in procs:
+                p.terminate()
+            for p in procs:
+                p.wait()
+
+    ran     = Counter(r["job"] for r in runs.find({}, {"job": 1}))
+    by_wkr  = Counter(r["worker"] for r in runs.find({}, {"worker": 1}))
+    dead    = {d["_id"] for d in queue.dead_letter.find({}, {"_id": 1})}
+    problems = []
+    for job in queue.collection.find({}, {"status": 1, "attempts": 1}):
+        n, kind = ids[job["_id"]]
+        if job["status"] != EXPECTED_END[kind]:
+            problems.append(f"{kind} #{n}: status {job['status']}")
+        if ran[n] != EXPECTED_RUNS[kind]:
+            problems.append(f"{kind} #{n}: ran {ran[n]}x, expected {EXPECTED_RUNS[kind]}")
+        if (kind == "poison") != (job["_id"] in dead):
+            problems.append(f"{kind} #{n}: dead-letter copy {'missing' if kind == 'poison' else 'unexpected'}")
+
+    print(f"{len(plan)} jobs, {args.workers} workers ({'threads' if IN_PROCESS else 'processes'}), "
+          f"{elapsed:.1f}s, {len(plan) / elapsed:.0f} jobs/s, {restarts} worker restarts")
+    print("runs per worker:", dict(sorted(by_wkr.items())))
+    for p in problems[:20]:
+        print("  FAIL", p)
+    print("OK" if not problems else f"FAIL ({len(problems)} problems)")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# perf/serve_bench.py
+# Compare the Flask dev server with serve.py: memory per process and req/s.
+#
+#   python -m perf.serve_bench                       # real models, MONGO_URI from env
+#   STUB_MODELS=1 MONGO_URI=mongomock:// python -m perf.serve_bench --workers 4
+#
+# Memory is read from /proc (Linux): RSS counts shared pages in every
+# process, PSS splits them between the processes sharing them, so the PSS
+# column shows what copy-on-write sharing actually saves.
+import os
+import sys
+import time
+import signal
+import argparse
+import threading
+import subprocess
+
+import requests
+
+from perf import fixtures
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _children(pid):
+    kids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            kids.append(int(entry))
+    return kids
+
+def process_tree(pid):
+    out, todo = [], [pid]
+    while todo:
+        p = todo.pop()
+        out.append(p)
+        todo.extend(_children(p))
+    return out
+
+def memory_kb(pid):
+    vals = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                k, _, rest = line.partition(":")
+                if k in ("Rss", "Pss"):
+                    vals[k] = int(rest.split()[0])
+    except OSError:
+        pass
+    return vals.get("Rss", 0), vals.get("Pss", 0)
+
+
+def wait_ready(url, timeout):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            if requests.get(url + "/metrics", timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+def drive(url, path, payload, concurrency, duration):
+    done, errors, lock = [0], [0], threading.Lock()
+    stop_at = time.time() + duration
+
+    def worker():
+        s = requests.Session()
+        while time.time() < stop_at:
+            try:
+                ok = s.post(url + path, json=payload, timeout=60).status_code < 400
+            except requests.RequestException:
+                ok = False
+            with lock:
+                done[0] += 1
+                errors[0] += 0 if ok else 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    t0 = time.time()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return done[0] / (time.time() - t0), errors[0]
+
+
+def run_one(label, cmd, env, port, args, payload):
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        if not wait_ready(url, args.startup_timeout):
+            print(f"{label}: did not become ready")
+            return
+        time.sleep(args.settle)
+        drive(url, args.path, payload, args.concurrency, 2)          # warm every worker
+        rps, errors = drive(url, args.path, payload, args.concurrency, args.duration)
+        procs = [(p, *memory_kb(p)) for p in process_tree(proc.pid)]
+        tot_rss = sum(r for _, r, _ in procs); tot_pss = sum(p for _, _, p in procs)
+        print(f"\n{label}: {len(procs)} process(es), {rps:.1f} req/s, {errors} errors")
+        for pid, rss, pss in procs:
+            print(f"  pid {pid:<8} RSS {rss / 1024:8.1f} MiB   PSS {pss / 1024:8.1f} MiB")
+        print(f"  total     RSS {tot_rss / 1024:8.1f} MiB   PSS {tot_pss / 1024:8.1f} MiB")
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(20)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Dev server vs preforked serve.py")
+    ap.add_argument("--workers", type=int, default=2)
+    ap.add_argument("--threads", type=int, default=4)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=15)
+    ap.add_argument("--path", default="/analyzeFrame")
+    ap.add_argument("--startup-timeout", type=float, default=300)
+    ap.add_argument("--settle", type=float, default=1.0)
+    args = ap.parse_args(argv)
+
+    payload = {"image": fixtures.make_frame_data_url()}
+    # admission control would rate-limit the single benchmark client; measure raw capacity
+    env = dict(os.environ, QUESTION_BANK_REFRESH_SEC=os.getenv("QUESTION_BANK_REFRESH_SEC", "0"),
+               ADMISSION=os.getenv("ADMISSION", "0"))
+
+    run_one("flask dev server (debug, reloader)",
+            [sys.executable, "-m", "flask", "--app", "app", "run", "--debug", "--port", "5101"],
+            env, 5101, args, payload)
+    run_one(f"serve.py ({args.workers} workers x {args.threads} threads)",
+            [sys.executable, "serve.py"],
+            dict(env, WEB_BIND="127.0.0.1:5102", WEB_WORKERS=str(args.workers), WEB_THREADS=str(args.threads)),
+            5102, args, payload)
+
+
+if __name__ == "__main__":
+    main()
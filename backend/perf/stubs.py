@@ -0,0 +1,51 @@
+# perf/stubs.py
+# Deterministic stand-ins for the heavy models, enabled with STUB_MODELS=1.
+# Each call sleeps for a fixed latency so load tests measure the web tier,
+# Mongo and the LLM path rather than the CPU speed of the test box.
+import os
+import time
+import types
+
+WHISPER_LATENCY  = float(os.getenv("STUB_WHISPER_MS", "800")) / 1000
+DEEPFACE_LATENCY = float(os.getenv("STUB_DEEPFACE_MS", "120")) / 1000
+
+EMOTIONS = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+
+STUB_TRANSCRIPT = ("So in my last project I used Python and Flask to build an API, "
+                   "um, and MongoDB for storage. Well, I led the team through a tight deadline "
+                   "and we shipped on time by splitting the work and communicating daily.")
+
+
+class FakeWhisperModel:
+    def transcribe(self, path, language=None, **kw):
+        time.sleep(WHISPER_LATENCY)
+        words = STUB_TRANSCRIPT.split()
+        half  = len(words) // 2
+        return {
+            "language": "en",
+            "text": STUB_TRANSCRIPT,
+            "segments": [
+                {"start": 0.0, "end": 6.0,  "text": " ".join(words[:half])},
+                {"start": 6.0, "end": 12.5, "text": " ".join(words[half:])},
+            ]
+        }
+
+whisper = types.SimpleNamespace(load_model=lambda name="base", **kw: FakeWhisperModel())
+
+
+class DeepFace:
+    _n = 0
+
+    @classmethod
+    def analyze(cls, img, actions=("emotion",), enforce_detection=False, **kw):
+        time.sleep(DEEPFACE_LATENCY)
+        cls._n += 1
+        # slowly rotating dominant emotion so aggregation has something to do
+        dominant = EMOTIONS[(cls._n // 5) % len(EMOTIONS)]
+        dist = {e: (55.0 if e == dominant else 45.0 / (len(EMOTIONS) - 1)) for e in EMOTIONS}
+        h, w = img.shape[:2] if hasattr(img, "shape") else (100, 100)
+        return [{
+            "dominant_emotion": dominant,
+            "emotion": dist,
+            "region": {"x": w // 4, "y": h // 4, "w": w // 2, "h": h // 2}
+        }]
@@ -0,0 +1,105 @@
+# profiling.py
+# Opt-in, request-scoped CPU + memory profiling for the heavy handlers.
+#
+# A request is profiled when either
+#   * it carries `X-Profile: <PROFILE_TOKEN>` (header mode is off unless PROFILE_TOKEN is set), or
+#   * its endpoint is sampled via PROFILE_SAMPLE_RATES, e.g. "analyze_frame=0.01,submit_answer=0.1,*=0"
+#
+# Each profiled request writes to PROFILE_DIR:
+#   <stamp>_<endpoint>.prof   raw cProfile stats (snakeviz / pstats)
+#   <stamp>_<endpoint>.txt    call tree (callees by cumulative time) + top allocation sites
+# Only one request is profiled at a time because tracemalloc is process-wide.
+import os
+import io
+import time
+import random
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from functools import wraps
+
+from flask import request
+
+PROFILE_DIR   = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+TOP_ALLOCS    = int(os.getenv("PROFILE_TOP_ALLOCS", "25"))
+TOP_FUNCS     = int(os.getenv("PROFILE_TOP_FUNCS", "40"))
+
+_busy = threading.Lock()
+
+
+def _parse_rates(spec):
+    rates = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, rate = part.partition("=")
+        try:
+            rates[name.strip()] = float(rate)
+        except ValueError:
+            print(f"Ignoring bad PROFILE_SAMPLE_RATES entry: {part}")
+    return rates
+
+SAMPLE_RATES = _parse_rates(os.getenv("PROFILE_SAMPLE_RATES", ""))
+
+
+def _wanted(endpoint):
+    if PROFILE_TOKEN and request.headers.get("X-Profile") == PROFILE_TOKEN:
+        return True
+    rate = SAMPLE_RATES.get(endpoint, SAMPLE_RATES.get("*", 0.0))
+    return rate > 0 and random.random() < rate
+
+def _write_report(endpoint, prof, before, after, elapsed):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+    base  = os.path.join(PROFILE_DIR, f"{stamp}_{endpoint}")
+    prof.dump_stats(base + ".prof")
+
+    out = io.StringIO()
+    out.write(f"{request.method} {request.path}  endpoint={endpoint}  wall={elapsed * 1000:.1f} ms\n\n")
+    stats = pstats.Stats(prof, stream=out).strip_dirs().sort_stats("cumulative")
+    out.write("=== CPU: top functions by cumulative time ===\n")
+    stats.print_stats(TOP_FUNCS)
+    out.write("=== CPU: call tree (callees) ===\n")
+    stats.print_callees(TOP_FUNCS)
+
+    out.write(f"=== Memory: top {TOP_ALLOCS} allocation sites during the request ===\n")
+    for diff in after.compare_to(before, "lineno")[:TOP_ALLOCS]:
+        out.write(f"{diff}\n")
+    current, peak = tracemalloc.get_traced_memory()
+    out.write(f"\ntraced current={current / 1024:.1f} KiB  peak={peak / 1024:.1f} KiB\n")
+
+    with open(base + ".txt", "w") as f:
+        f.write(out.getvalue())
+    return base
+
+
+def profiled(fn):
+    """Wrap a Flask view so sampled / flagged requests are profiled."""
+    endpoint = fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _wanted(endpoint) or not _busy.acquire(blocking=False):
+            return fn(*args, **kwargs)
+        try:
+            tracemalloc.start(10)
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            prof, t0 = cProfile.Profile(), time.perf_counter()
+            prof.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof.disable()
+                elapsed = time.perf_counter() - t0
+                after = tracemalloc.take_snapshot()
+                try:
+                    path = _write_report(endpoint, prof, before, after, elapsed)
+                    print(f"Profile written: {path}.txt")
+                except Exception as e:
+                    print("Profile write error:", e)
+                tracemalloc.stop()
+        finally:
+            _busy.release()
+
+    return wrapper
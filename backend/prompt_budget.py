@@ -0,0 +1,169 @@
+# prompt_budget.py
+# Local pre-processing that fits resume / job-description text into a token
+# budget before it is pasted into a Gemini prompt.
+#
+# The resume is split into sections by their headings, cleaned of boilerplate
+# and repeated lines, and then each section gets a share of the budget in the
+# order the resume prompt cares about (summary, experience, skills, ...).
+import os
+import re
+
+RESUME_TOKEN_BUDGET   = int(os.getenv("RESUME_TOKEN_BUDGET", "2500"))
+JOB_DESC_TOKEN_BUDGET = int(os.getenv("JOB_DESC_TOKEN_BUDGET", "800"))
+MIN_FRAGMENT_TOKENS   = 16      # a cut line shorter than this is not worth keeping (unless it is all we have)
+
+# section -> heading aliases (matched case-insensitively on a line of its own)
+SECTION_HEADINGS = {
+    "summary":        ["summary", "professional summary", "profile", "about me", "objective",
+                       "career objective", "professional profile"],
+    "experience":     ["experience", "work experience", "professional experience", "employment",
+                       "employment history", "work history", "internships", "internship"],
+    "skills":         ["skills", "technical skills", "key skills", "core competencies",
+                       "technologies", "tools", "tech stack", "competencies"],
+    "certifications": ["certifications", "certificates", "licenses", "courses", "training"],
+    "projects":       ["projects", "personal projects", "academic projects", "key projects"],
+    "education":      ["education", "academic background", "qualifications", "academics"],
+    "achievements":   ["achievements", "awards", "honors", "accomplishments", "publications"],
+    "other":          ["interests", "hobbies", "languages", "volunteering", "activities",
+                       "extracurricular activities", "personal details"],
+}
+
+# Order in which sections are funded; "header" is the text before the first
+# heading (name and contact details).
+RESUME_PRIORITY = ["header", "skills", "experience", "summary", "certifications",
+                   "projects", "education", "achievements", "other"]
+
+_HEADING_TO_SECTION = {alias: sec for sec, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+_BOILERPLATE = re.compile(
+    r"^(page \d+( of \d+)?|\d+\s*/\s*\d+|curriculum vitae|resume|r[ée]sum[ée]|"
+    r"references (are )?available (up)?on request\.?|references:? available.*)$",
+    re.IGNORECASE
+)
+_WS = re.compile(r"[ \t ]+")
+
+
+def estimate_tokens(text):
+    """Cheap local estimate (~4 chars or ~0.75 words per token, whichever is larger)."""
+    if not text:
+        return 0
+    return max(len(text) // 4, int(len(text.split()) * 1.33))
+
+def clean_lines(text):
+    """Collapse whitespace, drop boilerplate and repeated lines."""
+    seen, out = set(), []
+    for line in text.splitlines():
+        line = _WS.sub(" ", line).strip(" \t•·-–|")
+        if not line or _BOILERPLATE.match(line):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(line)
+    return out
+
+def _heading(line):
+    norm = re.sub(r"[^a-z ]", "", line.lower()).strip()
+    if len(norm) > 40:
+        return None
+    return _HEADING_TO_SECTION.get(norm)
+
+def segment_resume(text):
+    """Return [(section, [lines])] in document order."""
+    sections = [("header", [])]
+    for line in clean_lines(text):
+        sec = _heading(line)
+        if sec:
+            sections.append((sec, []))
+        else:
+            sections[-1][1].append(line)
+    return [(sec, lines) for sec, lines in sections if lines]
+
+def truncate_to_tokens(line, budget):
+    """Longest word prefix of `line` within `budget` tokens (a char cut when even one word is too long)."""
+    if budget <= 0:
+        return ""
+    chars = words = 0
+    for word in line.split(" ", budget + 1):    # a token holds at most one word; no need to split the rest
+        if max((chars + len(word)) // 4, int((words + 1) * 1.33)) > budget:
+            break
+        chars += len(word) + 1
+        words += 1
+    if words:
+        return line[:chars - 1]
+    return line[:budget * 4]
+
+def _take_lines(lines, budget):
+    """
+    Whole lines while they fit; the first line that does not is cut to what is left.
+    Returns (kept, used, cut) where `cut` says the last kept line is a fragment.
+    """
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            left = budget - used - 1
+            if left > 0 and (left >= MIN_FRAGMENT_TOKENS or not kept):
+                part = truncate_to_tokens(line, left)
+                if part:
+                    kept.append(part)
+                    return kept, used + estimate_tokens(part) + 1, True
+            break
+        kept.append(line)
+        used += cost
+    return kept, used, False
+
+def _heading_cost(sec):
+    return 0 if sec == "header" else estimate_tokens(f"{sec.upper()}:") + 1
+
+def fit_to_budget(text, budget, priority=RESUME_PRIORITY):
+    """
+    Condense resume text to roughly `budget` tokens.
+    Every section first gets an equal floor, then leftovers go to sections in
+    priority order; output keeps the original section order. Section headings
+    count against the budget.
+    """
+    lines = clean_lines(text)
+    if estimate_tokens("\n".join(lines)) <= budget:
+        return "\n".join(lines)
+
+    sections = segment_resume(text)
+    rank = {sec: i for i, sec in enumerate(priority)}
+    order = sorted(range(len(sections)), key=lambda i: (rank.get(sections[i][0], len(priority)), i))
+
+    floor = budget // max(len(sections), 1)
+    kept, cut, remaining = {}, {}, budget
+    for i in order:
+        head = _heading_cost(sections[i][0])
+        kept[i], used, cut[i] = _take_lines(sections[i][1], min(floor, remaining) - head)
+        if kept[i]:
+            remaining -= used + head
+    for i in order:
+        if remaining <= 0:
+            break
+        sec, body = sections[i]
+        start, head = len(kept[i]), 0 if kept[i] else _heading_cost(sec)
+        if cut[i]:
+            # hand the fragment back and re-take its line with the bigger allowance
+            start -= 1
+            remaining += estimate_tokens(kept[i].pop()) + 1
+        extra, used, cut[i] = _take_lines(body[start:], remaining - head)
+        if extra:
+            kept[i].extend(extra)
+            remaining -= used + head
+
+    out = []
+    for i, (sec, _) in enumerate(sections):
+        if kept[i]:
+            if sec != "header":
+                out.append(f"{sec.upper()}:")
+            out.extend(kept[i])
+    return "\n".join(out)
+
+def condense_resume(text, budget=RESUME_TOKEN_BUDGET):
+    return fit_to_budget(text, budget)
+
+def condense_job_description(text, budget=JOB_DESC_TOKEN_BUDGET):
+    kept, _, _ = _take_lines(clean_lines(text), budget)
+    return "\n".join(kept)
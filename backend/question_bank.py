@@ -0,0 +1,87 @@
+# question_bank.py
+# In-process, read-only copy of the softSkillQuestions collection.
+#
+# makedb.py bumps the version stamp in `softSkillMeta` every time it rewrites
+# the bank; a daemon thread polls that stamp and swaps in a fresh snapshot
+# only when it changes, so interview start never touches Mongo.
+import os
+import random
+import threading
+import time
+from types import MappingProxyType
+
+META_ID          = "questionBank"
+DEFAULT_ROLE     = "general"   # docs written before roles/locales existed count as general/en
+DEFAULT_LOCALE   = "en"
+REFRESH_INTERVAL = float(os.getenv("QUESTION_BANK_REFRESH_SEC", "30"))
+
+
+class QuestionBank:
+    def __init__(self, db, refresh_interval=REFRESH_INTERVAL):
+        self._questions = db["softSkillQuestions"]
+        self._meta      = db["softSkillMeta"]
+        self._interval  = refresh_interval
+        self._snapshot  = (None, MappingProxyType({}))   # (version, (section, role, locale) -> tuple)
+        self._lock      = threading.Lock()
+        self._thread    = None
+
+    # ------------------------------------------------------------------ load
+    def _current_version(self):
+        meta = self._meta.find_one({"_id": META_ID}, {"version": 1})
+        return (meta or {}).get("version", 0)
+
+    def load(self):
+        """Read the whole bank in one query and publish it as an immutable snapshot."""
+        version = self._current_version()
+        bank = {}
+        for doc in self._questions.find({}, {"section": 1, "role": 1, "locale": 1, "questions": 1}):
+            key = (doc["section"], doc.get("role") or DEFAULT_ROLE, doc.get("locale") or DEFAULT_LOCALE)
+            bank.setdefault(key, []).extend(q for q in doc.get("questions") or [] if q)
+        frozen = MappingProxyType({k: tuple(dict.fromkeys(qs)) for k, qs in bank.items() if qs})
+        with self._lock:
+            self._snapshot = (version, frozen)
+        return version
+
+    def refresh_if_stale(self):
+        if self._current_version() != self._snapshot[0]:
+            return self.load()
+        return self._snapshot[0]
+
+    def _poll(self):
+        while True:
+            time.sleep(self._interval)
+            try:
+                self.refresh_if_stale()
+            except Exception as e:
+                print("Question bank refresh error:", e)
+
+    def start(self):
+        """Load once and keep the snapshot fresh in the background."""
+        try:
+            self.load()
+        except Exception as e:
+            print("Question bank load error:", e)
+        if self._thread is None and self._interval > 0:
+            self._thread = threading.Thread(target=self._poll, name="question-bank", daemon=True)
+            self._thread.start()
+        return self
+
+    # ---------------------------------------------------------------- access
+    @property
+    def version(self):
+        return self._snapshot[0]
+
+    def pick(self, sections, role=DEFAULT_ROLE, locale=DEFAULT_LOCALE, rng=random):
+        """One random question per section; purely in-memory.
+
+        Falls back to the default role/locale when a section has no
+        questions for the requested ones.
+        """
+        bank = self._snapshot[1]
+        out = []
+        for section in sections:
+            qlist = (bank.get((section, role, locale))
+                     or bank.get((section, DEFAULT_ROLE, locale))
+                     or bank.get((section, DEFAULT_ROLE, DEFAULT_LOCALE)))
+            out.append(rng.choice(qlist) if qlist else f"[Missing question for {section}]")
+        return out
@@ -0,0 +1,85 @@
+# question_cache.py
+# Technical questions shared across candidates (collection `techQuestionCache`).
+#
+# A validated question names at least two of the candidate's skills, and it is
+# just as good for anyone else who lists the same two. So every question is
+# filed under each skill pair it mentions
+#   {_id: "flask|python", questions: [...], updated_at}
+# and a candidate's pool is the union over all pairs of their skill list, i.e.
+# Python + Flask + MongoDB also draws on what was generated for Flask + MongoDB.
+#
+#   cache = TechQuestionCache(db["techQuestionCache"])
+#   questions, thin = cache.sample(skills, count, exclude=seen)   # None on a miss
+#   cache.add(questions, skills)                                  # after a live generation
+#
+# `thin` means fewer than TECH_Q_CACHE_MIN_POOL unseen questions would be left
+# after this draw; the caller refills in the background then.
+import os
+import re
+import random
+from itertools import combinations
+from datetime import datetime
+
+import metrics
+
+ENABLED      = os.getenv("TECH_Q_CACHE","1") == "1"
+MAX_PER_PAIR = int(os.getenv("TECH_Q_CACHE_MAX_PER_PAIR","30"))   # newest kept
+MIN_POOL     = int(os.getenv("TECH_Q_CACHE_MIN_POOL","6"))
+
+
+def pair_key(a, b):
+    return "|".join(sorted((a.lower(), b.lower())))
+
+def mentioned(question, skills):
+    """Skills named in the question as whole words ("C" must not match "CSS")."""
+    q = str(question).lower()
+    return [sk for sk in skills
+            if re.search(r"(?<![\w+#])" + re.escape(sk.lower()) + r"(?![\w+#])", q)]
+
+
+class TechQuestionCache:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def pool(self, skills):
+        keys = [pair_key(a, b) for a, b in combinations(dict.fromkeys(skills), 2)]
+        if not keys:
+            return []
+        pool = {}
+        for doc in self.collection.find({"_id": {"$in": keys}}, {"questions": 1}):
+            pool.update(dict.fromkeys(doc.get("questions") or []))
+        return list(pool)
+
+    def sample(self, skills, count, exclude=()):
+        """-> (count questions this candidate hasn't had, thin) or (None, True) on a miss."""
+        if not ENABLED:
+            return None, False
+        unseen = [q for q in self.pool(skills) if q not in exclude]
+        if len(unseen) < count:
+            metrics.TECH_Q_CACHE.inc(result="miss")
+            return None, True
+        metrics.TECH_Q_CACHE.inc(result="hit")
+        return random.sample(unseen, count), len(unseen) - count < MIN_POOL
+
+    def add(self, questions, skills):
+        """File freshly generated questions under every skill pair they mention; returns how many were kept."""
+        if not ENABLED:
+            return 0
+        by_pair, kept = {}, 0
+        for q in questions:
+            names = mentioned(q, skills) if isinstance(q, str) else []
+            if len(names) < 2:          # error strings and unvalidated output stay out
+                continue
+            kept += 1
+            for a, b in combinations(names, 2):
+                by_pair.setdefault(pair_key(a, b), []).append(q)
+        if by_pair:
+            now = datetime.utcnow()
+            for key, qs in by_pair.items():      # dedup, newest last, capped
+                self.collection.update_one({"_id": key}, [{"$set": {"updated_at": now, "questions": {"$slice": [
+                    {"$concatArrays": [
+                        {"$filter": {"input": {"$ifNull": ["$questions", []]},
+                                     "cond": {"$not": [{"$in": ["$$this", qs]}]}}},
+                        {"$literal": qs}]},
+                    -MAX_PER_PAIR]}}}], upsert=True)
+        return kept
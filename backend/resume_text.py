@@ -0,0 +1,114 @@
+# resume_text.py
+# Bounded resume text extraction.
+#
+# Pages are read lazily and extraction stops as soon as enough text has been
+# collected for the prompt. Each extraction runs in its own short-lived child
+# process (`python -m resume_text`, which imports only this module) with a
+# hard timeout and an address-space cap, so a huge or malformed upload can't
+# pin a request thread. A timeout kills that one child, never another upload's.
+import os
+import sys
+import threading
+import subprocess
+
+import PyPDF2, docx2txt
+
+MAX_CHARS       = int(os.getenv("RESUME_MAX_CHARS", "20000"))
+MAX_PAGES       = int(os.getenv("RESUME_MAX_PAGES", "30"))
+EXTRACT_TIMEOUT = float(os.getenv("RESUME_EXTRACT_TIMEOUT", "15"))
+EXTRACT_MEM_MB  = int(os.getenv("RESUME_EXTRACT_MEM_MB", "512"))
+EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", "2"))
+
+
+class ResumeExtractionError(Exception):
+    pass
+
+
+# ---------------------------------------------------
+# Streaming readers
+# ---------------------------------------------------
+def iter_pdf_pages(pdf_path, max_pages=MAX_PAGES):
+    """Yield the text of each page, one page at a time."""
+    with open(pdf_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for i, page in enumerate(reader.pages):
+            if i >= max_pages:
+                break
+            yield page.extract_text() or ""
+
+def iter_docx_paragraphs(docx_path):
+    for para in docx2txt.process(docx_path).split("\n"):
+        yield para + "\n"
+
+def collect_text(chunks, max_chars=MAX_CHARS):
+    """Join chunks until max_chars is reached, then stop pulling from the iterator."""
+    parts, total = [], 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parts.append(chunk)
+        total += len(chunk)
+        if total >= max_chars:
+            break
+    return "".join(parts)[:max_chars].strip()
+
+def extract_text_from_pdf(pdf_path, max_chars=MAX_CHARS, max_pages=MAX_PAGES):
+    return collect_text(iter_pdf_pages(pdf_path, max_pages), max_chars)
+
+def extract_text_from_docx(docx_path, max_chars=MAX_CHARS):
+    return collect_text(iter_docx_paragraphs(docx_path), max_chars)
+
+EXTRACTORS = {"pdf": extract_text_from_pdf, "docx": extract_text_from_docx}
+
+# ---------------------------------------------------
+# Sandboxed child process
+# ---------------------------------------------------
+def _limit_memory(cap_mb):
+    """Cap the worker's address space at its current size + cap_mb (POSIX only)."""
+    try:
+        import resource
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        cap = current + cap_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (cap, cap))
+    except (ImportError, OSError, ValueError):
+        pass
+
+_slots = threading.BoundedSemaphore(EXTRACT_WORKERS)     # concurrent extraction children
+
+def extract_resume_text(path, ext, max_chars=MAX_CHARS, timeout=EXTRACT_TIMEOUT):
+    if ext not in EXTRACTORS:
+        raise ResumeExtractionError(f"Unsupported file type: {ext}")
+    # a fresh interpreter, not a fork of the web process (Mongo clients, torch and
+    # executor threads) and not a multiprocessing spawn (which re-imports __main__)
+    if not _slots.acquire(timeout=timeout):
+        raise ResumeExtractionError("Resume text extraction is busy, try again")
+    try:
+        proc = subprocess.run([sys.executable, "-m", "resume_text", path, ext, str(max_chars), str(EXTRACT_MEM_MB)],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise ResumeExtractionError(f"Resume text extraction timed out after {timeout:g}s")
+    finally:
+        _slots.release()
+    if proc.returncode == 0:
+        return proc.stdout.decode("utf-8")
+    error = proc.stderr.decode("utf-8", "replace").strip().splitlines()
+    if proc.returncode == 3:
+        raise ResumeExtractionError("Resume is too large to process")
+    raise ResumeExtractionError(f"Could not read resume: {error[-1] if error else 'extractor exited with ' + str(proc.returncode)}")
+
+
+def _main(argv):
+    path, ext, max_chars, cap_mb = argv
+    _limit_memory(int(cap_mb))
+    try:
+        text = EXTRACTORS[ext](path, max_chars=int(max_chars))
+    except MemoryError:
+        sys.exit(3)
+    except Exception as e:
+        sys.exit(f"{type(e).__name__}: {e}")
+    sys.stdout.buffer.write(text.encode("utf-8"))
+
+if __name__ == "__main__":
+    _main(sys.argv[1:])
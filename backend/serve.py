@@ -0,0 +1,114 @@
+# serve.py
+# Production entry point: gunicorn with a preloading master.
+#
+#   python serve.py
+#
+# The master imports app.py once (Whisper, DeepFace, Gemini client), warms
+# the models and freezes the GC heap, then forks the workers so the read-only
+# model weights are shared copy-on-write instead of loaded per worker.
+# Each worker reconnects to Mongo and restarts its background threads.
+#
+# Configuration (env):
+#   WEB_BIND              address to bind                (0.0.0.0:5000)
+#   WEB_WORKERS           worker processes               (2)
+#   WEB_THREADS           threads per worker             (4)
+#   WEB_TIMEOUT           hard worker timeout, seconds   (120)
+#   WEB_GRACEFUL_TIMEOUT  graceful shutdown, seconds     (30)
+#   WEB_MAX_REQUESTS      recycle a worker after N requests, 0 = never (0)
+#   WEB_TORCH_THREADS     torch intra-op threads per worker, 0 = leave default (1)
+#   METRICS_MULTIPROC_DIR where workers dump metrics for /metrics (fresh temp dir)
+#
+# Graceful restart: `kill -HUP <master pid>` re-forks workers from the
+# already-loaded master; `kill -TERM` drains in-flight requests and exits.
+#
+# /metrics: every worker has its own registry, so serve.py points
+# METRICS_MULTIPROC_DIR at a per-server directory (a fresh temp dir unless
+# set) and any worker's /metrics renders the sum over all workers, the
+# master's warm-up and exited workers (see metrics.py).
+import os
+import gc
+import glob
+import tempfile
+
+from gunicorn.app.base import BaseApplication
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, str(default)))
+
+
+class PreforkServer(BaseApplication):
+    def __init__(self, options=None):
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        import app as backend
+        try:
+            backend.warm_models()
+        except Exception as e:
+            print("Model warm-up failed:", e)
+        import metrics
+        if metrics.multiproc_dir():
+            metrics.write_snapshot("master", gauges=False)   # workers clear what they inherit
+        gc.collect()
+        gc.freeze()          # keep refcount/GC passes from touching (and copying) shared pages
+        return backend.app
+
+
+def post_fork(server, worker):
+    import app as backend
+    torch_threads = _env_int("WEB_TORCH_THREADS", 1)
+    if torch_threads:
+        try:
+            import torch
+            torch.set_num_threads(torch_threads)     # N workers x all cores oversubscribes the CPU
+        except ImportError:
+            pass
+    backend.on_fork_child()
+    import metrics
+    metrics.start_snapshots()
+
+
+def child_exit(server, worker):
+    import metrics
+    if metrics.multiproc_dir():
+        metrics.retire_worker(worker.pid)
+
+
+def metrics_dir():
+    """METRICS_MULTIPROC_DIR for this server, emptied of a previous run's snapshots."""
+    path = os.getenv("METRICS_MULTIPROC_DIR") or tempfile.mkdtemp(prefix="softskill-metrics-")
+    os.makedirs(path, exist_ok=True)
+    for old in glob.glob(os.path.join(path, "*.json")):
+        os.remove(old)
+    os.environ["METRICS_MULTIPROC_DIR"] = path
+    return path
+
+
+def options():
+    max_requests = _env_int("WEB_MAX_REQUESTS", 0)
+    return {
+        "bind":             os.getenv("WEB_BIND", "0.0.0.0:5000"),
+        "workers":          _env_int("WEB_WORKERS", 2),
+        "threads":          _env_int("WEB_THREADS", 4),
+        "worker_class":     "gthread",
+        "timeout":          _env_int("WEB_TIMEOUT", 120),
+        "graceful_timeout": _env_int("WEB_GRACEFUL_TIMEOUT", 30),
+        "max_requests":     max_requests,
+        "max_requests_jitter": max_requests // 10 if max_requests else 0,
+        "preload_app":      True,
+        "post_fork":        post_fork,
+        "child_exit":       child_exit,
+        "accesslog":        os.getenv("WEB_ACCESS_LOG") or None,
+    }
+
+
+if __name__ == "__main__":
+    metrics_dir()            # before app.py (and metrics) are imported by the master
+    PreforkServer(options()).run()
@@ -0,0 +1,132 @@
+# skill_taxonomy.py
+# Local skill extraction: the taxonomy in skill_taxonomy.txt (canonical
+# names + aliases) compiled into one Aho-Corasick automaton, so a resume's
+# key_skills text is scanned in a single pass, independent of taxonomy size.
+#
+#   local_summary(raw_skills) -> "- Python\n- Flask\n..." or None
+#
+# None means local coverage is too low (fewer than SKILL_TAXONOMY_MIN_SKILLS
+# skills found, or under SKILL_TAXONOMY_MIN_COVERAGE of the list items
+# recognised) and the caller should fall back to the LLM summary.
+#
+# Aliases marked with '~' in the taxonomy are ordinary words too ("Go",
+# "Make", "Spring"); they only count when their list item is at most
+# AMBIGUOUS_MAX_WORDS words long, i.e. when the item is a bare skill name.
+import os
+import re
+from collections import deque
+
+TAXONOMY_PATH       = os.getenv("SKILL_TAXONOMY_PATH",
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.txt"))
+MIN_COVERAGE        = float(os.getenv("SKILL_TAXONOMY_MIN_COVERAGE", "0.6"))
+MIN_SKILLS          = int(os.getenv("SKILL_TAXONOMY_MIN_SKILLS", "3"))
+MAX_SKILLS          = 10
+AMBIGUOUS_MAX_WORDS = 3
+
+_LABELS    = re.compile(r"(languages|tools|technologies/frameworks|technologies|frameworks|databases|"
+                        r"cloud|platforms|skills|other)\s*:", re.IGNORECASE)
+_SEPARATOR = re.compile(r"[,;\n•|()\[\]]|\s-\s|\band\b", re.IGNORECASE)
+
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    """-> [(alias, canonical, ambiguous)] with aliases lower-cased."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            names = [n.strip() for n in line.split("|") if n.strip()]
+            canonical = names[0].lstrip("~").strip()
+            for name in names:
+                ambiguous = name.startswith("~")
+                entries.append((name.lstrip("~").strip().lower(), canonical, ambiguous))
+    return entries
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over the aliases; leftmost-longest, word-bounded matches."""
+
+    def __init__(self, entries):
+        self._goto, self._fail, self._out = [{}], [0], [[]]
+        for alias, canonical, ambiguous in entries:
+            state = 0
+            for ch in alias:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({}); self._fail.append(0); self._out.append([])
+                state = nxt
+            self._out[state].append((len(alias), canonical, ambiguous))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    @staticmethod
+    def _bounded(text, start, end):
+        before = text[start - 1] if start else " "
+        after  = text[end] if end < len(text) else " "
+        return not before.isalnum() and not (after.isalnum() or after in "+#")
+
+    def matches(self, text):
+        """-> [(start, end, canonical, ambiguous)] non-overlapping, leftmost-longest."""
+        text, state, found = text.lower(), 0, []
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, canonical, ambiguous in out[state]:
+                start = i - length + 1
+                if self._bounded(text, start, i + 1):
+                    found.append((start, i + 1, canonical, ambiguous))
+        found.sort(key=lambda m: (m[0], m[0] - m[1]))
+        kept, last_end = [], -1
+        for m in found:
+            if m[0] >= last_end:
+                kept.append(m)
+                last_end = m[1]
+        return kept
+
+
+_matcher = None
+
+def matcher():
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
+
+
+def list_items(raw_skills):
+    """key_skills text -> individual list items, category labels removed."""
+    text = _LABELS.sub(",", raw_skills or "")
+    return [it.strip(" .*-\t") for it in _SEPARATOR.split(text) if it.strip(" .*-\t")]
+
+def extract(raw_skills):
+    """-> (canonical skills in order of appearance, coverage of the list items)."""
+    items = list_items(raw_skills)
+    skills, covered = [], 0
+    m = matcher()
+    for item in items:
+        short = len(item.split()) <= AMBIGUOUS_MAX_WORDS
+        hits = [canon for _, _, canon, ambiguous in m.matches(item) if short or not ambiguous]
+        covered += bool(hits)
+        skills.extend(hits)
+    return list(dict.fromkeys(skills)), (covered / len(items) if items else 0.0)
+
+def local_summary(raw_skills):
+    """Bullet list of up to 10 skills, or None when the taxonomy doesn't cover the text well enough."""
+    skills, coverage = extract(raw_skills)
+    if len(skills) < MIN_SKILLS or coverage < MIN_COVERAGE:
+        return None
+    return "\n".join(f"- {s}" for s in skills[:MAX_SKILLS])
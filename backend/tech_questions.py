@@ -0,0 +1,96 @@
+# tech_questions.py
+# Skill-based (technical) interview questions: prompt, validation, live
+# generation, and the speculative copy kept on the resume document.
+#
+# Right after a resume is analysed a background job generates the questions
+# and stores them on the resume doc:
+#   tech_questions: {questions, count, skills_hash, generated_at}
+# start_interview takes them when they are fresh (same skills summary, same
+# count, younger than TECH_QUESTIONS_MAX_AGE_SEC), consumes them and queues a
+# refill for the next interview; otherwise it generates live as before.
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+
+from analysis_core import remove_code_fences
+
+MAX_AGE_SEC = int(os.getenv("TECH_QUESTIONS_MAX_AGE_SEC", str(7 * 24 * 3600)))
+HEDGE_REQUESTS = int(os.getenv("TECH_QUESTIONS_HEDGE_REQUESTS", "2"))
+HEDGE_AFTER    = float(os.environ["TECH_QUESTIONS_HEDGE_AFTER_SEC"]) \
+    if os.getenv("TECH_QUESTIONS_HEDGE_AFTER_SEC") else None        # unset: the call's recent p90
+
+
+def skill_lines(skills_summary):
+    """Bullet list text -> up to 10 distinct skill names."""
+    lines = []
+    for ln in skills_summary.split("\n"):
+        sk = ln.strip("-").strip()
+        if sk:
+            lines.append(sk)
+    return list(dict.fromkeys(lines))[:10]
+
+def skills_hash(skills_summary):
+    return hashlib.sha1("\n".join(skill_lines(skills_summary)).lower().encode()).hexdigest()
+
+def tech_prompt(skills, count):
+    bullet_list = "\n".join([f"- {s}" for s in skills])
+    return f"""
+Below is the candidate's skill list (ignore any mention of lacking skill):
+{bullet_list}
+
+Generate exactly {count} skill-based interview questions.
+Each question must mention at least two distinct skill names from above
+and ask how the candidate has used them in real projects.
+
+Return only a valid JSON array of {count} strings, with no extra commentary or metadata.
+If you cannot comply, return "Unable to comply."
+"""
+
+def parse_json_arr(txt):
+    try:
+        arr = json.loads(txt)
+        if not isinstance(arr, list):
+            return [txt]
+        return arr
+    except ValueError:
+        return [txt]
+
+def skill_count_in_q(q, skills):
+    q_lower = str(q).lower()
+    return len({sk for sk in skills if sk.lower() in q_lower})
+
+def questions_ok(questions, skills):
+    """Every question references 2+ skill names."""
+    return all(skill_count_in_q(q, skills) >= 2 for q in questions)
+
+
+def generate(llm, skills_summary, count):
+    """Live generation, hedged: a second copy of the call starts when the first is
+    slow (LLM_HEDGE_PERCENTILE) or comes back failing questions_ok; the first copy
+    that passes wins."""
+    skills = skill_lines(skills_summary)
+    parse  = lambda txt: parse_json_arr(remove_code_fences(txt or "[]"))
+    try:
+        raw = llm.generate_hedged(tech_prompt(skills, count), validate=lambda txt: questions_ok(parse(txt), skills),
+                                  max_requests=HEDGE_REQUESTS, hedge_after=HEDGE_AFTER, label="tech_questions")
+    except Exception as e:
+        return [f"Error calling model: {e}"]
+    return parse(raw)
+
+
+# ---------------------------------------------------
+# Speculative copy on the resume document
+# ---------------------------------------------------
+def precomputed_doc(questions, skills_summary):
+    return dict(questions=questions, count=len(questions),
+                skills_hash=skills_hash(skills_summary), generated_at=datetime.utcnow())
+
+def fresh_precomputed(resume, skills_summary, count):
+    """The stored questions if they still match this skills summary and count, else None."""
+    tq = resume.get("tech_questions") or {}
+    if (tq.get("count") == count and tq.get("skills_hash") == skills_hash(skills_summary)
+            and tq.get("generated_at") and datetime.utcnow() - tq["generated_at"] < timedelta(seconds=MAX_AGE_SEC)
+            and questions_ok(tq.get("questions", []), skill_lines(skills_summary))):
+        return tq
+    return None
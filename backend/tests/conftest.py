@@ -0,0 +1,10 @@
+# Backend tests run offline: stub models, in-memory Mongo, no Gemini.
+import os
+import sys
+
+os.environ.setdefault("STUB_MODELS", "1")
+os.environ.setdefault("MONGO_URI", "mongomock://localhost")
+os.environ.setdefault("QUESTION_BANK_REFRESH_SEC", "0")
+os.environ.setdefault("GEMINI_API_KEY", "")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,50 @@
+# Barrier-synchronised submitAnswer burst at one interview (the in-process
+# version of perf/answer_race.py): every questionIndex ends up with exactly
+# one answer, and every answer with an assessment.
+import io
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+import admission
+from perf import fixtures
+
+EMAIL = "race@example.com"
+PARALLEL, QUESTIONS = 12, 3
+
+
+@pytest.fixture
+def app_module(monkeypatch):
+    monkeypatch.setattr(admission, "ENABLED", False)
+    import app
+    return app
+
+
+def test_parallel_submit_answer_keeps_one_answer_per_question(app_module):
+    iid = app_module.interviews_collection.insert_one({
+        "email": EMAIL,
+        "questions": [f"Question {i}?" for i in range(QUESTIONS)],
+        "answers": [], "version": 0, "emotionTimeline": [], "status": "in_progress",
+        "created_at": datetime.utcnow(), "technicalCount": QUESTIONS, "softSkillCount": 0,
+    }).inserted_id
+    wav = fixtures.make_wav(1.0)
+    barrier = threading.Barrier(PARALLEL)
+
+    def submit(i):
+        client = app_module.app.test_client()
+        barrier.wait()
+        return client.post("/api/submitAnswer", headers={"Clerk-User-Email": EMAIL},
+                           content_type="multipart/form-data",
+                           data={"interviewId": str(iid), "questionIndex": str(i % QUESTIONS),
+                                 "audio": (io.BytesIO(wav), "a.wav", "audio/wav")}).status_code
+
+    with ThreadPoolExecutor(PARALLEL) as pool:
+        statuses = Counter(pool.map(submit, range(PARALLEL)))
+    assert statuses == {200: PARALLEL}
+
+    answers = app_module.interviews_collection.find_one({"_id": iid})["answers"]
+    assert Counter(a["questionIndex"] for a in answers) == {q: 1 for q in range(QUESTIONS)}
+    assert all(a.get("assessment") for a in answers)
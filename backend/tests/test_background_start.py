@@ -0,0 +1,25 @@
+# app.py must not start threads at import: serve.py's master imports it and
+# forks, and threads don't survive fork(). A fresh interpreter is needed to
+# see the import on its own, since other tests import app into this one.
+import os
+import sys
+import subprocess
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import threading
+before = {t.name for t in threading.enumerate()}
+import app
+print(sorted({t.name for t in threading.enumerate()} - before))
+app.start_background()
+app.start_background()
+print(sorted({t.name for t in threading.enumerate()} - before))
+"""
+
+def test_threads_start_only_from_start_background():
+    env = dict(os.environ, MODEL_IDLE_SEC="30", QUESTION_BANK_REFRESH_SEC="5")
+    out = subprocess.run([sys.executable, "-c", SCRIPT], cwd=BACKEND, env=env,
+                         capture_output=True, text=True, timeout=120, check=True).stdout.splitlines()
+    assert out[-2] == "[]"
+    assert out[-1] == "['job-heartbeat', 'model-reaper', 'question-bank']"
@@ -0,0 +1,59 @@
+import time
+import threading
+
+import pytest
+
+import admission
+import frame_sampling
+from frame_sampling import FrameSampler, SATURATED_INTERVAL_MS
+
+STEADY = {"neutral": 90.0, "happy": 10.0}
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    g = admission.InferenceGate("deepface", slots=2, max_queue=4, budget_sec=30, service_sec=0.01)
+    monkeypatch.setattr(admission, "deepface_gate", g)
+    monkeypatch.setattr(admission, "ENABLED", True)
+    return g
+
+
+def fill(gate, running, waiting):
+    """Hold `running` slots and park `waiting` callers in the gate's queue."""
+    for _ in range(running):
+        gate.acquire()
+    waiters = [threading.Thread(target=gate.acquire) for _ in range(waiting)]
+    for t in waiters:
+        t.start()
+    while gate.waiting < waiting:
+        time.sleep(0.001)
+    return waiters
+
+def drain(gate, waiters, running):
+    for _ in range(running + len(waiters)):
+        gate.release(0.01)
+    for t in waiters:
+        t.join()
+
+
+def test_interval_grows_with_deepface_backlog(gate):
+    sampler = FrameSampler()
+    for _ in range(5):
+        idle = sampler.recommend("s", STEADY)
+    assert frame_sampling.deepface_load() == 0
+
+    waiters = fill(gate, running=2, waiting=1)
+    try:
+        assert sampler.recommend("s", STEADY) > idle
+    finally:
+        drain(gate, waiters, 2)
+
+def test_full_gate_recommends_saturated_interval(gate):
+    sampler = FrameSampler()
+    waiters = fill(gate, running=gate.slots, waiting=gate.max_queue)
+    try:
+        assert frame_sampling.deepface_load() == 1
+        assert sampler.recommend("s", STEADY) == SATURATED_INTERVAL_MS
+    finally:
+        drain(gate, waiters, gate.slots)
+    assert sampler.recommend("s", STEADY) < SATURATED_INTERVAL_MS
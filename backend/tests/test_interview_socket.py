@@ -0,0 +1,64 @@
+# /ws/interview/<id> authenticates like the HTTP routes: the Clerk-User-Email
+# header, or a one-time ticket from POST /api/interviewSocket.
+import json
+import asyncio
+from datetime import datetime
+
+import pytest
+from quart.testing import WebsocketResponseError
+
+import asgi_app
+
+OWNER, OTHER = "owner@example.com", "other@example.com"
+
+
+async def _interview(email):
+    res = await asgi_app.interviews_collection.insert_one({
+        "email": email, "questions": ["Q?"], "answers": [], "version": 0,
+        "emotionTimeline": [], "status": "in_progress", "created_at": datetime.utcnow()})
+    return str(res.inserted_id)
+
+async def _first_message(client, path, headers=None):
+    """-> (first message, or None when the server closed without one)"""
+    try:
+        async with client.websocket(path, headers=headers) as ws:
+            return json.loads(await ws.receive())
+    except WebsocketResponseError:
+        return None
+
+async def _ticket(client, email, iid):
+    resp = await client.post("/api/interviewSocket", headers={"Clerk-User-Email": email},
+                             json={"interviewId": iid})
+    return resp.status_code, await resp.get_json()
+
+
+def test_email_query_parameter_is_not_enough():
+    async def run():
+        client = asgi_app.aio.test_client()
+        iid = await _interview(OWNER)
+        msg = await _first_message(client, f"/ws/interview/{iid}?email={OWNER}")
+        assert msg == {"type": "error", "error": "Not authenticated"}
+    asyncio.run(run())
+
+def test_header_or_ticket_opens_the_socket_once():
+    async def run():
+        client = asgi_app.aio.test_client()
+        iid = await _interview(OWNER)
+        assert (await _first_message(client, f"/ws/interview/{iid}",
+                                     headers={"Clerk-User-Email": OWNER}))["type"] == "ready"
+
+        status, body = await _ticket(client, OWNER, iid)
+        assert status == 200
+        assert (await _first_message(client, body["url"]))["type"] == "ready"
+        assert (await _first_message(client, body["url"]))["error"] == "Not authenticated"
+    asyncio.run(run())
+
+def test_no_ticket_for_someone_elses_interview():
+    async def run():
+        client = asgi_app.aio.test_client()
+        iid = await _interview(OWNER)
+        status, _ = await _ticket(client, OTHER, iid)
+        assert status == 404
+        assert (await _first_message(client, f"/ws/interview/{iid}",
+                                     headers={"Clerk-User-Email": OTHER}))["error"] == "Interview not found"
+    asyncio.run(run())
@@ -0,0 +1,33 @@
+import prompt_budget
+from prompt_budget import estimate_tokens, fit_to_budget, truncate_to_tokens, condense_job_description
+
+LONG = " ".join(f"word{i}" for i in range(2000))
+RESUME = "\n".join([
+    "Jane Doe",
+    "EXPERIENCE", LONG,
+    "SKILLS", "python go sql kubernetes",
+    "EDUCATION", "BSc Computer Science",
+    "PROJECTS", LONG,
+])
+
+def test_non_positive_budget_keeps_nothing():
+    assert truncate_to_tokens(LONG, 0) == ""
+    assert truncate_to_tokens(LONG, -5) == ""
+    assert condense_job_description(LONG, 0) == ""
+    assert fit_to_budget(RESUME, 0) == ""
+
+def test_output_including_headings_fits_budget():
+    for budget in (10, 40, 120, 400, 1200):
+        assert estimate_tokens(fit_to_budget(RESUME, budget)) <= budget
+
+def test_cut_line_gets_leftovers_back():
+    out = fit_to_budget(RESUME, 800).split("\n")
+    experience = out[out.index("EXPERIENCE:") + 1]
+    # far more than the equal floor (800 // 5 tokens) once the short sections leave budget over
+    assert estimate_tokens(experience) > 800 // 5 * 2
+    assert LONG.startswith(experience)
+
+def test_section_headings_are_charged():
+    out = fit_to_budget(RESUME, 60)
+    assert estimate_tokens(out) <= 60
+    assert prompt_budget._heading_cost("skills") == estimate_tokens("SKILLS:") + 1
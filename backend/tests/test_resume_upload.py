@@ -0,0 +1,21 @@
+import io
+import os
+
+from perf import fixtures
+
+
+def test_resume_temp_file_removed_when_job_submit_fails(monkeypatch):
+    import app
+    saved = []
+
+    def broken_submit(email, kind, fn, *args):
+        saved.append(args[1])
+        raise RuntimeError("jobs collection unavailable")
+
+    monkeypatch.setattr(app.jobs, "submit", broken_submit)
+    resp = app.app.test_client().post("/api/resume", headers={"Clerk-User-Email": "up@example.com"},
+                                      content_type="multipart/form-data",
+                                      data={"resumeFile": (io.BytesIO(fixtures.make_pdf(1)), "cv.pdf"),
+                                            "jobDescription": "Backend engineer"})
+    assert resp.status_code == 500
+    assert saved and not os.path.exists(saved[0])
@@ -0,0 +1,160 @@
+# worker.py
+# Inference worker: drains the Mongo work queue (job_queue.py) so Whisper,
+# DeepFace and Gemini assessments scale apart from the web tier.
+#
+#   python worker.py                                   # all queues, 1 job at a time
+#   python worker.py --queues transcription --concurrency 2 --metrics-port 9101
+#
+# Run as many as you like, on any node that reaches the same Mongo. Web nodes
+# hand work over with INFERENCE_QUEUE=1 (see app.offload). The worker imports
+# app.py for the models and helpers and runs them locally (INFERENCE_QUEUE is
+# forced off here). It has no HTTP routes of its own apart from the optional
+# /metrics port.
+#
+# A job's lease is extended every QUEUE_VISIBILITY_SEC/3 while its handler
+# runs. SIGTERM/SIGINT finishes the jobs in hand and exits.
+import os
+import sys
+import time
+import signal
+import socket
+import argparse
+import threading
+import traceback
+
+os.environ["INFERENCE_QUEUE"] = "0"          # workers run the models themselves
+
+import metrics
+from job_queue import JobQueue, VISIBILITY_SEC
+
+QUEUES   = ["transcription", "frames", "llm"]
+HANDLERS = {}                                 # kind -> fn(payload) -> JSON/BSON-able result
+IDLE_POLL_MAX = float(os.getenv("WORKER_IDLE_POLL_MAX_SEC","0.2"))   # bounds pickup delay when idle
+
+
+def handler(kind):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+def _backend():
+    import app as backend                     # heavy: models, Mongo; only on the first real job
+    backend.models.start()                    # idle reaper; app.py starts no threads at import
+    return backend
+
+@handler("transcribe")
+def transcribe(payload):
+    import tempfile
+    with tempfile.NamedTemporaryFile(suffix=payload.get("suffix", ".wav")) as tmp:
+        tmp.write(payload["audio"])
+        tmp.flush()
+        lang, transcript, speech = _backend().transcribe_audio(tmp.name)
+    return dict(language=lang, transcript=transcript, metrics=speech)
+
+@handler("emotion")
+def emotion(payload):
+    backend = _backend()
+    img = backend.decode_jpeg(payload["jpeg"])
+    if img is None:
+        raise ValueError("Invalid image data")
+    dominant, distribution, region = backend.detect_emotion(img)
+    return dict(dominant=dominant, distribution=distribution,
+                region={k: int(v) for k, v in (region or {}).items() if isinstance(v, (int, float))})
+
+@handler("assess")
+def assess(payload):
+    return _backend().llm_assessment(payload["question"], payload["transcript"], payload["is_soft"])
+
+
+# ---------------------------------------------------
+# Worker loop
+# ---------------------------------------------------
+def process(queue, job):
+    fn, kind = HANDLERS.get(job["kind"]), job["kind"]
+    if fn is None:
+        outcome = queue.fail(job, f"No handler for job kind {kind!r}", retry=False)
+        return metrics.QUEUE_JOBS.inc(queue=job["queue"], kind=kind, outcome=outcome)
+
+    done = threading.Event()
+    def keep_lease():
+        while not done.wait(VISIBILITY_SEC / 3):
+            if not queue.heartbeat(job):
+                return
+    threading.Thread(target=keep_lease, daemon=True).start()
+    try:
+        result  = fn(job["payload"])
+        outcome = "done" if queue.complete(job, result) else "lost"
+    except Exception as e:
+        traceback.print_exc()
+        outcome = queue.fail(job, f"{type(e).__name__}: {e}")
+    finally:
+        done.set()
+    metrics.QUEUE_JOBS.inc(queue=job["queue"], kind=kind, outcome=outcome)
+
+def drain(queue, queues, worker_id, stop, idle_poll=0.02, max_idle_poll=IDLE_POLL_MAX):
+    poll = idle_poll
+    while not stop.is_set():
+        job = queue.lease(queues, worker_id)
+        if job is None:
+            stop.wait(poll)
+            poll = min(poll * 2, max_idle_poll)
+            continue
+        poll = idle_poll
+        metrics.QUEUE_WAIT.observe((job["leased_at"] - job["created_at"]).total_seconds(), queue=job["queue"])
+        process(queue, job)
+
+def run(queue, queues=QUEUES, concurrency=1, stop=None, name=None):
+    """Drain `queues` with `concurrency` threads until `stop` is set."""
+    stop = stop or threading.Event()
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    threads = [threading.Thread(target=drain, args=(queue, queues, f"{name}/{i}", stop), name=f"worker-{i}")
+               for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    return stop, threads
+
+def serve_metrics(port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    class Metrics(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = metrics.REGISTRY.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", metrics.CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args):
+            pass
+    server = ThreadingHTTPServer(("0.0.0.0", port), Metrics)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def connect_queue():
+    mongo_uri = os.getenv("MONGO_URI","mongodb://localhost:27017")
+    if mongo_uri.startswith("mongomock://"):
+        sys.exit("worker.py needs a real Mongo shared with the web tier (MONGO_URI)")
+    from pymongo import MongoClient
+    db = MongoClient(mongo_uri)["soft-skill"]
+    return JobQueue(db["workQueue"], db["workQueueDead"]).ensure_indexes()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Inference worker for the Mongo work queue")
+    ap.add_argument("--queues", default=",".join(QUEUES), help="comma-separated queues to drain")
+    ap.add_argument("--concurrency", type=int, default=int(os.getenv("WORKER_CONCURRENCY","1")))
+    ap.add_argument("--metrics-port", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    queue = connect_queue()
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    stop, threads = run(queue, args.queues.split(","), args.concurrency)
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    print(f"Worker draining {args.queues} with {args.concurrency} thread(s)")
+    while any(t.is_alive() for t in threads):
+        time.sleep(0.5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+// src/idempotentPost.js
+// POST with an Idempotency-Key header, retried on network errors and 5xx/409.
+// The backend replays the stored result for a key it has already seen (or
+// waits for the in-flight request), so a retry never re-runs Whisper/Gemini
+// or stores a duplicate answer/resume.
+const newKey = () =>
+  (window.crypto && window.crypto.randomUUID)
+    ? window.crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
+export async function idempotentPost(url, { headers = {}, body }, attempts = 3) {
+  const key = newKey();
+  let lastError;
+  for (let i = 0; i < attempts; i++) {
+    try {
+      const res = await fetch(url, {
+        method: "POST",
+        headers: { ...headers, "Idempotency-Key": key },
+        body
+      });
+      if (res.status < 500 && res.status !== 409) return res;
+      lastError = new Error(`HTTP ${res.status}`);
+      if (i === attempts - 1) return res;
+      const retryAfter = Number(res.headers.get("Retry-After")) || 1;
+      await new Promise(r => setTimeout(r, retryAfter * 1000));
+    } catch (e) {
+      lastError = e;                      // network error / timeout: same key, try again
+      await new Promise(r => setTimeout(r, 1000 * (i + 1)));
+    }
+  }
+  throw lastError;
+}
@@ -0,0 +1,109 @@
+// src/interviewSocket.js
+// The interview WebSocket (backend/asgi_app.py, section 12): frames and answer
+// audio go up one connection and emotion results and assessments come back on
+// it, so the server writes the emotion timeline itself. Only the ASGI server
+// has it; openInterviewSocket resolves to null otherwise and the pages keep
+// using /analyzeFrame, /api/logEmotion and /api/submitAnswer.
+const API = "http://localhost:5000";
+const FRAME = 0x01, AUDIO = 0x02;
+const CHUNK = 64 * 1024;
+
+const tagged = (kind, bytes) => {
+  const msg = new Uint8Array(bytes.length + 1);
+  msg[0] = kind;
+  msg.set(bytes, 1);
+  return msg;
+};
+
+// Browsers cannot set Clerk-User-Email on a WebSocket, so trade it for a
+// one-time ticket over HTTP first.
+export async function openInterviewSocket(interviewId, email) {
+  let ticket;
+  try {
+    const res = await fetch(`${API}/api/interviewSocket`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json", "Clerk-User-Email": email },
+      body: JSON.stringify({ interviewId })
+    });
+    if (!res.ok) return null;
+    ticket = await res.json();
+  } catch (e) {
+    return null;
+  }
+  const ws = new WebSocket(API.replace(/^http/, "ws") + ticket.url);
+  const ready = await new Promise(resolve => {
+    ws.onmessage = (e) => resolve(JSON.parse(e.data).type === "ready");
+    ws.onerror = ws.onclose = () => resolve(false);
+  });
+  if (!ready) {
+    ws.close();
+    return null;
+  }
+  return new InterviewSocket(ws);
+}
+
+class InterviewSocket {
+  constructor(ws) {
+    this.ws = ws;
+    this.frameWaiter = null;       // reply to the one frame in flight
+    this.answerWaiters = {};       // questionIndex -> resolve
+    this.onAssessment = null;      // Gemini's assessment replacing a provisional one
+    ws.onmessage = (e) => this.dispatch(JSON.parse(e.data));
+    ws.onerror = ws.onclose = () => this.fail("Connection closed");
+  }
+
+  get open() {
+    return this.ws.readyState === WebSocket.OPEN;
+  }
+
+  close() {
+    this.ws.close();
+  }
+
+  dispatch(msg) {
+    if (msg.type === "assessment") {
+      if (this.onAssessment) this.onAssessment(msg);
+    } else if (msg.type === "answer" || msg.questionIndex !== undefined) {
+      const done = this.answerWaiters[msg.questionIndex];
+      delete this.answerWaiters[msg.questionIndex];
+      if (done) done(msg);
+    } else if (this.frameWaiter && msg.type !== "pong") {
+      const done = this.frameWaiter;
+      this.frameWaiter = null;
+      done(msg);
+    }
+  }
+
+  fail(error) {
+    if (this.frameWaiter) this.frameWaiter({ type: "error", error });
+    Object.values(this.answerWaiters).forEach(done => done({ type: "error", error }));
+    this.frameWaiter = null;
+    this.answerWaiters = {};
+  }
+
+  // -> same shape as the /analyzeFrame response (without the annotated image)
+  async sendFrame(jpegBlob) {
+    const bytes = new Uint8Array(await jpegBlob.arrayBuffer());
+    const msg = await new Promise(resolve => {
+      this.frameWaiter = resolve;
+      this.ws.send(tagged(FRAME, bytes));
+    });
+    return msg.type === "emotion" ? msg : { error: msg.error, retryAfter: msg.retryAfter };
+  }
+
+  // -> same shape as the /api/submitAnswer response
+  async sendAnswer(questionIndex, audioBlob, format) {
+    const audio = new Uint8Array(await audioBlob.arrayBuffer());
+    const msg = await new Promise(resolve => {
+      this.answerWaiters[questionIndex] = resolve;
+      this.ws.send(JSON.stringify({ type: "answer_start", questionIndex, format }));
+      for (let i = 0; i < audio.length; i += CHUNK) {
+        this.ws.send(tagged(AUDIO, audio.subarray(i, i + CHUNK)));
+      }
+      this.ws.send(JSON.stringify({ type: "answer_end" }));
+    });
+    return msg.type === "answer"
+      ? { message: "Answer submitted", metrics: msg.metrics, assessment: msg.assessment }
+      : { error: msg.error, retryAfter: msg.retryAfter };
+  }
+}
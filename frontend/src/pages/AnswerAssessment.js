@@ -76,6 +76,7 @@ function AnswerAssessment() {
                     </p>
                     <p style={styles.answerLine}>
                       <strong>Rating:</strong> {a.rating ?? "N/A"}
+                      {a.provisional && " (provisional)"}
                     </p>
 
                     {isSoft ? (
@@ -1,9 +1,43 @@
 // src/pages/Dashboard.js
-import React from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
+import { useUser } from '@clerk/clerk-react';
+
+const HISTORY_PAGE_SIZE = 10;
 
 function Dashboard() {
   const navigate = useNavigate();
+  const { user } = useUser();
+  const email = user?.primaryEmailAddress?.emailAddress;
+
+  // interview history: one summary page per request, "Load more" follows nextCursor
+  const [history, setHistory] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingHistory, setLoadingHistory] = useState(false);
+
+  const loadHistory = useCallback(async (cursor) => {
+    if (!email) return;
+    setLoadingHistory(true);
+    try {
+      const params = new URLSearchParams({ limit: HISTORY_PAGE_SIZE });
+      if (cursor) params.set('cursor', cursor);
+      const res = await fetch(`http://localhost:5000/api/interviews?${params}`, {
+        headers: { 'Clerk-User-Email': email }
+      });
+      const data = await res.json();
+      if (data.error) throw new Error(data.error);
+      setHistory(prev => (cursor ? [...prev, ...data.interviews] : data.interviews));
+      setNextCursor(data.nextCursor);
+    } catch (err) {
+      console.error('History error:', err);
+    } finally {
+      setLoadingHistory(false);
+    }
+  }, [email]);
+
+  useEffect(() => {
+    loadHistory(null);
+  }, [loadHistory]);
 
   const handleStartInterview = () => {
     navigate('/resume');
@@ -100,6 +134,43 @@ function Dashboard() {
         </div>
       </section>
 
+      {email && history.length > 0 && (
+        <div style={{ maxWidth: '700px', margin: '2rem auto 0 auto', padding: '0 1rem', color: '#333' }}>
+          <h2 style={{ marginBottom: '1rem', fontWeight: 600, textAlign: 'center' }}>Your Interviews</h2>
+          {history.map(iv => (
+            <div
+              key={iv.interviewId}
+              onClick={() => navigate('/answerAssessment', { state: { interviewId: iv.interviewId } })}
+              style={{
+                display: 'flex',
+                justifyContent: 'space-between',
+                padding: '0.75rem 1rem',
+                marginBottom: '0.5rem',
+                borderRadius: '4px',
+                boxShadow: '0 1px 4px rgba(0,0,0,0.1)',
+                cursor: 'pointer'
+              }}
+            >
+              <span>{new Date(iv.created_at).toLocaleString()}</span>
+              <span>{iv.status === 'completed' ? 'Completed' : 'In progress'}</span>
+              <span>{iv.answerCount}/{iv.questionCount} answered</span>
+              <span>{iv.avgRating != null ? `Avg rating ${iv.avgRating}` : 'Not rated'}</span>
+            </div>
+          ))}
+          {nextCursor && (
+            <div style={{ textAlign: 'center', marginTop: '1rem' }}>
+              <button
+                style={{ ...docButtonStyle, border: '1px solid #6454F0' }}
+                onClick={() => loadHistory(nextCursor)}
+                disabled={loadingHistory}
+              >
+                {loadingHistory ? 'Loading…' : 'Load more'}
+              </button>
+            </div>
+          )}
+        </div>
+      )}
+
       {/* Additional info or features could go below */}
       <div style={{ textAlign: 'center', padding: '2rem', fontSize: '1rem', color: '#333' }}>
         <h2 style={{ marginBottom: '1rem', fontWeight: 600 }}>Why Choose Our Platform?</h2>
@@ -1,6 +1,8 @@
 import React, { useState, useRef, useEffect } from "react";
 import { useUser } from "@clerk/clerk-react";
 import { useNavigate } from "react-router-dom";
+import { idempotentPost } from "../idempotentPost";
+import { openInterviewSocket } from "../interviewSocket";
 
 function Interview() {
   const navigate = useNavigate();
@@ -8,6 +10,8 @@ function Interview() {
 
   const videoRef = useRef(null);
   const captureIntervalRef = useRef(null);
+  const capturingRef = useRef(false);
+  const socketRef = useRef(null);     // interview WebSocket, when the server has one
 
   const [stream, setStream] = useState(null);
   const [emotion, setEmotion] = useState("");
@@ -27,6 +31,7 @@ function Interview() {
       stopVideo();
       stopCapturing();
       if (audioRecorder) audioRecorder.stop();
+      if (socketRef.current) socketRef.current.close();
     };
     // eslint-disable-next-line
   }, []);
@@ -47,6 +52,10 @@ function Interview() {
         setInterviewId(data.interviewId);
         setQuestions(Array.isArray(data.questions) ? data.questions : [data.questions]);
         setCurrentQIndex(0);
+        socketRef.current = await openInterviewSocket(data.interviewId, user.primaryEmailAddress.emailAddress);
+        if (socketRef.current) {
+          socketRef.current.onAssessment = (m) => console.log(`Final assessment for question ${m.questionIndex + 1}:`, m.assessment);
+        }
       } else {
         alert(data.error || "Failed to start interview");
       }
@@ -74,13 +83,20 @@ function Interview() {
     setStream(null);
   };
 
+  // next capture is scheduled from the server's nextIntervalMs
   const startCapturing = () => {
     setIsCapturing(true);
-    captureIntervalRef.current = setInterval(captureFrame, 2000);
+    capturingRef.current = true;
+    captureLoop();
+  };
+  const captureLoop = async () => {
+    const next = await captureFrame();
+    if (capturingRef.current) captureIntervalRef.current = setTimeout(captureLoop, next || 2000);
   };
   const stopCapturing = () => {
     setIsCapturing(false);
-    if (captureIntervalRef.current) clearInterval(captureIntervalRef.current);
+    capturingRef.current = false;
+    if (captureIntervalRef.current) clearTimeout(captureIntervalRef.current);
   };
 
   const captureFrame = async () => {
@@ -89,18 +105,23 @@ function Interview() {
     canvas.width = videoRef.current.videoWidth;
     canvas.height = videoRef.current.videoHeight;
     canvas.getContext("2d").drawImage(videoRef.current, 0, 0, canvas.width, canvas.height);
-    const base64Image = canvas.toDataURL("image/jpeg");
+    const socket = socketRef.current;
     try {
-      const resp = await fetch("http://localhost:5000/analyzeFrame", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ image: base64Image })
-      });
-      const data = await resp.json();
-      if (!data.error) {
-        setEmotion(data.dominant_emotion);
-        setProcessedImage(data.image);
-        if (interviewId && user?.primaryEmailAddress && data.emotion_distribution) {
+      let data;
+      if (socket && socket.open) {
+        // one message per frame; the server logs the emotion itself
+        data = await socket.sendFrame(await new Promise((r) => canvas.toBlob(r, "image/jpeg")));
+      } else {
+        const resp = await fetch("http://localhost:5000/analyzeFrame", {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+            "Clerk-User-Email": user?.primaryEmailAddress?.emailAddress || ""
+          },
+          body: JSON.stringify({ image: canvas.toDataURL("image/jpeg"), sessionId: interviewId })
+        });
+        data = await resp.json();
+        if (!data.error && interviewId && user?.primaryEmailAddress && data.emotion_distribution) {
           await fetch("http://localhost:5000/api/logEmotion", {
             method: "POST",
             headers: {
@@ -111,6 +132,11 @@ function Interview() {
           });
         }
       }
+      if (!data.error) {
+        setEmotion(data.dominant_emotion);
+        if (data.image) setProcessedImage(data.image);
+      }
+      return data.nextIntervalMs || (data.retryAfter && data.retryAfter * 1000);
     } catch (e) {
       console.error("Emotion error:", e);
     }
@@ -129,30 +155,38 @@ function Interview() {
 
       recorder.onstop = async () => {
         const audioBlob = new Blob(chunks, { type: "audio/wav" });
-        const formData = new FormData();
-        formData.append("audio", audioBlob, "answer.wav");
-        formData.append("interviewId", interviewId);
-        formData.append("questionIndex", currentQIndex.toString());
+        const socket = socketRef.current;
 
         try {
-          const res = await fetch("http://localhost:5000/api/submitAnswer", {
-            method: "POST",
-            headers: { "Clerk-User-Email": user.primaryEmailAddress.emailAddress },
-            body: formData
-          });
-          const data = await res.json();
+          let data;
+          if (socket && socket.open) {
+            const format = (recorder.mimeType.split("/")[1] || "webm").split(";")[0];
+            data = await socket.sendAnswer(currentQIndex, audioBlob, format);
+          } else {
+            const formData = new FormData();
+            formData.append("audio", audioBlob, "answer.wav");
+            formData.append("interviewId", interviewId);
+            formData.append("questionIndex", currentQIndex.toString());
+            const res = await idempotentPost("http://localhost:5000/api/submitAnswer", {
+              headers: { "Clerk-User-Email": user.primaryEmailAddress.emailAddress },
+              body: formData
+            });
+            data = await res.json();
+          }
           if (data.message === "Answer submitted") {
             const a = data.assessment || {};
+            // provisional = quick local estimate; the full assessment replaces it shortly
+            const label = a.provisional ? "Provisional rating" : "Rating";
             /* -------- context-aware alert -------- */
             if (a.strengths && a.strengths.length) {
               alert(
-                `Rating: ${a.rating}\n\n` +
+                `${label}: ${a.rating}\n\n` +
                   `Strengths:\n- ${a.strengths.join("\n- ")}\n\n` +
                   `Improvements:\n- ${a.improvements.join("\n- ")}`
               );
             } else {
               alert(
-                `Rating: ${a.rating}\n` +
+                `${label}: ${a.rating}\n` +
                   `Explanation: ${a.explanation}\n` +
                   `Ideal Answer: ${a.ideal_answer}`
               );
@@ -190,6 +224,10 @@ function Interview() {
 
   const handleFinishInterview = async () => {
     if (!interviewId) return alert("No interview in progress!");
+    if (socketRef.current) {
+      socketRef.current.close();        // the server flushes the emotion timeline on close
+      socketRef.current = null;
+    }
     try {
       const res = await fetch("http://localhost:5000/api/finalizeInterview", {
         method: "POST",
@@ -1,6 +1,8 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { useUser } from '@clerk/clerk-react';
 import { useNavigate } from 'react-router-dom';
+import { idempotentPost } from '../idempotentPost';
+import { openInterviewSocket } from '../interviewSocket';
 
 function MainInterview() {
   const navigate = useNavigate();
@@ -11,6 +13,8 @@ function MainInterview() {
   const [emotion, setEmotion] = useState("");
   const [processedImage, setProcessedImage] = useState(null);
   const captureIntervalRef = useRef(null);
+  const capturingRef = useRef(false);
+  const socketRef = useRef(null);   // interview WebSocket, when the server has one
   const [isCapturing, setIsCapturing] = useState(false);
 
   const [interviewId, setInterviewId] = useState(null);
@@ -26,6 +30,7 @@ function MainInterview() {
       stopVideo();
       stopCapturing();
       if (audioRecorder) audioRecorder.stop();
+      if (socketRef.current) socketRef.current.close();
     };
     // eslint-disable-next-line
   }, []);
@@ -50,6 +55,7 @@ function MainInterview() {
         // data.questions is presumably an array: e.g. ["Q1","Q2","Q3","Q4","Q5"]
         setQuestions(Array.isArray(data.questions) ? data.questions : [data.questions]);
         setCurrentQIndex(0);
+        socketRef.current = await openInterviewSocket(data.interviewId, user.primaryEmailAddress.emailAddress);
         alert("Interview started!");
       } else {
         alert(data.error || "Failed to start interview");
@@ -81,14 +87,25 @@ function MainInterview() {
     setStream(null);
   };
 
+  // the server answers every frame with nextIntervalMs (faster while the
+  // expression changes, slower when stable or busy), so chain timeouts
   const startCapturing = () => {
     setIsCapturing(true);
-    captureIntervalRef.current = setInterval(() => captureFrame(), 2000);
+    capturingRef.current = true;
+    captureLoop();
+  };
+
+  const captureLoop = async() => {
+    const next = await captureFrame();
+    if (capturingRef.current) {
+      captureIntervalRef.current = setTimeout(captureLoop, next || 2000);
+    }
   };
 
   const stopCapturing = () => {
     setIsCapturing(false);
-    if (captureIntervalRef.current) clearInterval(captureIntervalRef.current);
+    capturingRef.current = false;
+    if (captureIntervalRef.current) clearTimeout(captureIntervalRef.current);
   };
 
   const captureFrame = async() => {
@@ -98,14 +115,24 @@ function MainInterview() {
     canvas.height = videoRef.current.videoHeight;
     const ctx = canvas.getContext("2d");
     ctx.drawImage(videoRef.current,0,0, canvas.width,canvas.height);
-    const base64Image = canvas.toDataURL("image/jpeg");
+    const socket = socketRef.current;
 
     try {
+      // over the socket the server logs the emotion to the timeline itself
+      if (socket && socket.open) {
+        const data = await socket.sendFrame(await new Promise(r => canvas.toBlob(r, "image/jpeg")));
+        if (!data.error) setEmotion(data.dominant_emotion);
+        return data.nextIntervalMs || (data.retryAfter && data.retryAfter * 1000);
+      }
+
       // 1) Analyze emotion
       const resp = await fetch("http://localhost:5000/analyzeFrame", {
         method:"POST",
-        headers:{"Content-Type":"application/json"},
-        body: JSON.stringify({ image: base64Image })
+        headers:{
+          "Content-Type":"application/json",
+          "Clerk-User-Email": user?.primaryEmailAddress?.emailAddress || ""
+        },
+        body: JSON.stringify({ image: canvas.toDataURL("image/jpeg"), sessionId: interviewId })
       });
       const data = await resp.json();
 
@@ -128,6 +155,7 @@ function MainInterview() {
           });
         }
       }
+      return data.nextIntervalMs || (data.retryAfter && data.retryAfter * 1000);
     } catch(e) { 
       console.error("Emotion error:", e);
     }
@@ -145,20 +173,26 @@ function MainInterview() {
       };
       recorder.onstop = async() => {
         const audioBlob = new Blob(chunks, { type:"audio/wav" });
-        const formData = new FormData();
-        formData.append("audio", audioBlob,"answer.wav");
-        formData.append("interviewId", interviewId);
-        formData.append("questionIndex", currentQIndex.toString());
+        const socket = socketRef.current;
 
         try {
-          const res = await fetch("http://localhost:5000/api/submitAnswer", {
-            method:"POST",
-            headers:{
-              "Clerk-User-Email": user.primaryEmailAddress.emailAddress
-            },
-            body: formData
-          });
-          const data = await res.json();
+          let data;
+          if (socket && socket.open) {
+            const format = (recorder.mimeType.split("/")[1] || "webm").split(";")[0];
+            data = await socket.sendAnswer(currentQIndex, audioBlob, format);
+          } else {
+            const formData = new FormData();
+            formData.append("audio", audioBlob,"answer.wav");
+            formData.append("interviewId", interviewId);
+            formData.append("questionIndex", currentQIndex.toString());
+            const res = await idempotentPost("http://localhost:5000/api/submitAnswer", {
+              headers:{
+                "Clerk-User-Email": user.primaryEmailAddress.emailAddress
+              },
+              body: formData
+            });
+            data = await res.json();
+          }
           console.log("Answer result:", data);
           if (data.message==="Answer submitted") {
             alert("Answer recorded successfully!");
@@ -198,6 +232,10 @@ function MainInterview() {
 
   // 4) Finalize
   const handleFinalizeInterview = async() => {
+    if (socketRef.current) {
+      socketRef.current.close();      // the server flushes the emotion timeline on close
+      socketRef.current = null;
+    }
     try {
       const res = await fetch("http://localhost:5000/api/finalizeInterview", {
         method:"POST",
@@ -2,6 +2,7 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useUser } from '@clerk/clerk-react';
+import { idempotentPost } from '../idempotentPost';
 
 function ResumeUpload() {
   const navigate = useNavigate();
@@ -11,6 +12,7 @@ function ResumeUpload() {
   const [analysis, setAnalysis] = useState("");
   const [errorMsg, setErrorMsg] = useState("");
   const [uploading, setUploading] = useState(false);
+  const [jobStage, setJobStage] = useState("");
 
   const handleFileChange = (e) => {
     setResumeFile(e.target.files[0]);
@@ -36,26 +38,48 @@ function ResumeUpload() {
         formData.append("jobDescription", jobDescription);
       }
 
-      const res = await fetch("http://localhost:5000/api/resume", {
-        method: "POST",
+      const res = await idempotentPost("http://localhost:5000/api/resume", {
         headers: {
           "Clerk-User-Email": user.primaryEmailAddress.emailAddress
         },
         body: formData
       });
       const data = await res.json();
-      console.log("Resume analysis response:", data);
-      if (res.ok) {
-        setAnalysis(data.analysis || "No analysis returned.");
-      } else {
+      if (!res.ok || !data.jobId) {
         setErrorMsg(data.error || "Error analyzing resume.");
+        return;
+      }
+      const job = await waitForJob(data.jobId);
+      console.log("Resume analysis job:", job);
+      if (job.status === "done") {
+        setAnalysis(job.result?.analysis || "No analysis returned.");
+      } else {
+        setErrorMsg(job.error || "Error analyzing resume.");
       }
     } catch (err) {
       console.error("Resume upload error:", err);
       setErrorMsg("Upload failed. Please try again.");
     } finally {
       setUploading(false);
+      setJobStage("");
+    }
+  };
+
+  // the upload only queues the analysis; poll the job until it finishes (or give up)
+  const JOB_DEADLINE_MS = 5 * 60 * 1000;
+  const waitForJob = async (jobId) => {
+    const deadline = Date.now() + JOB_DEADLINE_MS;
+    while (Date.now() < deadline) {
+      const res = await fetch(`http://localhost:5000/api/resume/jobs/${jobId}`, {
+        headers: { "Clerk-User-Email": user.primaryEmailAddress.emailAddress }
+      });
+      const job = await res.json();
+      if (!res.ok) return { status: "failed", error: job.error };
+      if (job.status === "done" || job.status === "failed") return job;
+      setJobStage(job.stage || job.status);
+      await new Promise(r => setTimeout(r, 1000));
     }
+    return { status: "failed", error: "Resume analysis is taking too long. Please try uploading again." };
   };
 
   const handleProceed = () => {
@@ -234,7 +258,7 @@ function ResumeUpload() {
           style={{ ...buttonStyle, marginTop: '1rem' }}
           disabled={uploading}
         >
-          {uploading ? "Analyzing..." : "Upload & Analyze"}
+          {uploading ? `Analyzing${jobStage ? ` (${jobStage.replace("_", " ")})` : ""}...` : "Upload & Analyze"}
         </button>
 
         {analysis && (